@@ -0,0 +1,24 @@
+import argparse
+
+from src.entity.config_entity import BenchmarkConfig
+from src.pipeline.benchmark_pipeline import BenchmarkPipeline
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark training and serving on synthetic data")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(BenchmarkConfig.row_counts),
+                        help="dataset sizes to benchmark")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(BenchmarkConfig.concurrency_levels),
+                        help="concurrent /predict clients per load level")
+    parser.add_argument("--workers", type=int, nargs="+", default=list(BenchmarkConfig.worker_counts),
+                        help="serving worker counts for the throughput-vs-workers curve")
+    parser.add_argument("--requests", type=int, default=BenchmarkConfig.requests_per_level,
+                        help="/predict calls per load level")
+    parser.add_argument("--seed", type=int, default=BenchmarkConfig.seed)
+    args = parser.parse_args()
+
+    benchmark_config = BenchmarkConfig(row_counts=tuple(args.rows), concurrency_levels=tuple(args.concurrency),
+                                       worker_counts=tuple(args.workers),
+                                       requests_per_level=args.requests, seed=args.seed)
+    results_path = BenchmarkPipeline(benchmark_config).run()
+    print(f"Benchmark results written to {results_path}")
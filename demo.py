@@ -1,6 +1,28 @@
+import argparse
+
+from src.entity.config_entity import ProfilerConfig
 from src.pipeline.training_pipeline import TrainingPipeline
+from src.utils.profiler import enable_profiling, disable_profiling, profile_section
 
 
 if __name__ == "__main__":
-    training_pipeline = TrainingPipeline()
-    training_pipeline.run_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the training pipeline")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile every stage and write a JSON report and summary table to the artifact directory")
+    parser.add_argument("--profile-memory", choices=["rss", "tracemalloc"], default=ProfilerConfig.memory_mode,
+                        help="rss samples the process RSS; tracemalloc traces Python allocations (slower)")
+    parser.add_argument("--cprofile", action="store_true", help="also dump a cProfile file per stage")
+    args = parser.parse_args()
+
+    if args.profile:
+        profiler = enable_profiling(ProfilerConfig(memory_mode=args.profile_memory, cprofile=args.cprofile))
+
+    try:
+        training_pipeline = TrainingPipeline()
+        with profile_section("run_pipeline"):
+            training_pipeline.run_pipeline()
+    finally:
+        if args.profile:
+            disable_profiling()
+            profiler.write_report()
+            print(profiler.summary_table())
@@ -1,3 +1,10 @@
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
@@ -8,17 +15,107 @@ import uvicorn
 
 from src.constants import APP_HOST, APP_PORT
 from src.pipeline.prediction_pipeline import ModelPredictor, ModelDataForPrediction
-from src.entity.config_entity import ModelPredictorConfig
+from src.pipeline.prediction_monitor import PredictionMonitor
+from src.pipeline.prediction_cache import PredictionCache
+from src.pipeline.inference_executor import InferenceExecutor, InferenceQueueFullError
+from src.data_access.results_sink import ResultsSink
+from src.entity.config_entity import ModelPredictorConfig, PredictionMonitorConfig, PredictionCacheConfig, InferenceExecutorConfig, ResultsSinkConfig
+from src.entity.estimator import VisaModel, TargetValueMapping
+from src.entity.feature_engineering import get_feature_engineering
 from src.exception import CustomException
-from src.logger.logger import setup_logger, log_file
+from src.logger.logger import setup_logger, log_file, log_event, set_run_id
 
 # Logger initialization
 logger = setup_logger("main", log_file)
 
 from pydantic import BaseModel
 
+# Resident production model of this worker
+model_predictor = ModelPredictor(ModelPredictorConfig())
+
+# Streaming drift monitor of this worker
+prediction_monitor = PredictionMonitor(PredictionMonitorConfig())
+
+# Bounded pool that scores requests off the event loop
+inference_executor = InferenceExecutor(InferenceExecutorConfig())
+
+# Results of repeated requests, dropped when the production model changes
+prediction_cache = PredictionCache(PredictionCacheConfig())
+
+# Persists results of requests that carry a case_id; opened per worker in lifespan when enabled
+results_sink_config = ResultsSinkConfig()
+results_sink: Optional[ResultsSink] = None
+target_reverse_mapping = TargetValueMapping().reverse_mapping()
+
+# Same derived features as training, computed per request
+feature_engineering = get_feature_engineering()
+
+async def flush_prediction_monitor():
+    """
+    Periodically folds the buffered requests into the monitor counters off the request path
+    """
+    while True:
+        await asyncio.sleep(prediction_monitor.prediction_monitor_config.flush_interval)
+        try:
+            await asyncio.to_thread(prediction_monitor.flush)
+        except Exception as e:
+            logger.error(f"Prediction monitor flush failed: {e}")
+
+async def flush_results_sink():
+    """
+    Periodically writes the buffered prediction results off the request path
+    """
+    while True:
+        await asyncio.sleep(results_sink_config.flush_interval)
+        try:
+            await asyncio.to_thread(results_sink.flush)
+        except Exception as e:
+            logger.error(f"Results sink flush failed: {e}")
+
+async def refresh_production_model():
+    """
+    Periodically reloads the production model when a new one was pushed
+    """
+    while True:
+        await asyncio.sleep(prediction_cache.prediction_cache_config.model_check_interval)
+        try:
+            if await asyncio.to_thread(model_predictor.refresh_model):
+                log_event(logger, "model_reloaded", model_version=model_predictor.model_version)
+        except Exception as e:
+            logger.error(f"Production model version check failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        # Already loaded when the workers were forked from a preloading parent;
+        if prediction_monitor.reference_profile is None:
+            await asyncio.to_thread(prediction_monitor.load_reference_profile)
+    except Exception as e:
+        logger.error(f"Prediction monitor running without reference profile: {e}")
+    try:
+        await asyncio.to_thread(model_predictor.get_request_encoder)
+    except Exception as e:
+        logger.error(f"Model not loaded at startup, it will be loaded on first request: {e}")
+    global results_sink
+    if results_sink_config.enabled:
+        try:
+            results_sink = ResultsSink(results_sink_config)
+        except Exception as e:
+            logger.error(f"Prediction results will not be persisted: {e}")
+    flush_task = asyncio.create_task(flush_prediction_monitor())
+    refresh_task = asyncio.create_task(refresh_production_model())
+    sink_task = asyncio.create_task(flush_results_sink()) if results_sink is not None else None
+    yield
+    flush_task.cancel()
+    refresh_task.cancel()
+    inference_executor.shutdown()
+    prediction_monitor.flush()
+    if sink_task is not None:
+        sink_task.cancel()
+        results_sink.flush()
+
 # FastAPI application setup
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
@@ -33,7 +130,11 @@ class PredictRequest(BaseModel):
     prevailing_wage: float
     unit_of_wage: str
     full_time_position: str
-    company_age: int
+    # Either the raw yr_of_estab, from which company_age is derived, or company_age itself
+    yr_of_estab: Optional[int] = None
+    company_age: Optional[int] = None
+    # Optional: results of requests with a case_id are persisted by the results sink
+    case_id: Optional[str] = None
 
 
 # Routes and logic for the FastAPI application
@@ -42,38 +143,113 @@ async def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+def score_request(features: dict) -> tuple:
+    """
+    Validates, encodes and scores one request; runs on the inference executor.
+    Returns (prediction, probability), the path taken and the version of the model that made it
+    """
+    model, model_version = model_predictor.get_versioned_model()
+
+    # 1. Validate against the fitted encoders' categories and encode up front
+    request_encoder = model.get_request_encoder()
+    encoded_row, errors = request_encoder.encode(features)
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+    if request_encoder.supported:
+        # 2. Fast path on the pre-encoded category indices
+        predictions, probabilities = model.predict_encoded_with_probability([encoded_row])
+        path = "fast"
+    else:
+        predictions, probabilities = predict_from_data_frame(features, model)
+        path = "dataframe"
+    return (predictions[0], float(probabilities[0])), path, model_version
+
+
 @app.post("/predict")
 async def predict(request: PredictRequest):
+    set_run_id(uuid.uuid4().hex[:12])
+    start = time.perf_counter()
+    path = None
     try:
-        # 1. Build your custom class from the parsed request
-        input_data = ModelDataForPrediction(
-            continent=request.continent,
-            education_of_employee=request.education_of_employee,
-            has_job_experience=request.has_job_experience,
-            requires_job_training=request.requires_job_training,
-            no_of_employees=request.no_of_employees,
-            region_of_employment=request.region_of_employment,
-            prevailing_wage=request.prevailing_wage,
-            unit_of_wage=request.unit_of_wage,
-            full_time_position=request.full_time_position,
-            company_age=request.company_age
-        )
-
-        # 2. Convert to DataFrame
-        input_df = input_data.get_input_data_frame()
-
-        # 3. Predict
-        model_predictor = ModelPredictor(ModelPredictorConfig())
-        prediction = model_predictor.predict(input_df)
-
-        result = prediction[0]
-        logger.info(f"Prediction result: {result}")
+        features = feature_engineering.transform_record(request.model_dump(exclude={"case_id"}))
+        cache_key = prediction_cache.make_key(features)
+        model_version = model_predictor.model_version
+        scored = prediction_cache.get(model_version, cache_key)
+        if scored is not None:
+            path = "cache"
+        else:
+            try:
+                scored, path, model_version = await inference_executor.run(score_request, features)
+            except InferenceQueueFullError as e:
+                raise HTTPException(status_code=503, detail=str(e),
+                                    headers={"Retry-After": str(inference_executor.inference_executor_config.retry_after)})
+            except asyncio.TimeoutError:
+                raise HTTPException(status_code=504, detail="Prediction timed out")
+            prediction_cache.put(model_version, cache_key, scored)
+        result, probability = scored
         if hasattr(result, "item"):
             result = result.item()
-            result = "Approved" if result == 1 else "Denied"
+        # One label for the response and the persisted result, named like the training target;
+        label = target_reverse_mapping.get(result, str(result))
+
+        prediction_monitor.record(features, result)
+        if results_sink is not None and request.case_id is not None:
+            results_sink.add(request.case_id, label, probability, model_version)
+        log_event(logger, "prediction", sampled=True, path=path, prediction=result, rows=1, status=200,
+                  duration_ms=round((time.perf_counter() - start) * 1000, 3))
+
+        return {"prediction": label}
+
+    except HTTPException as e:
+        log_event(logger, "prediction", path=path, status=e.status_code,
+                  duration_ms=round((time.perf_counter() - start) * 1000, 3))
+        raise
+    except Exception as e:
+        log_event(logger, "prediction", level=logging.ERROR, path=path, status=500, error=str(e),
+                  duration_ms=round((time.perf_counter() - start) * 1000, 3))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/schema")
+async def schema():
+    try:
+        # First call may load the model from storage; keep it off the event loop
+        request_encoder = await asyncio.to_thread(model_predictor.get_request_encoder)
+        return request_encoder.schema()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def predict_from_data_frame(features: dict, model: VisaModel):
+    """
+    Generic path through the full preprocessing object, used when the
+    preprocessor has steps the request encoder cannot reproduce
+    """
+    # 1. Build your custom class from the request features
+    input_data = ModelDataForPrediction(**features)
+
+    # 2. Convert to DataFrame
+    input_df = input_data.get_input_data_frame()
 
-        return {"prediction": result}
+    # 3. Predict
+    return model.predict_with_probability(input_df)
 
+
+@app.get("/stats")
+async def stats():
+    return {
+        "model_version": model_predictor.model_version,
+        "prediction_cache": prediction_cache.stats(),
+        "inference_executor": inference_executor.stats(),
+        "results_sink": results_sink.stats() if results_sink is not None else None,
+    }
+
+
+@app.get("/drift")
+async def drift():
+    try:
+        return await asyncio.to_thread(prediction_monitor.drift_report)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
@@ -0,0 +1,32 @@
+import argparse
+
+from src.entity.config_entity import BatchPredictionConfig, ResultsSinkConfig
+from src.pipeline.batch_prediction_pipeline import BatchPredictionPipeline
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a file or collection with the production model")
+    parser.add_argument("--input", dest="input_path", default=None,
+                        help="CSV or Parquet file to score; defaults to the --collection collection")
+    parser.add_argument("--collection", default=BatchPredictionConfig.input_collection,
+                        help="collection to score when no --input file is given")
+    parser.add_argument("--output", dest="output_path", default=BatchPredictionConfig.output_path,
+                        help="Parquet (.parquet) or CSV (.csv) file for the predictions")
+    parser.add_argument("--output-collection", nargs="?", const=ResultsSinkConfig.collection_name, default=None,
+                        help="upsert the predictions into this collection instead of a file "
+                             f"(default collection: {ResultsSinkConfig.collection_name})")
+    parser.add_argument("--sink-batch-size", type=int, default=BatchPredictionConfig.sink_batch_size,
+                        help="documents per bulk upsert when writing to a collection")
+    parser.add_argument("--chunk-size", type=int, default=BatchPredictionConfig.chunk_size)
+    parser.add_argument("--workers", type=int, default=BatchPredictionConfig.workers,
+                        help="scoring processes; 1 scores in this process")
+    args = parser.parse_args()
+
+    batch_prediction_config = BatchPredictionConfig(input_path=args.input_path, input_collection=args.collection,
+                                                    output_path=args.output_path,
+                                                    output_collection=args.output_collection,
+                                                    chunk_size=args.chunk_size, workers=args.workers,
+                                                    sink_batch_size=args.sink_batch_size)
+    summary = BatchPredictionPipeline(batch_prediction_config).run()
+    print(f"Scored {summary['rows']} rows in {summary['seconds']} s "
+          f"({summary['rows_per_sec']} rows/sec) with model {summary['model_version']} -> {summary['output']}")
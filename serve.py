@@ -0,0 +1,14 @@
+import argparse
+
+from src.entity.config_entity import ServingConfig
+from src.pipeline.serving_pipeline import PreforkServer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the prediction API with N workers sharing one preloaded model")
+    parser.add_argument("--host", default=ServingConfig.host)
+    parser.add_argument("--port", type=int, default=ServingConfig.port)
+    parser.add_argument("--workers", type=int, default=ServingConfig.workers)
+    args = parser.parse_args()
+
+    PreforkServer(ServingConfig(host=args.host, port=args.port, workers=args.workers)).run()
@@ -2,14 +2,16 @@ import boto3
 from io import StringIO
 from typing import Union,List
 import os,sys
-from src.logger.logger import setup_logger, log_file
+from src.logger.logger import setup_logger, log_file, log_stage
 from src.exception import CustomException
 from mypy_boto3_s3.service_resource import Bucket
 from botocore.exceptions import ClientError
 from pandas import DataFrame,read_csv
 import pickle
+import yaml
 from src.configuration.aws_connection import S3Client
 from src.constants import REGION_NAME
+from src.utils.profiler import profile_section
 
 # Set up logging;
 logger = setup_logger("aws_storage", log_file)
@@ -175,8 +177,10 @@ class SimpleStorageService:
                 else model_dir + "/" + model_name
             )
             model_file = func()
-            file_object = self.get_file_object(model_file, bucket_name)
-            model_obj = self.read_object(file_object, decode=False)
+            with profile_section("s3_download"), log_stage(logger, "s3_download", bucket=bucket_name, key=model_file) as metrics:
+                file_object = self.get_file_object(model_file, bucket_name)
+                model_obj = self.read_object(file_object, decode=False)
+                metrics["bytes"] = len(model_obj)
             model = pickle.loads(model_obj)
             logger.info("Exited the load_model method of S3Operations class")
             return model
@@ -184,6 +188,28 @@ class SimpleStorageService:
         except Exception as e:
             raise CustomException(e, sys) from e
 
+    def load_yaml(self, filename: str, bucket_name: str) -> dict:
+        """
+        Method Name :   load_yaml
+        Description :   This method loads the filename yaml file from bucket_name bucket
+
+        Output      :   dictionary parsed from the yaml file is returned
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        logger.info("Entered the load_yaml method of S3Operations class")
+
+        try:
+            with profile_section("s3_download"), log_stage(logger, "s3_download", bucket=bucket_name, key=filename) as metrics:
+                file_object = self.get_file_object(filename, bucket_name)
+                raw_content = self.read_object(file_object)
+                metrics["bytes"] = len(raw_content)
+            content = yaml.safe_load(raw_content)
+            logger.info("Exited the load_yaml method of S3Operations class")
+            return content
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
     def create_folder(self, folder_name: str, bucket_name: str) -> None:
         """
         Method Name :   create_folder
@@ -226,9 +252,11 @@ class SimpleStorageService:
                 f"Uploading {from_filename} file to {to_filename} file in {bucket_name} bucket"
             )
 
-            self.s3_resource.meta.client.upload_file(
-                from_filename, bucket_name, to_filename
-            )
+            with profile_section("s3_upload"), log_stage(logger, "s3_upload", bucket=bucket_name, key=to_filename,
+                           bytes=os.path.getsize(from_filename)):
+                self.s3_resource.meta.client.upload_file(
+                    from_filename, bucket_name, to_filename
+                )
 
             logger.info(
                 f"Uploaded {from_filename} file to {to_filename} file in {bucket_name} bucket"
@@ -305,8 +333,10 @@ class SimpleStorageService:
         logger.info("Entered the read_csv method of S3Operations class")
 
         try:
-            csv_obj = self.get_file_object(filename, bucket_name)
-            df = self.get_df_from_object(csv_obj)
+            with profile_section("s3_download"), log_stage(logger, "s3_download", bucket=bucket_name, key=filename) as metrics:
+                csv_obj = self.get_file_object(filename, bucket_name)
+                df = self.get_df_from_object(csv_obj)
+                metrics["rows"] = len(df)
             logger.info("Exited the read_csv method of S3Operations class")
             return df
         except Exception as e:
@@ -0,0 +1,124 @@
+import os
+import shutil
+import sys
+from io import BytesIO
+from typing import List, Union
+
+from src.cloud_storage.aws_storage import SimpleStorageService
+from src.constants import LOCAL_STORAGE_DIR, STORAGE_BACKEND
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file, log_stage
+from src.utils.profiler import profile_section
+
+# Set up logging;
+logger = setup_logger("local_storage", log_file)
+
+
+class LocalObject:
+    """
+    Object of the local store, answering get() like a boto3 S3 object
+    """
+
+    def __init__(self, bucket_name: str, key: str, path: str):
+        self.bucket_name = bucket_name
+        self.key = key
+        self.path = path
+
+    @property
+    def e_tag(self) -> str:
+        # Changes whenever the object is replaced, like an S3 ETag;
+        stat = os.stat(self.path)
+        return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    def get(self) -> dict:
+        with open(self.path, "rb") as file_obj:
+            return {"Body": BytesIO(file_obj.read()), "ContentLength": os.path.getsize(self.path)}
+
+
+class LocalStorageService(SimpleStorageService):
+    """
+    Filesystem stand-in for S3: buckets are directories under LOCAL_STORAGE_DIR and
+    keys are relative paths. Only the methods that talk to boto3 are overridden;
+    model, yaml and csv loading are inherited from SimpleStorageService.
+    """
+
+    def __init__(self, storage_dir: str = LOCAL_STORAGE_DIR):
+        self.storage_dir = storage_dir
+        os.makedirs(self.storage_dir, exist_ok=True)
+
+    def _bucket_dir(self, bucket_name: str) -> str:
+        return os.path.join(self.storage_dir, bucket_name)
+
+    def create_bucket(self, bucket_name: str, region_name: str = None) -> str:
+        logger.info(f"Creating local bucket: {bucket_name}")
+        try:
+            os.makedirs(self._bucket_dir(bucket_name), exist_ok=True)
+            return self.get_bucket(bucket_name)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def is_bucket_present(self, bucket_name: str) -> bool:
+        return os.path.isdir(self._bucket_dir(bucket_name))
+
+    def get_bucket(self, bucket_name: str) -> str:
+        return self._bucket_dir(bucket_name)
+
+    def list_objects(self, bucket_name: str, prefix: str = "") -> List[LocalObject]:
+        """
+        Objects of bucket_name whose key starts with prefix, like bucket.objects.filter(Prefix=prefix)
+        """
+        try:
+            bucket_dir = self._bucket_dir(bucket_name)
+            objects = []
+            for root, _, files in os.walk(bucket_dir):
+                for file_name in files:
+                    if file_name.endswith(".tmp"):
+                        continue
+                    path = os.path.join(root, file_name)
+                    key = os.path.relpath(path, bucket_dir).replace(os.sep, "/")
+                    if key.startswith(prefix):
+                        objects.append(LocalObject(bucket_name, key, path))
+            return sorted(objects, key=lambda obj: obj.key)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def s3_key_path_available(self, bucket_name, s3_key) -> bool:
+        return len(self.list_objects(bucket_name, s3_key)) > 0
+
+    def get_file_object(self, filename: str, bucket_name: str) -> Union[List[object], object]:
+        logger.info("Entered the get_file_object method of LocalStorageService class")
+        try:
+            file_objects = self.list_objects(bucket_name, filename)
+            if not file_objects:
+                raise FileNotFoundError(f"{filename} not found in local bucket {bucket_name}")
+            return file_objects[0] if len(file_objects) == 1 else file_objects
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def create_folder(self, folder_name: str, bucket_name: str) -> None:
+        os.makedirs(os.path.join(self._bucket_dir(bucket_name), folder_name), exist_ok=True)
+
+    def upload_file(self, from_filename: str, to_filename: str, bucket_name: str, remove: bool = True):
+        logger.info("Entered the upload_file method of LocalStorageService class")
+        try:
+            to_path = os.path.join(self._bucket_dir(bucket_name), to_filename)
+            os.makedirs(os.path.dirname(to_path), exist_ok=True)
+            with profile_section("s3_upload"), log_stage(logger, "s3_upload", bucket=bucket_name, key=to_filename,
+                                                         bytes=os.path.getsize(from_filename), backend="local"):
+                # Copy then rename, so readers never see a partially written object;
+                shutil.copyfile(from_filename, to_path + ".tmp")
+                os.replace(to_path + ".tmp", to_path)
+            logger.info(f"Uploaded {from_filename} file to {to_filename} file in local bucket {bucket_name}")
+            if remove is True:
+                os.remove(from_filename)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+def get_storage_service() -> SimpleStorageService:
+    """
+    Storage service selected by STORAGE_BACKEND: "s3" for AWS, "local" for the filesystem stand-in
+    """
+    if STORAGE_BACKEND == "local":
+        return LocalStorageService()
+    return SimpleStorageService()
@@ -1,15 +1,19 @@
+import json
 import os
 import from_root
+import numpy as np
 import pandas as pd
 import sys
-from sklearn.model_selection import train_test_split
 
 from src.entity.config_entity import DataIngestionConfig
 from src.entity.artifact_entity import DataIngestionArtifact
 from src.logger.logger import setup_logger, log_file
 from src.exception import CustomException
-from src.data_access.data_access import DataAccess
-from src.constants import FILE_NAME, TRAIN_FILE_NAME, TEST_FILE_NAME
+from src.data_access.data_access import DataAccess, compile_ingestion_query
+from src.constants import FILE_NAME, TRAIN_FILE_NAME, TEST_FILE_NAME, SCHEMA_FILE_PATH
+from src.utils.main_utils import read_yaml_file
+from src.utils.dtype_utils import apply_dtype_plan, read_csv_with_plan
+from src.utils.profiler import profile_section
 
 # Initialize logger
 logger = setup_logger("data_ingestion", log_file)
@@ -31,6 +35,21 @@ class DataIngestion:
         except Exception as e:
             raise CustomException(e, sys)
     
+    def get_ingestion_pipeline(self) -> list:
+        '''
+        Aggregation pipeline of the ingestion query spec in DataIngestionConfig
+        '''
+        try:
+            columns = None
+            if self.data_ingestion_config.query_project_schema_columns:
+                schema_file_data = read_yaml_file(file_path=SCHEMA_FILE_PATH)
+                columns = [list(column.keys())[0] for column in schema_file_data["columns"]]
+            return compile_ingestion_query(columns=columns,
+                                           filters=self.data_ingestion_config.query_filters,
+                                           sample_size=self.data_ingestion_config.query_sample_size)
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def export_data_to_feature_store(self) -> None:
         '''
         This function initiates the data ingestion process.
@@ -42,10 +61,31 @@ class DataIngestion:
         try:
             # Exporting data from MongoDB to DataFrame
             data_access = DataAccess()
-            df: pd.DataFrame = data_access.export_data_from_db(
-                collection_name=self.data_ingestion_config.collection_name,
-                database_name=self.data_ingestion_config.database_name
-            )
+            pipeline = self.get_ingestion_pipeline()
+            logger.info(f"Ingestion query pipeline: {pipeline}")
+
+            if self.is_partitioned_export():
+                # Partitions are read concurrently, each written as its own Parquet part;
+                with profile_section("export_partitioned"):
+                    manifest = data_access.export_partitioned(
+                        collection_name=self.data_ingestion_config.collection_name,
+                        output_dir=self.data_ingestion_config.feature_store_parts_dir,
+                        manifest_path=self.data_ingestion_config.feature_store_manifest_path,
+                        pipeline=pipeline,
+                        n_workers=self.data_ingestion_config.export_workers,
+                        partitions_per_worker=self.data_ingestion_config.export_partitions_per_worker,
+                        split_method=self.data_ingestion_config.export_split_method
+                    )
+                logger.info(f"Exported {manifest['rows']} rows in {len(manifest['parts'])} parts to "
+                            f"{self.data_ingestion_config.feature_store_parts_dir}.")
+                return
+
+            with profile_section("export_data_from_db"):
+                df: pd.DataFrame = data_access.export_data_from_db(
+                    collection_name=self.data_ingestion_config.collection_name,
+                    database_name=self.data_ingestion_config.database_name,
+                    pipeline=pipeline
+                )
             
             # Loading data from Local CSV file to DataFrame as MongoDB export is not working due to some issues. Just for testing purpose, we are loading data from local CSV file.
             # df: pd.DataFrame = pd.read_csv(r"C:\Work_Directory\Learn\DS_Projects\Global_Mobility_Application_Analyser\artifacts\02_08_2026__14_16_26\data_ingestion\feature_store\us_visa_data.csv")
@@ -57,40 +97,97 @@ class DataIngestion:
             os.makedirs(feature_store_dir, exist_ok=True)
             
             # Saving the DataFrame to feature store path
-            df.to_csv(self.data_ingestion_config.feature_store_path, index=False)
+            with profile_section("to_csv"):
+                df.to_csv(self.data_ingestion_config.feature_store_path, index=False)
             logger.info(f"Saved data to feature store at {self.data_ingestion_config.feature_store_path}.")
         
         except Exception as e:
             raise CustomException(e, sys)
     
+    def is_partitioned_export(self) -> bool:
+        '''
+        Parallel export is used with more than one worker; a $sample is taken in a single stream
+        since sampling each partition would multiply the sample size
+        '''
+        return self.data_ingestion_config.export_workers > 1 and not self.data_ingestion_config.query_sample_size
+
+    def iter_feature_store_chunks(self):
+        '''
+        Streams the feature store in chunks: the Parquet parts listed in the manifest
+        after a partitioned export, otherwise the feature store CSV
+        '''
+        try:
+            chunk_size = self.data_ingestion_config.split_chunk_size
+            if self.is_partitioned_export():
+                import pyarrow.parquet as pq
+
+                with open(self.data_ingestion_config.feature_store_manifest_path) as manifest_file:
+                    manifest = json.load(manifest_file)
+                for part in manifest["parts"]:
+                    if part["rows"]:
+                        part_file = pq.ParquetFile(os.path.join(self.data_ingestion_config.feature_store_parts_dir, part["file"]))
+                        for batch in part_file.iter_batches(batch_size=chunk_size):
+                            yield apply_dtype_plan(batch.to_pandas())
+            else:
+                yield from read_csv_with_plan(self.data_ingestion_config.feature_store_path, chunksize=chunk_size)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_test_mask(self, df: pd.DataFrame) -> np.ndarray:
+        '''
+        Deterministic split membership: a row is in the test set when the hash of its key
+        falls in the lowest train_test_split_ratio share of the hash range. Membership
+        depends only on the key, so a case stays on the same side across runs, chunkings
+        and incremental ingests. Rows are hashed whole when the key column is missing.
+        '''
+        key_column = self.data_ingestion_config.split_key_column
+        if key_column in df.columns:
+            keys = self.data_ingestion_config.split_salt + df[key_column].astype(str)
+            hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+        else:
+            hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        buckets = hashes % np.uint64(self.data_ingestion_config.split_hash_buckets)
+        return buckets < np.uint64(round(self.data_ingestion_config.train_test_split_ratio *
+                                         self.data_ingestion_config.split_hash_buckets))
+
     def split_data_as_train_test(self) -> None:
         '''
         This function splits the data into training and testing sets and saves them to respective file paths.
+        The feature store is streamed chunk by chunk and every chunk is appended to the
+        train or test file, so only one chunk is in memory at a time.
         
         :param self: Description
         :return: Description
         :rtype: DataIngestionArtifact
         '''
         try:
-            # Reading data from feature store
-            df = pd.read_csv(self.data_ingestion_config.feature_store_path)
-            logger.info("Read data from feature store for train-test split.")
-            
-            # Splitting the data into training and testing sets
             logger.info(f"Transforming data into train and test sets. Test size: {self.data_ingestion_config.train_test_split_ratio}")
-            train_df, test_df = train_test_split(
-                df,
-                test_size=self.data_ingestion_config.train_test_split_ratio,
-                random_state=42
-            )
             
             # Creating ingested directory if it doesn't exist
             os.makedirs(self.data_ingestion_config.ingested_dir, exist_ok=True)
             
-            # Saving training and testing data to respective file paths
-            train_df.to_csv(self.data_ingestion_config.training_file_path, index=False)
-            test_df.to_csv(self.data_ingestion_config.testing_file_path, index=False)
-            
+            stratify_column = self.data_ingestion_config.split_stratify_column
+            class_counts = {}
+            train_rows = test_rows = 0
+            with profile_section("read_csv"):
+                for index, chunk in enumerate(self.iter_feature_store_chunks()):
+                    test_mask = self.get_test_mask(chunk)
+                    mode, header = ("w", True) if index == 0 else ("a", False)
+                    chunk[~test_mask].to_csv(self.data_ingestion_config.training_file_path, mode=mode, header=header, index=False)
+                    chunk[test_mask].to_csv(self.data_ingestion_config.testing_file_path, mode=mode, header=header, index=False)
+                    train_rows += int((~test_mask).sum())
+                    test_rows += int(test_mask.sum())
+                    if stratify_column and stratify_column in chunk.columns:
+                        for (label, in_test), count in pd.Series(test_mask).groupby(
+                                [chunk[stratify_column].to_numpy(), test_mask]).size().items():
+                            counts = class_counts.setdefault(str(label), [0, 0])
+                            counts[int(in_test)] += int(count)
+
+            # The hash ignores the target, so each class gets the test share in expectation; report the realised shares
+            if class_counts:
+                test_shares = {label: round(test / (train + test), 4) for label, (train, test) in class_counts.items()}
+                logger.info(f"Test share per {stratify_column}: {test_shares}")
+            logger.info(f"Split {train_rows + test_rows} rows into {train_rows} train and {test_rows} test rows.")
             logger.info(f"Saved training data at {self.data_ingestion_config.training_file_path}.")
             logger.info(f"Saved testing data at {self.data_ingestion_config.testing_file_path}.")
         
@@ -113,7 +210,9 @@ class DataIngestion:
             data_ingestion_artifact = DataIngestionArtifact(
                 feature_store_path=self.data_ingestion_config.feature_store_path,
                 training_file_path=self.data_ingestion_config.training_file_path,
-                testing_file_path=self.data_ingestion_config.testing_file_path
+                testing_file_path=self.data_ingestion_config.testing_file_path,
+                feature_store_manifest_path=(self.data_ingestion_config.feature_store_manifest_path
+                                             if self.is_partitioned_export() else None)
             )
             
             logger.info(f"Data Ingestion Artifact: {data_ingestion_artifact}")
@@ -8,17 +8,29 @@ from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler, OneHotEncoder, OrdinalEncoder, PowerTransformer
 from sklearn.compose import ColumnTransformer 
 
-from src.constants import TARGET_COLUMN, SCHEMA_FILE_PATH, CURRENT_YEAR
-from src.entity.config_entity import DataTransformationConfig 
+from src.constants import TARGET_COLUMN, SCHEMA_FILE_PATH
+from src.entity.config_entity import DataTransformationConfig, training_pipeline_config
 from src.entity.artifact_entity import DataTransformationArtifact, DataIngestionArtifact, DataValidationArtifact
 from src.exception import CustomException
-from src.logger.logger import setup_logger, log_file
-from src.utils.main_utils import save_object, save_numpy_array_data, read_yaml_file, drop_columns
+from src.logger.logger import setup_logger, log_file, log_event
+from src.utils.main_utils import save_object, save_numpy_array_data, read_yaml_file, write_yaml_file
+from src.utils.dtype_utils import read_csv_with_plan
+from src.utils.feature_pipeline_utils import build_feature_pipeline_metadata, check_reuse
 from src.entity.estimator import TargetValueMapping 
+from src.entity.feature_engineering import FeatureEngineering
+from src.entity.s3_estimator import S3ModelEstimator
+from src.utils.profiler import profile_section
 
 # Logger;
 logger = setup_logger("data_transformation", log_file)
 
+def get_resampler(random_state: int) -> SMOTEENN:
+    '''
+    SMOTEENN resampler of the training data; model selection resamples every CV
+    training split with the same one, so validation folds only hold real rows
+    '''
+    return SMOTEENN(sampling_strategy="minority", random_state=random_state)
+
 class DataTransformation:
     
     def __init__(self, data_ingestion_artifact: DataIngestionArtifact, data_validation_artifact: DataValidationArtifact, data_transformation_config: DataTransformationConfig):
@@ -38,6 +50,7 @@ class DataTransformation:
             self.data_validation_artifact = data_validation_artifact
             self.data_transformation_config = data_transformation_config
             self.schema_file_data = read_yaml_file(file_path=SCHEMA_FILE_PATH)
+            self.feature_engineering = FeatureEngineering(self.schema_file_data)
         except Exception as e:
             raise CustomException(e,sys)
     
@@ -53,7 +66,8 @@ class DataTransformation:
         :rtype: pd.DataFrame
         '''
         try:
-            return pd.read_csv(file_path)
+            with profile_section("read_csv"):
+                return read_csv_with_plan(file_path)
         except Exception as e:
             raise CustomException(e,sys)
     
@@ -116,6 +130,51 @@ class DataTransformation:
         except Exception as e:
             raise CustomException(e, sys)
     
+    def get_fitted_preprocessor(self, input_feature_train_df: pd.DataFrame) -> tuple:
+        """
+        Method Name :   get_fitted_preprocessor
+        Description :   Returns the preprocessor of the production model when its feature pipeline
+                        artifact has the current schema hash and the training input has not drifted
+                        from the data it was fitted on; otherwise fits a new preprocessor
+        
+        Output      :   (fitted preprocessor, refitted flag, feature pipeline metadata)
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_transformation_config
+            reason = "reuse_disabled"
+            if config.reuse_preprocessor:
+                reason = "no_previous_feature_pipeline"
+                estimator = S3ModelEstimator(bucket_name=config.bucket_name, model_path=config.s3_model_key_path)
+                if estimator.is_model_present(model_path=config.s3_model_key_path) and \
+                        estimator.is_profile_present(profile_path=config.s3_feature_pipeline_key_path):
+                    metadata = estimator.load_profile(profile_path=config.s3_feature_pipeline_key_path)
+                    reuse, reason, drift_report = check_reuse(metadata, self.schema_file_data, input_feature_train_df,
+                                                              psi_threshold=config.refit_psi_threshold,
+                                                              drift_share=config.refit_drift_share)
+                    log_event(logger, "preprocessor_reuse_check", reuse=reuse, reason=reason,
+                              fitted_run=metadata.get("fitted_run"),
+                              drifted_features=drift_report["drifted_features"] if drift_report else None)
+                    if reuse:
+                        # The fit profile is kept, so slow drift accumulates against the data the fit saw;
+                        preprocessor = estimator.load_model().preprocessing_object
+                        metadata["reuse_count"] = metadata.get("reuse_count", 0) + 1
+                        metadata["last_reused_run"] = training_pipeline_config.TIMESTAMP
+                        return preprocessor, False, metadata
+
+            logger.info(f"Fitting a new preprocessor ({reason})")
+            preprocessor = self.get_data_transformer_object()
+            with profile_section("ColumnTransformer.fit"):
+                preprocessor.fit(input_feature_train_df)
+            metadata = build_feature_pipeline_metadata(preprocessor, self.schema_file_data, input_feature_train_df,
+                                                       fitted_run=training_pipeline_config.TIMESTAMP,
+                                                       n_bins=config.drift_num_bins,
+                                                       n_quantiles=config.profile_quantiles)
+            metadata["refit_reason"] = reason
+            return preprocessor, True, metadata
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
     def initiate_data_transformation(self) -> DataTransformationArtifact:
         """
         Method Name :   initiate_data_transformation
@@ -127,81 +186,74 @@ class DataTransformation:
         try:
             if self.data_validation_artifact.validation_status:
                 
-                # Prepocessing object
                 logger.info("Starting data transformation")
-                preprocessor = self.get_data_transformer_object()
-                logger.info("Got the preprocessor object")
 
                 # Retrieveing train and test file data frames
                 train_df = DataTransformation.read_data(file_path=self.data_ingestion_artifact.training_file_path)
                 test_df = DataTransformation.read_data(file_path=self.data_ingestion_artifact.testing_file_path)
 
-                # Getting input feature and target feature from training and testing dataframes
-                input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN], axis=1)
+                # Input features (derived features added, drop columns and target left out) and target of Training dataset
+                input_feature_train_df = self.feature_engineering.transform(train_df)
                 target_feature_train_df = train_df[TARGET_COLUMN]
-                logger.info("Got train features and test features of Training dataset")
-
-                # Adding new feature - company_age
-                input_feature_train_df['company_age'] = CURRENT_YEAR-input_feature_train_df['yr_of_estab']
-                logger.info("Added company_age column to the Training dataset")
-
-                # Drop columns which are not required for model training
-                drop_cols = self.schema_file_data['drop_columns']
-                logger.info("drop the columns in drop_cols of Training dataset")
-                input_feature_train_df = drop_columns(df=input_feature_train_df, cols = drop_cols)
+                logger.info("Got train features and target feature of Training dataset")
                 
                 # Replace target feature values as per the mapping in Training dataset
-                target_feature_train_df = target_feature_train_df.replace(
+                target_feature_train_df = target_feature_train_df.map(
                     TargetValueMapping()._asdict()
                 )
 
                 # Test Dataset
-                input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN], axis=1)
+                input_feature_test_df = self.feature_engineering.transform(test_df)
                 target_feature_test_df = test_df[TARGET_COLUMN]
 
-                # Adding new feature - company_age
-                input_feature_test_df['company_age'] = CURRENT_YEAR-input_feature_test_df['yr_of_estab']
-                logger.info("Added company_age column to the Test dataset")
-
-                # Drop columns which are not required for model training
-                input_feature_test_df = drop_columns(df=input_feature_test_df, cols = drop_cols)
-                logger.info("drop the columns in drop_cols of Test dataset")
-
                 # Replace target feature values as per the mapping in Test dataset
-                target_feature_test_df = target_feature_test_df.replace(
+                target_feature_test_df = target_feature_test_df.map(
                     TargetValueMapping()._asdict()
                 )
                 logger.info("Got train features and test features of Testing dataset")
                 
-                # Applying fit transform preprocessor object on training dataframe
+                # Prepocessing object, reused from the production model or fitted on the training dataframe
+                preprocessor, preprocessor_refitted, feature_pipeline = self.get_fitted_preprocessor(input_feature_train_df)
+                logger.info(f"Got the preprocessor object (refitted: {preprocessor_refitted})")
+
+                # Applying preprocessor object on training dataframe
                 logger.info(
                     "Applying preprocessing object on training dataframe and testing dataframe"
                 )
-                input_feature_train_arr = preprocessor.fit_transform(input_feature_train_df)
+                with profile_section("ColumnTransformer.transform"):
+                    input_feature_train_arr = preprocessor.transform(input_feature_train_df)
 
                 # Applying transform on test data
                 logger.info(
-                    "Used the preprocessor object to fit transform the train features"
+                    "Used the preprocessor object to transform the train features"
                 )
-                input_feature_test_arr = preprocessor.transform(input_feature_test_df)
+                with profile_section("ColumnTransformer.transform"):
+                    input_feature_test_arr = preprocessor.transform(input_feature_test_df)
                 logger.info("Used the preprocessor object to transform the test features")
 
                 # SMOTEENN for handling imbalanced dataset on Training Dataset
                 logger.info("Applying SMOTEENN on Training dataset")
-                smt = SMOTEENN(sampling_strategy="minority")
-                input_feature_train_final, target_feature_train_final = smt.fit_resample(
-                    input_feature_train_arr, target_feature_train_df
-                )
+                smt = get_resampler(self.data_transformation_config.resample_random_state)
+                with profile_section("SMOTEENN.fit_resample"):
+                    input_feature_train_final, target_feature_train_final = smt.fit_resample(
+                        input_feature_train_arr, target_feature_train_df
+                    )
                 logger.info("Applied SMOTEENN on training dataset")
 
                 # SMOTEENN for handling imbalanced dataset on Testing Dataset
                 logger.info("Applying SMOTEENN on testing dataset")
-                input_feature_test_final, target_feature_test_final = smt.fit_resample(
-                    input_feature_test_arr, target_feature_test_df
-                )
+                with profile_section("SMOTEENN.fit_resample"):
+                    input_feature_test_final, target_feature_test_final = smt.fit_resample(
+                        input_feature_test_arr, target_feature_test_df
+                    )
                 logger.info("Applied SMOTEENN on testing dataset")
                 logger.info("Created train array and test array")
 
+                # Combining input and target features of the training rows before resampling, for model selection
+                unsampled_train_arr = np.c_[
+                    input_feature_train_arr, np.array(target_feature_train_df)
+                ]
+
                 # Combining input and target features for train datasets
                 train_arr = np.c_[
                     input_feature_train_final, np.array(target_feature_train_final)
@@ -214,7 +266,9 @@ class DataTransformation:
 
                 # Saving the preprocessor object and transformed train and test arrays to respective file paths
                 save_object(self.data_transformation_config.preprocessor_object_path, preprocessor)
+                write_yaml_file(self.data_transformation_config.feature_pipeline_path, feature_pipeline, replace=True)
                 save_numpy_array_data(self.data_transformation_config.transformed_train_path, array=train_arr)
+                save_numpy_array_data(self.data_transformation_config.transformed_unsampled_train_path, array=unsampled_train_arr)
                 save_numpy_array_data(self.data_transformation_config.transformed_test_path, array=test_arr)
 
                 logger.info("Saved the preprocessor object")
@@ -226,7 +280,10 @@ class DataTransformation:
                 data_transformation_artifact = DataTransformationArtifact(
                     preprocessor_object_path=self.data_transformation_config.preprocessor_object_path,
                     transformed_train_path=self.data_transformation_config.transformed_train_path,
-                    transformed_test_path=self.data_transformation_config.transformed_test_path
+                    transformed_test_path=self.data_transformation_config.transformed_test_path,
+                    feature_pipeline_path=self.data_transformation_config.feature_pipeline_path,
+                    preprocessor_refitted=preprocessor_refitted,
+                    transformed_unsampled_train_path=self.data_transformation_config.transformed_unsampled_train_path
                 )
                 return data_transformation_artifact
             else:
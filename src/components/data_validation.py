@@ -3,16 +3,17 @@ import sys
 import pandas as pd
 from pandas import DataFrame
 
-from evidently import Report
-from evidently.metrics import *
-from evidently.presets import *
-
 from src.exception import CustomException
 from src.logger.logger import setup_logger, log_file
 from src.entity.config_entity import DataIngestionConfig, DataValidationConfig
 from src.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
-from src.constants import SCHEMA_FILE_PATH
-from src.utils.main_utils import read_yaml_file, write_yaml_file
+from src.entity.schema_validator import SchemaValidator
+from src.constants import SCHEMA_FILE_PATH, MODEL_TRAINER_CONFIG_PATH
+from src.utils.main_utils import read_yaml_file, write_yaml_file, dataframe_fingerprint, file_hash
+from src.utils.feature_pipeline_utils import schema_hash
+from src.utils.dtype_utils import read_csv_with_plan
+from src.utils.drift_utils import build_reference_profile, compare_to_profile
+from src.utils.profiler import profile_section
 
 # Logger;
 logger = setup_logger("data_validation", log_file)
@@ -33,78 +34,131 @@ class DataValidation:
             self.data_ingestion_artifact = data_ingestion_artifact
             self.data_validation_config = data_validation_config
             self.schema_file_data = read_yaml_file(file_path=SCHEMA_FILE_PATH)
+            self.schema_validator = SchemaValidator(self.schema_file_data)
         except Exception as e:
             raise CustomException(e,sys)
     
-    def validate_number_of_columns(self, dataframe: DataFrame) -> bool:
+    def validate_schema(self, file_path: str) -> dict:
         '''
-        Docstring for validate_number_of_columns
+        Streams the file through the compiled schema validator in chunks
         
-        :param self: class
-        :param df: dataframe from the input data
-        :type df: Pandas DataFrame
+        :param self: Description
+        :param file_path: Description
+        :type file_path: str
+        :return: structured report with row-level violation counts
+        :rtype: dict
         '''
         try:
-            status=len(dataframe.columns)==len(self.schema_file_data["columns"])
-            logger.info(f"Number of Columns Validation:{status}")
-            return status
+            return self.schema_validator.validate_file(file_path, chunksize=self.data_validation_config.chunk_size)
         except Exception as e:
             raise CustomException(e,sys)
-            
-    def does_columns_exist(self,dataframe: DataFrame) -> bool:
+    
+    @staticmethod
+    def read_data(filepath):
+        try:
+            with profile_section("read_csv"):
+                df = read_csv_with_plan(filepath)
+            return df
+        except Exception as e:
+            raise CustomException(e,sys)
+    
+    def get_drift_columns(self) -> tuple:
         '''
-        Docstring for does_columns_exist
+        Numerical and categorical schema columns checked for drift; the id column is skipped
         
         :param self: Description
-        :param dataframe: Description
-        :type dataframe: DataFrame
+        :return: (numerical_columns, categorical_columns)
+        :rtype: tuple
+        '''
+        id_column = self.schema_file_data.get("id_column")
+        numerical_columns = [c for c in self.schema_file_data["numerical_columns"] if c != id_column]
+        categorical_columns = [c for c in self.schema_file_data["categorical_columns"] if c != id_column]
+        return numerical_columns, categorical_columns
+    
+    def create_reference_profile(self, reference_df: DataFrame) -> dict:
+        '''
+        Builds the compact reference profile of the training set and saves it;
+        the profile is shipped next to the model so later drift checks need no reference CSV
+        
+        :param self: Description
+        :param reference_df: Description
+        :type reference_df: DataFrame
+        :return: Description
+        :rtype: dict
         '''
         
         try:
+            numerical_columns, categorical_columns = self.get_drift_columns()
+            reference_profile = build_reference_profile(
+                dataframe=reference_df,
+                numerical_columns=numerical_columns,
+                categorical_columns=categorical_columns,
+                n_bins=self.data_validation_config.drift_num_bins,
+                n_quantiles=self.data_validation_config.profile_quantiles
+            )
             
-            missing_num_col_flag = False
-            missing_cat_col_flag = False
-            
-            # Column list in Dataframe;
-            dataframe_columns = dataframe.columns
-            missing_num_columns = []
-            for col_name in self.schema_file_data["numerical_columns"]:
-                if col_name not in dataframe_columns:
-                    missing_num_columns.append(col_name)
-            
-            if len(missing_num_columns):
-                missing_num_col_flag = True
-                logger.info(f"Missing Numerical Columns: {missing_num_columns}")
-            else:
-                logger.info(f"Missing Numerical Columns - NULL")
-            
-            missing_categorical_columns = []
-            for col_name in self.schema_file_data["categorical_columns"]:
-                if col_name not in dataframe_columns:
-                    missing_categorical_columns.append(col_name)
-            
-            if len(missing_categorical_columns):
-                missing_cat_col_flag = True
-                logger.info(f"Missing Categorical Columns: {missing_categorical_columns}")
-            else:
-                logger.info(f"Missing Categorical Columns - NULL")
+            # Fingerprint of the data, schema and model search config the model is trained from;
+            reference_profile["fingerprint"] = {
+                "rows": int(len(reference_df)),
+                "data_hash": dataframe_fingerprint(reference_df),
+                "schema_hash": schema_hash(self.schema_file_data),
+                "model_config_hash": file_hash(MODEL_TRAINER_CONFIG_PATH),
+            }
             
-            return False if missing_num_col_flag or missing_cat_col_flag else True
+            # Write the reference profile to a yaml File
+            write_yaml_file(self.data_validation_config.reference_profile_file, reference_profile, replace=True)
+            logger.info(f"Reference profile saved at {self.data_validation_config.reference_profile_file}")
             
+            return reference_profile
+        
         except Exception as e:
             raise CustomException(e,sys)
     
-    @staticmethod
-    def read_data(filepath):
+    def detect_data_drift(self, reference_profile: dict, current_df: DataFrame, reference_df: DataFrame = None) -> bool:
+        '''
+        Detects data drift of current_df against the reference profile with the
+        built-in PSI / KS / chi-square engine and writes the drift report
+        
+        :param self: Description
+        :param reference_profile: Description
+        :type reference_profile: dict
+        :param current_df: Description
+        :type current_df: DataFrame
+        :param reference_df: only needed for the detailed evidently report
+        :type reference_df: DataFrame
+        :return: Description
+        :rtype: bool
+        '''
+        
         try:
-            df = pd.read_csv(filepath)
-            return df
+            # Drift report;
+            drift_report = compare_to_profile(
+                reference_profile=reference_profile,
+                current_df=current_df,
+                psi_threshold=self.data_validation_config.psi_threshold,
+                p_value_threshold=self.data_validation_config.p_value_threshold,
+                drift_share=self.data_validation_config.drift_share_threshold
+            )
+            
+            # Write the Data drift report to a yaml File
+            write_yaml_file(self.data_validation_config.drift_report_file, drift_report, replace=True)
+            
+            logger.info(f"Drifted feature count: {drift_report['drifted_feature_count']} / {drift_report['total_features']}")
+            logger.info(f"Drifted features: {drift_report['drifted_features']}")
+            logger.info(f"Dataset drift detected: {drift_report['dataset_drift']}")
+            
+            # Evidently report only when asked for, it is slow on large frames;
+            if self.data_validation_config.detailed_drift_report and reference_df is not None:
+                self.generate_detailed_drift_report(reference_df, current_df)
+            
+            return drift_report["dataset_drift"]
+        
         except Exception as e:
             raise CustomException(e,sys)
     
-    def detect_data_drift(self, reference_df: DataFrame, current_df: DataFrame) -> bool:
+    def generate_detailed_drift_report(self, reference_df: DataFrame, current_df: DataFrame) -> dict:
         '''
-        Docstring for detect_data_drift
+        Optional detailed drift report built with evidently
         
         :param self: Description
         :param reference_df: Description
@@ -112,10 +166,13 @@ class DataValidation:
         :param current_df: Description
         :type current_df: DataFrame
         :return: Description
-        :rtype: bool
+        :rtype: dict
         '''
         
         try:
+            from evidently import Report
+            from evidently.presets import DataDriftPreset
+            
             # Evidently report;
             report = Report([
                 DataDriftPreset()
@@ -123,56 +180,13 @@ class DataValidation:
 
             # Evaluate for Data Drift Report;
             report_eval = report.run(reference_df, current_df)
-            json_report = report_eval.json()
-            print(f"json_report:{json_report}")
-            
-            # Write the Data dript report to a yaml File
-            write_yaml_file(self.data_validation_config.drift_report_file,json_report)
-            
-            # Number of features
-            metrics = json_report["metrics"]
-            feature_metrics = [
-                m for m in metrics
-                if m["metric_name"].startswith("ValueDrift")
-            ]
-            total_features = len(feature_metrics)
-            print("Total features:", total_features)
-            
-            # Drifted Features;
-            drifted_features = []
-            for m in feature_metrics:
-                column = m["config"]["column"]
-                p_value = m["value"]
-                threshold = m["config"]["threshold"]
-
-                if p_value < threshold:
-                    drifted_features.append(column)
+            detailed_report = report_eval.dict()
             
-            # Number of Drifted Features;
-            drift_count_metric = next(
-                m for m in metrics
-                if m["metric_name"].startswith("DriftedColumnsCount")
-            )
-
-            drifted_count = drift_count_metric["value"]["count"]
-            drifted_share = drift_count_metric["value"]["share"]
-
-            print("Drifted feature count:", drifted_count)
-            print("Drifted feature share:", drifted_share)
-
-            # Overal Drift;
-            dataset_drift = drifted_share >= drift_count_metric["config"]["drift_share"]
-            print("Dataset drift detected:", dataset_drift)
-
-            summary = {
-                "total_features": total_features,
-                "drifted_feature_count": int(drifted_count),
-                "drifted_features": drifted_features,
-                "dataset_drift": dataset_drift
-            }
-            print(summary)
+            # Write the detailed Data drift report to a yaml File
+            write_yaml_file(self.data_validation_config.detailed_drift_report_file, detailed_report, replace=True)
+            logger.info(f"Detailed drift report saved at {self.data_validation_config.detailed_drift_report_file}")
             
-            return dataset_drift
+            return detailed_report
         
         except Exception as e:
             raise CustomException(e,sys)
@@ -184,41 +198,50 @@ class DataValidation:
             validation_err_msg = ""
             logger.info("Starting Data Validation")
             
-            # Get Train and Test CSV;
-            logger.info("Retrieve Training and Test sets")
-            train_df,test_df = (DataValidation.read_data(self.data_ingestion_artifact.training_file_path),DataValidation.read_data(self.data_ingestion_artifact.testing_file_path))
+            # Schema validation of Train and Test CSV, streamed in chunks;
+            train_report = self.validate_schema(self.data_ingestion_artifact.training_file_path)
+            logger.info(f"Training Set: Schema Validation - Status:{train_report['status']}")
+            if not train_report["status"]:
+                validation_err_msg += f"Training Set: {'; '.join(train_report['errors'])}. "
             
-            # Validate Number of Columns;
-            status = self.validate_number_of_columns(train_df)
-            logger.info(f"Training Set: Validate Number of Columns - Status:{status}")
-            if not status:
-                validation_err_msg += f"Columns missing in Training Set"
+            train_ids = self.schema_validator.seen_ids
             
-            status = self.validate_number_of_columns(test_df)
-            logger.info(f"Test Set: Validate Number of Columns - Status:{status}")
-            if not status:
-                validation_err_msg += f"Columns missing in Test Set"
+            test_report = self.validate_schema(self.data_ingestion_artifact.testing_file_path)
+            # Ids in both sets leak training rows into the evaluation;
+            shared_ids = self.schema_validator.count_shared_ids(train_ids)
+            test_report["ids_shared_with_train"] = shared_ids
+            if shared_ids:
+                test_report["status"] = False
+                test_report["errors"].append(f"{self.schema_validator.id_column}: {shared_ids} ids also in the training set")
+            logger.info(f"Test Set: Schema Validation - Status:{test_report['status']}")
+            if not test_report["status"]:
+                validation_err_msg += f"Test Set: {'; '.join(test_report['errors'])}. "
             
-            # Does all columns Exist;
-            status = self.does_columns_exist(train_df)
-            logger.info(f"Training Set: Missing Columns - Status:{status}")
-            if not status:
-                validation_err_msg += f"Columns missing in Training Set"
-            
-            status = self.does_columns_exist(test_df)
-            logger.info(f"Test Set: Missing Columns - Status:{status}")
-            if not status:
-                validation_err_msg += f"Columns missing in Test Set"
-            
-            # Data Drift To be added;
+            write_yaml_file(self.data_validation_config.validation_report_file,
+                            {"train": train_report, "test": test_report}, replace=True)
             
             # Flag for Validation status;
             validation_status = True if len(validation_err_msg) == 0 else False
             
+            # Reference profile of Training set and Data Drift of Test set against it;
+            drift_status = False
+            drift_report_path = ""
+            reference_profile_path = ""
+            if validation_status:
+                logger.info("Retrieve Training and Test sets")
+                train_df,test_df = (DataValidation.read_data(self.data_ingestion_artifact.training_file_path),DataValidation.read_data(self.data_ingestion_artifact.testing_file_path))
+                reference_profile = self.create_reference_profile(reference_df=train_df)
+                reference_profile_path = self.data_validation_config.reference_profile_file
+                drift_status = self.detect_data_drift(reference_profile=reference_profile, current_df=test_df, reference_df=train_df)
+                drift_report_path = self.data_validation_config.drift_report_file
+                logger.info(f"Data Drift - Status:{drift_status}")
+            
             data_validation_artifact = DataValidationArtifact(
                 validation_status=validation_status,
                 message=validation_err_msg,
-                drift_report_path=""
+                drift_report_path=drift_report_path,
+                drift_status=drift_status,
+                reference_profile_path=reference_profile_path
             )
             
             logger.info("Data Validation Finished")
@@ -234,13 +257,11 @@ if __name__ == "__main__":
     import pandas as pd
     df = pd.read_csv(r"C:\Work_Directory\Learn\DS_Projects\Global_Mobility_Application_Analyser\artifacts\02_04_2026__22_21_04\data_ingestion\feature_store\us_visa_data.csv")
     print(f"Columns List in Input Dataframe : {df.columns.to_list()}")
-    clss = DataValidation('a','b')
-    # clss.validate_number_of_columns(df)
-    # ret = clss.does_columns_exist(df)
-    # print(ret)
+    clss = DataValidation('a', DataValidationConfig())
     
     ref_df = df[:60]
     curr_df = df[61:120]
-    clss.detect_data_drift(ref_df, curr_df)
+    ref_profile = clss.create_reference_profile(ref_df)
+    clss.detect_data_drift(ref_profile, curr_df)
             
 
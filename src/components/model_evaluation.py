@@ -1,17 +1,17 @@
 from dataclasses import dataclass
-from src.logger.logger import setup_logger,log_file
+from src.logger.logger import setup_logger,log_file,log_event
 from src.constants import *
 from src.entity.artifact_entity import ModelEvaluationArtifact, ModelTrainerArtifact, DataIngestionArtifact
 from src.exception import CustomException
-from src.entity.estimator import TargetValueMapping, VisaModel
 from src.entity.s3_estimator import S3ModelEstimator
 from src.entity.config_entity import ModelEvaluationConfig
+from src.entity.evaluation_engine import EvaluationEngine
+from src.utils.main_utils import load_object
+from src.utils.profiler import profile_section
 
 import sys
 import os
-from sklearn.metrics import f1_score
 from typing import Optional
-import pandas as pd
 
 # Initialize logger
 logger = setup_logger("model_evaluation", log_file)
@@ -22,6 +22,8 @@ class EvaluateModelResponse:
     best_model_f1_score: float
     is_model_accepted: bool
     difference: float
+    f1_difference_interval: Optional[tuple] = None
+    evaluation_report: Optional[dict] = None
 
 # Model Evaluation class
 class ModelEvaluation:
@@ -58,6 +60,24 @@ class ModelEvaluation:
             logger.error(f"Error while retrieving the best model: {e}")
             raise CustomException(e, sys)
         
+    def accept_model(self, difference: float, has_production_model: bool, f1_difference_interval: Optional[tuple]) -> tuple:
+        """
+        Method Name :   accept_model
+        Description :   A trained model replaces the production model only when its F1 is higher by more
+                        than changed_threshold_score, so noise-level gains do not trigger a push and
+                        invalidate the serving caches; in sample mode the lower bound of the F1 difference
+                        interval must also be above zero. Without a production model any positive F1 is accepted.
+        
+        Output      :   (is_model_accepted, reason)
+        """
+        if not has_production_model:
+            return difference > 0, "no_production_model"
+        if difference <= self.model_evaluation_config.changed_threshold_score:
+            return False, "below_changed_threshold"
+        if f1_difference_interval is not None and f1_difference_interval[0] <= 0:
+            return False, "difference_not_significant"
+        return True, "above_changed_threshold"
+        
     def evaluate_model(self) -> EvaluateModelResponse:
         """
         Method Name :   evaluate_model
@@ -69,30 +89,33 @@ class ModelEvaluation:
         """
         try:
             
-            # Test dataset loading and preprocessing
-            test_df = pd.read_csv(self.data_ingestion_artifact.testing_file_path)
-            test_df['company_age'] = CURRENT_YEAR-test_df['yr_of_estab']
-
-            x, y = test_df.drop(TARGET_COLUMN, axis=1), test_df[TARGET_COLUMN]
-            y = y.replace(
-                TargetValueMapping()._asdict()
-            )
-
-            # Local Model F1 Score Calculation
-            trained_model_f1_score = self.model_trainer_artifact.model_metric_artifact.model_f1_score
-
-            # S3 Model F1 Score Calculation
-            best_model_f1_score=None
+            # Trained model and, when there is one, the production model, scored on the same test rows
+            models = {"trained": load_object(self.model_trainer_artifact.trained_model_path)}
             best_model = self.get_best_model()
             if best_model is not None:
-                y_hat_best_model = best_model.predict(x)
-                best_model_f1_score = f1_score(y, y_hat_best_model)
+                models["production"] = best_model.load_model()
+            logger.info(f"Trained model F1 on the resampled test set: {self.model_trainer_artifact.model_metric_artifact.model_f1_score}")
+
+            with profile_section("predict"):
+                evaluation_report = EvaluationEngine(self.model_evaluation_config).evaluate(
+                    self.data_ingestion_artifact.testing_file_path, models)
+
+            trained_model_f1_score = evaluation_report["metrics"]["trained"]["f1_score"]
+            best_model_f1_score = evaluation_report["metrics"]["production"]["f1_score"] if best_model is not None else None
             
             tmp_best_model_score = 0 if best_model_f1_score is None else best_model_f1_score
+            difference = trained_model_f1_score - tmp_best_model_score
+            is_model_accepted, reason = self.accept_model(difference, best_model is not None,
+                                                          evaluation_report["f1_difference_interval"])
+            log_event(logger, "model_evaluation_decision", is_model_accepted=is_model_accepted, reason=reason,
+                      difference=round(difference, 4),
+                      changed_threshold_score=self.model_evaluation_config.changed_threshold_score)
             result = EvaluateModelResponse(trained_model_f1_score=trained_model_f1_score,
                                 best_model_f1_score=best_model_f1_score,
-                                is_model_accepted=trained_model_f1_score > tmp_best_model_score,
-                                difference=trained_model_f1_score - tmp_best_model_score
+                                is_model_accepted=is_model_accepted,
+                                difference=difference,
+                                f1_difference_interval=evaluation_report["f1_difference_interval"],
+                                evaluation_report=evaluation_report
                             )
             logger.info(f"Result: {result}")
             return result
@@ -116,6 +139,8 @@ class ModelEvaluation:
                 is_model_accepted=evaluate_model_response.is_model_accepted,
                 s3_model_path=s3_model_path,
                 trained_model_path=self.model_trainer_artifact.trained_model_path,
+                trained_profile_path=self.model_trainer_artifact.trained_profile_path,
+                trained_feature_pipeline_path=self.model_trainer_artifact.trained_feature_pipeline_path,
                 changed_accuracy=evaluate_model_response.difference)
 
             logger.info(f"Model evaluation artifact: {model_evaluation_artifact}")
@@ -7,7 +7,7 @@ from src.entity.artifact_entity import ModelPusherArtifact, ModelEvaluationArtif
 from src.entity.config_entity import ModelPusherConfig, ModelTrainerConfig
 from src.exception import CustomException
 from src.entity.s3_estimator import S3ModelEstimator
-from src.cloud_storage.aws_storage import SimpleStorageService
+from src.cloud_storage.local_storage import get_storage_service
 
 # Logger initialization
 logger = setup_logger("model_pusher", log_file)
@@ -22,7 +22,7 @@ class ModelPusher:
         """
         self.model_pusher_config = model_pusher_config
         self.model_evaluation_artifact = model_evaluation_artifact
-        self.s3 = SimpleStorageService()
+        self.s3 = get_storage_service()
         self.s3ModelEstimator = S3ModelEstimator(bucket_name=self.model_pusher_config.bucket_name, model_path=self.model_pusher_config.s3_model_key_path)
         
     def initiate_model_pusher(self) -> ModelPusherArtifact:
@@ -35,6 +35,18 @@ class ModelPusher:
             self.s3ModelEstimator.save_model(from_file=self.model_evaluation_artifact.trained_model_path, remove=False)
             logger.info("Model successfully pushed to S3 bucket.")
             
+            # Reference profile goes next to the model for drift checks;
+            if self.model_evaluation_artifact.trained_profile_path and os.path.exists(self.model_evaluation_artifact.trained_profile_path):
+                self.s3ModelEstimator.save_profile(from_file=self.model_evaluation_artifact.trained_profile_path,
+                                                   profile_path=self.model_pusher_config.s3_profile_key_path, remove=False)
+                logger.info("Reference profile successfully pushed to S3 bucket.")
+            
+            # Feature pipeline artifact lets the next retrain reuse the pushed preprocessor;
+            if self.model_evaluation_artifact.trained_feature_pipeline_path and os.path.exists(self.model_evaluation_artifact.trained_feature_pipeline_path):
+                self.s3ModelEstimator.save_profile(from_file=self.model_evaluation_artifact.trained_feature_pipeline_path,
+                                                   profile_path=self.model_pusher_config.s3_feature_pipeline_key_path, remove=False)
+                logger.info("Feature pipeline artifact successfully pushed to S3 bucket.")
+            
             return ModelPusherArtifact(s3_model_path=self.model_pusher_config.s3_model_key_path, bucket_name=self.model_pusher_config.bucket_name)
         except Exception as e:
             logger.error(f"Error while pushing the model: {e}")
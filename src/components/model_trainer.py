@@ -1,6 +1,6 @@
 import sys
+import shutil
 from sklearn.metrics import precision_score, recall_score, f1_score, accuracy_score
-from neuro_mf import ModelFactory
 from sklearn.pipeline import Pipeline
 import os
 import pandas as pd
@@ -12,44 +12,60 @@ from src.exception import CustomException
 from src.logger.logger import setup_logger, log_file
 from src.constants import MODEL_TRAINER_CONFIG_PATH, MODEL_TRAINED_EXPECTED_SCORE
 from src.entity.config_entity import ModelTrainerConfig
-from src.utils.main_utils import read_yaml_file, load_object, save_object, load_numpy_array_data
-from src.entity.artifact_entity import ModelTrainerArtifact, ClassificationMetricArtifact, DataTransformationArtifact
+from src.utils.main_utils import read_yaml_file, write_yaml_file, load_object, save_object, load_numpy_array_data
+from src.entity.artifact_entity import ModelTrainerArtifact, ClassificationMetricArtifact, DataTransformationArtifact, DataValidationArtifact
 from src.entity.estimator import VisaModel
+from src.entity.cv_selection import CVResultStore, FoldCachedModelSelector
+from src.components.data_transformation import get_resampler
+from src.utils.profiler import profile_section
 
 # File specific Logger;
 logger = setup_logger('model_trainer', log_file)
 
 class ModelTrainer:
-    def __init__(self, model_trainer_config: ModelTrainerConfig, data_transformation_artifact: DataTransformationArtifact):
+    def __init__(self, model_trainer_config: ModelTrainerConfig, data_transformation_artifact: DataTransformationArtifact,
+                 data_validation_artifact: DataValidationArtifact):
         self.model_trainer_config = model_trainer_config
         self.data_transformation_artifact = data_transformation_artifact
+        self.data_validation_artifact = data_validation_artifact
         
-    def get_model_object_and_report(self, train: np.array, test: np.array) -> Tuple[object, object]:
+    def get_model_object_and_report(self, train: np.array, test: np.array, unsampled_train: np.array) -> Tuple[object, object]:
         """
         Method Name :   get_model_object_and_report
-        Description :   This function uses neuro_mf to get the best model object and report of the best model
+        Description :   This function searches the models of config/model.yaml with fold-cached
+                        cross-validation on the training rows before resampling, resampling each
+                        fold's training split, to get the best model object and report of the best model
         
         Output      :   Returns metric artifact object and best model object
         On Failure  :   Write an exception log and then raise an exception
         """
         try:
             
-            # Model Factory;
-            logger.info("Using neuro_mf to get best model object and report")
-            model_factory = ModelFactory(model_config_path=self.model_trainer_config.model_config_path)
+            # Model selector with the fold scores of previous runs;
+            logger.info("Using fold-cached cross-validation to get best model object and report")
+            cv_result_store = CVResultStore(file_path=self.model_trainer_config.cv_cache_path,
+                                            max_entries=self.model_trainer_config.cv_cache_max_entries,
+                                            enabled=self.model_trainer_config.cv_cache_enabled,
+                                            max_changed_share=self.model_trainer_config.cv_cache_max_changed_share)
+            model_selector = FoldCachedModelSelector(model_config_path=self.model_trainer_config.model_config_path,
+                                                     cv_result_store=cv_result_store,
+                                                     resampler=get_resampler(self.model_trainer_config.resample_random_state))
             
             # Train test split;
             x_train, y_train, x_test, y_test = train[:, :-1], train[:, -1], test[:, :-1], test[:, -1]
             
-            # Get best model object and report;
-            best_model_detail = model_factory.get_best_model(
-                X=x_train,y=y_train,base_accuracy=self.model_trainer_config.expected_score
-            )
+            # Get best model object and report; the resampled train array is the refit data;
+            with profile_section("FoldCachedModelSelector.get_best_model"):
+                best_model_detail = model_selector.get_best_model(x=unsampled_train[:, :-1], y=unsampled_train[:, -1],
+                                                                  refit_x=x_train, refit_y=y_train)
             model_obj = best_model_detail.best_model
-            logger.info("Retrieved best model object from model factory")
+            write_yaml_file(self.model_trainer_config.cv_report_path, best_model_detail.report, replace=True)
+            logger.info(f"Retrieved best model object from model selector: {best_model_detail.best_parameters}, "
+                        f"cv cache hit ratio {best_model_detail.report['hit_ratio']}")
 
             # Predict on test data using best model;
-            y_pred = model_obj.predict(x_test)
+            with profile_section("predict"):
+                y_pred = model_obj.predict(x_test)
             logger.info("Used best model to predict on test data")
             
             # Calculate metrics;
@@ -81,9 +97,11 @@ class ModelTrainer:
             # Load the transformed training and testing numpy array data
             train_arr = load_numpy_array_data(file_path=self.data_transformation_artifact.transformed_train_path)
             test_arr = load_numpy_array_data(file_path=self.data_transformation_artifact.transformed_test_path)
+            unsampled_train_arr = load_numpy_array_data(file_path=self.data_transformation_artifact.transformed_unsampled_train_path)
             
             # Get the best model object and report from the get_model_object_and_report method
-            best_model_detail ,metric_artifact = self.get_model_object_and_report(train=train_arr, test=test_arr)
+            best_model_detail ,metric_artifact = self.get_model_object_and_report(train=train_arr, test=test_arr,
+                                                                                  unsampled_train=unsampled_train_arr)
             
             # Load the preprocessor object
             preprocessing_obj = load_object(file_path=self.data_transformation_artifact.preprocessor_object_path)
@@ -100,10 +118,26 @@ class ModelTrainer:
             logger.info("Created best model file path.")
             save_object(self.model_trainer_config.trained_model_path, usvisa_model)
 
+            # Save the training data reference profile next to the model
+            trained_profile_path = ""
+            if self.data_validation_artifact.reference_profile_path:
+                shutil.copyfile(self.data_validation_artifact.reference_profile_path, self.model_trainer_config.trained_profile_path)
+                trained_profile_path = self.model_trainer_config.trained_profile_path
+                logger.info(f"Saved reference profile next to the model at {trained_profile_path}")
+
+            # Save the feature pipeline artifact of the preprocessor next to the model
+            trained_feature_pipeline_path = ""
+            if self.data_transformation_artifact.feature_pipeline_path:
+                shutil.copyfile(self.data_transformation_artifact.feature_pipeline_path, self.model_trainer_config.trained_feature_pipeline_path)
+                trained_feature_pipeline_path = self.model_trainer_config.trained_feature_pipeline_path
+                logger.info(f"Saved feature pipeline artifact next to the model at {trained_feature_pipeline_path}")
+
             # Prepare the model trainer artifact
             model_trainer_artifact = ModelTrainerArtifact(
                 trained_model_path=self.model_trainer_config.trained_model_path,
+                trained_profile_path=trained_profile_path,
                 model_metric_artifact=metric_artifact,
+                trained_feature_pipeline_path=trained_feature_pipeline_path,
             )
             logger.info(f"Model trainer artifact: {model_trainer_artifact}")
             
@@ -0,0 +1,112 @@
+import sys
+
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file, log_event
+from src.entity.config_entity import TrainingGateConfig
+from src.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact, TrainingGateArtifact
+from src.entity.s3_estimator import S3ModelEstimator
+from src.utils.main_utils import read_yaml_file, write_yaml_file
+from src.utils.dtype_utils import read_csv_with_plan
+from src.utils.drift_utils import compare_to_profile
+
+# File specific Logger;
+logger = setup_logger('training_gate', log_file)
+
+
+class TrainingGate:
+    """
+    Decides before transformation whether this run needs to train at all.
+
+    The reference profile of every run carries a fingerprint of its training data,
+    schema and model config. When the production model's profile has the same schema
+    and model config hashes and either the same data hash, or a row count within
+    max_row_change and no column whose PSI against the production profile reaches
+    psi_threshold, a retrain could only reproduce the production model, so the
+    transformation, search and evaluation are skipped.
+    """
+
+    def __init__(self, data_ingestion_artifact: DataIngestionArtifact, data_validation_artifact: DataValidationArtifact,
+                 training_gate_config: TrainingGateConfig):
+        """
+        :param data_ingestion_artifact: Output reference of data ingestion artifact stage
+        :param data_validation_artifact: Output reference of data validation artifact stage
+        :param training_gate_config: Configuration for the training gate
+        """
+        self.data_ingestion_artifact = data_ingestion_artifact
+        self.data_validation_artifact = data_validation_artifact
+        self.training_gate_config = training_gate_config
+
+    def get_production_profile(self) -> dict:
+        """
+        Reference profile pushed with the production model, or None without one
+        """
+        config = self.training_gate_config
+        estimator = S3ModelEstimator(bucket_name=config.bucket_name, model_path=config.s3_model_key_path)
+        if estimator.is_model_present(model_path=config.s3_model_key_path) and \
+                estimator.is_profile_present(profile_path=config.s3_profile_key_path):
+            return estimator.load_profile(profile_path=config.s3_profile_key_path)
+        return None
+
+    def check(self) -> tuple:
+        """
+        Method Name :   check
+        Description :   Compares the fingerprint of this run with the production model's,
+                        cheapest check first; the training data is only read for the drift check
+
+        Output      :   (skip_training: bool, reason: str, details: dict)
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.training_gate_config
+            if not config.enabled:
+                return False, "gate_disabled", {}
+            if not self.data_validation_artifact.validation_status or not self.data_validation_artifact.reference_profile_path:
+                return False, "validation_failed", {}
+
+            production_profile = self.get_production_profile()
+            if production_profile is None or "fingerprint" not in production_profile:
+                return False, "no_production_fingerprint", {}
+
+            current = read_yaml_file(self.data_validation_artifact.reference_profile_path)["fingerprint"]
+            production = production_profile["fingerprint"]
+            details = {"current": current, "production": production}
+            for key in ("schema_hash", "model_config_hash"):
+                if current[key] != production[key]:
+                    return False, f"{key}_changed", details
+            if current["data_hash"] == production["data_hash"]:
+                return True, "data_unchanged", details
+
+            row_change = abs(current["rows"] - production["rows"]) / max(production["rows"], 1)
+            details["row_change"] = round(row_change, 4)
+            if row_change > config.max_row_change:
+                return False, "row_count_changed", details
+
+            train_df = read_csv_with_plan(self.data_ingestion_artifact.training_file_path)
+            drift_report = compare_to_profile(production_profile, train_df, psi_threshold=config.psi_threshold,
+                                              p_value_threshold=0.0, drift_share=1.0)
+            details["drifted_features"] = drift_report["drifted_features"]
+            details["max_psi"] = float(max((report["psi"] for report in drift_report["columns"].values()), default=0.0))
+            if drift_report["drifted_features"]:
+                return False, "drift", details
+            return True, "no_meaningful_change", details
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def initiate_training_gate(self) -> TrainingGateArtifact:
+        """
+        Method Name :   initiate_training_gate
+        Description :   Runs the gate check and writes its report
+
+        Output      :   Returns training gate artifact
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            skip_training, reason, details = self.check()
+            write_yaml_file(self.training_gate_config.report_file_path,
+                            {"skip_training": skip_training, "reason": reason, **details}, replace=True)
+            log_event(logger, "training_gate", skip_training=skip_training, reason=reason,
+                      row_change=details.get("row_change"), drifted_features=details.get("drifted_features"))
+            return TrainingGateArtifact(skip_training=skip_training, reason=reason,
+                                        report_file_path=self.training_gate_config.report_file_path)
+        except Exception as e:
+            raise CustomException(e, sys) from e
@@ -0,0 +1,189 @@
+import glob
+import os
+import sys
+import time
+import uuid
+
+import pandas as pd
+
+from src.constants import LOCAL_DATA_SOURCE_DIR, DATABASE_NAME, COLLECTION_NAME, LOCAL_COLLECTION_MAX_UPSERT_PARTS
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file
+
+# Initialize Logger;
+logging = setup_logger(__name__, log_file)
+
+# File formats a local collection may be stored in
+LOCAL_COLLECTION_FORMATS = (".parquet", ".csv", ".jsonl")
+
+
+class LocalCollection:
+    """
+    Collection of the local document source. A collection is a directory of
+    Parquet, CSV or JSON-lines part files, or a single such file named after it.
+    find() yields documents like pymongo; to_dataframe() reads the parts directly.
+    Part files written here are named by write time, so they sort in write order.
+    """
+
+    def __init__(self, path: str, name: str, max_upsert_parts: int = LOCAL_COLLECTION_MAX_UPSERT_PARTS):
+        self.path = path
+        self.name = name
+        self.max_upsert_parts = max_upsert_parts
+        self._upsert_parts = 0
+
+    def part_files(self) -> list:
+        if os.path.isdir(self.path):
+            return sorted(f for f in glob.glob(os.path.join(self.path, "*")) if f.endswith(LOCAL_COLLECTION_FORMATS))
+        return [self.path + ext for ext in LOCAL_COLLECTION_FORMATS if os.path.exists(self.path + ext)]
+
+    @staticmethod
+    def read_part(file_path: str, columns: list = None) -> pd.DataFrame:
+        if file_path.endswith(".parquet"):
+            return pd.read_parquet(file_path, columns=columns)
+        if file_path.endswith(".jsonl"):
+            dataframe = pd.read_json(file_path, lines=True)
+            return dataframe[[c for c in columns if c in dataframe.columns]] if columns else dataframe
+        return pd.read_csv(file_path, usecols=lambda c: columns is None or c in columns)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        try:
+            parts = [self.read_part(file_path) for file_path in self.part_files()]
+            if not parts:
+                raise FileNotFoundError(f"Local collection {self.name} has no data under {self.path}")
+            return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def aggregate_dataframe(self, pipeline: list, part_files: list = None) -> pd.DataFrame:
+        """
+        Runs the $match, $sample and $project stages of an ingestion pipeline. Only the
+        matched and projected columns are read from columnar parts, and each part is
+        filtered before the parts are concatenated.
+        part_files: list subset of the part files to read, e.g. one export partition
+        """
+        try:
+            match, sample_size, projection = {}, None, None
+            for stage in pipeline:
+                if "$match" in stage:
+                    match.update(stage["$match"])
+                elif "$sample" in stage:
+                    sample_size = stage["$sample"]["size"]
+                elif "$project" in stage:
+                    projection = [c for c, keep in stage["$project"].items() if keep and c != "_id"]
+                else:
+                    raise ValueError(f"Unsupported pipeline stage for a local collection: {list(stage)}")
+
+            columns = None if projection is None else list(dict.fromkeys(projection + list(match)))
+            part_files = self.part_files() if part_files is None else part_files
+            parts = [self._apply_match(self.read_part(file_path, columns), match) for file_path in part_files]
+            if not parts:
+                raise FileNotFoundError(f"Local collection {self.name} has no data under {self.path}")
+            dataframe = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+            if sample_size is not None and sample_size < len(dataframe):
+                dataframe = dataframe.sample(n=sample_size).reset_index(drop=True)
+            if projection is not None:
+                dataframe = dataframe[[c for c in projection if c in dataframe.columns]]
+            return dataframe
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    @staticmethod
+    def _apply_match(dataframe: pd.DataFrame, match: dict) -> pd.DataFrame:
+        comparisons = {
+            "$gt": lambda column, value: column > value,
+            "$gte": lambda column, value: column >= value,
+            "$lt": lambda column, value: column < value,
+            "$lte": lambda column, value: column <= value,
+            "$eq": lambda column, value: column == value,
+            "$ne": lambda column, value: column != value,
+            "$in": lambda column, value: column.isin(value),
+            "$nin": lambda column, value: ~column.isin(value),
+        }
+        mask = pd.Series(True, index=dataframe.index)
+        for field, conditions in match.items():
+            for operator, value in conditions.items():
+                mask &= comparisons[operator](dataframe[field], value)
+        return dataframe[mask] if match else dataframe
+
+    def find(self, filter: dict = None):
+        for file_path in self.part_files():
+            yield from self.read_part(file_path).to_dict(orient="records")
+
+    def count_documents(self, filter: dict = None) -> int:
+        return sum(len(self.read_part(file_path)) for file_path in self.part_files())
+
+    def insert_dataframe(self, dataframe: pd.DataFrame) -> str:
+        """
+        Appends the rows as a new Parquet part file
+        """
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            part_path = os.path.join(self.path, f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet")
+            dataframe.to_parquet(part_path + ".tmp", index=False)
+            os.replace(part_path + ".tmp", part_path)
+            return part_path
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def insert_many(self, documents: list) -> None:
+        self.insert_dataframe(pd.DataFrame(list(documents)))
+
+    def upsert_dataframe(self, dataframe: pd.DataFrame, key_column: str) -> int:
+        """
+        Inserts or replaces rows by key_column. The rows are appended as a new part and
+        older rows of the same key are only dropped by compact(), which runs once
+        max_upsert_parts parts were appended and when the writer closes
+        :return: number of rows appended
+        """
+        try:
+            self.insert_dataframe(dataframe)
+            self._upsert_parts += 1
+            if self._upsert_parts >= self.max_upsert_parts:
+                self.compact(key_column)
+            return len(dataframe)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def compact(self, key_column: str) -> int:
+        """
+        Rewrites the collection as one part with the last row of every key_column value;
+        the old parts are removed only after the new one is in place
+        :return: number of rows in the collection
+        """
+        try:
+            old_parts = self.part_files()
+            self._upsert_parts = 0
+            if len(old_parts) < 2:
+                return sum(len(self.read_part(file_path)) for file_path in old_parts)
+            dataframe = self.to_dataframe().drop_duplicates(subset=key_column, keep="last")
+            self.insert_dataframe(dataframe)
+            for file_path in old_parts:
+                os.remove(file_path)
+            return len(dataframe)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def drop(self) -> None:
+        for file_path in self.part_files():
+            os.remove(file_path)
+
+
+class LocalDatabase:
+    def __init__(self, path: str):
+        self.path = path
+
+    def __getitem__(self, collection_name: str) -> LocalCollection:
+        return LocalCollection(os.path.join(self.path, collection_name), collection_name)
+
+
+class LocalDocumentClient:
+    """
+    Filesystem stand-in for MongoDbClient with the same database/collection attributes
+    """
+    def __init__(self, database_name=DATABASE_NAME, data_dir: str = LOCAL_DATA_SOURCE_DIR):
+        try:
+            self.database = LocalDatabase(os.path.join(data_dir, database_name))
+            self.collection = self.database[COLLECTION_NAME]
+            logging.info(f"Local document source at {self.database.path}")
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -1,29 +1,150 @@
+import importlib.util
+import os
+import threading
+import time
+
+from pymongo import monitoring
 from pymongo.mongo_client import MongoClient
+from pymongo.read_preferences import ReadPreference
 from pymongo.server_api import ServerApi
 from src.logger.logger import setup_logger, log_file
 from src.exception import CustomException
 import sys
 
-from src.constants import MONGO_DB_URL, DATABASE_NAME, COLLECTION_NAME
+from src.constants import (MONGO_DB_URL, DATABASE_NAME, COLLECTION_NAME, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE,
+                           MONGO_MAX_IDLE_TIME_MS, MONGO_COMPRESSORS, MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                           MONGO_CONNECT_TIMEOUT_MS, MONGO_FIND_BATCH_SIZE)
 
 # Initialize Logger;
 logging = setup_logger(__name__, log_file)
 
+# Python modules pymongo needs for each wire compressor; zlib is built in
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+class ConnectionCheckoutListener(monitoring.ConnectionPoolListener):
+    """
+    Times every connection checkout of the pool. Checkout start and end are
+    published on the thread that asks for the connection, so a thread-local start
+    time pairs them.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def connection_check_out_started(self, event):
+        self._local.start = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        start = getattr(self._local, "start", None)
+        if start is None:
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.checkouts += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.failures += 1
+
+    def stats(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "failures": self.failures,
+            "mean_checkout_ms": round(self.total_ms / self.checkouts, 3) if self.checkouts else None,
+            "max_checkout_ms": round(self.max_ms, 3),
+        }
+
+    # Remaining pool events are not needed for checkout timing;
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_created(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_closed(self, event): pass
+    def connection_checked_in(self, event): pass
+
+
+# Process-wide client, re-created in a forked child since MongoClient is not fork-safe
+_client: MongoClient = None
+_client_pid: int = None
+_client_lock = threading.Lock()
+checkout_listener = ConnectionCheckoutListener()
+
+
+def available_compressors(compressors: str = MONGO_COMPRESSORS) -> list:
+    """
+    Configured wire compressors whose Python module is installed, in order of preference
+    """
+    return [name for name in compressors.split(",")
+            if name in COMPRESSOR_MODULES and importlib.util.find_spec(COMPRESSOR_MODULES[name]) is not None]
+
+
+def get_mongo_client() -> MongoClient:
+    """
+    Shared pooled MongoClient of this process. Created on first use with connect=False,
+    so nothing touches the network until the first operation.
+    """
+    global _client, _client_pid
+    try:
+        with _client_lock:
+            if _client is None or _client_pid != os.getpid():
+                if MONGO_DB_URL is None:
+                    logging.error("MONGO_DB_URL not set in env")
+                    raise Exception("MONGO_DB_URL not set in env")
+                compressors = available_compressors()
+                _client = MongoClient(MONGO_DB_URL, server_api=ServerApi('1'), connect=False,
+                                      maxPoolSize=MONGO_MAX_POOL_SIZE, minPoolSize=MONGO_MIN_POOL_SIZE,
+                                      maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                                      serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                                      connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                                      compressors=compressors or None,
+                                      event_listeners=[checkout_listener])
+                _client_pid = os.getpid()
+                logging.info(f"Created pooled MongoClient (maxPoolSize={MONGO_MAX_POOL_SIZE}, "
+                             f"compressors={compressors})")
+            return _client
+    except Exception as e:
+        raise CustomException(e,sys)
+
+
 class MongoDbClient:
     def __init__(self,database_name=DATABASE_NAME):
-        
+
         try:
-            if MONGO_DB_URL is None:
-                logging.error("MONGO_DB_URL not set in env")
-                raise Exception("MONGO_DB_URL not set in env")
-            
-            # Create a new client and connect to the server
-            self.client = MongoClient(MONGO_DB_URL, server_api=ServerApi('1'))
+            # Shared pooled client; connects lazily on the first operation
+            self.client = get_mongo_client()
             self.database = self.client[database_name]
             self.collection = self.database[COLLECTION_NAME]
-            
+
             logging.info("MongoDb Client connection is successful.")
-        
+
         except Exception as e:
             raise CustomException(e,sys)
-        
+
+    def export_collection(self, collection_name: str = COLLECTION_NAME):
+        """
+        Collection handle for bulk exports: reads go to a secondary when one is
+        available, keeping long scans off the primary
+        """
+        return self.database.get_collection(collection_name, read_preference=ReadPreference.SECONDARY_PREFERRED)
+
+    def find_for_export(self, collection_name: str = COLLECTION_NAME, filter: dict = None,
+                        batch_size: int = MONGO_FIND_BATCH_SIZE):
+        """
+        Cursor over a collection with the export read preference and a large batch size,
+        so each round trip returns batch_size documents instead of the 101-document default
+        """
+        return self.export_collection(collection_name).find(filter or {}, batch_size=batch_size)
+
+    @staticmethod
+    def pool_stats() -> dict:
+        return checkout_listener.stats()
@@ -1,5 +1,4 @@
 import os
-from datetime import datetime
 
 # # Load values from .env file;
 # from dotenv import dotenv_values
@@ -10,6 +9,15 @@ from dotenv import load_dotenv
 load_dotenv()  # reads .env and loads it into environment
 MONGO_DB_URL = os.getenv("MONGO_DB_URL")
 
+# MongoDB client pool and cursor settings
+MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+MONGO_MAX_IDLE_TIME_MS: int = 60000
+MONGO_COMPRESSORS: str = os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib")
+MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 10000
+MONGO_CONNECT_TIMEOUT_MS: int = 10000
+MONGO_FIND_BATCH_SIZE: int = int(os.getenv("MONGO_FIND_BATCH_SIZE", 10000))
+
 DATABASE_NAME = "VisaData"
 COLLECTION_NAME = "VisaApplications"
 
@@ -17,20 +25,32 @@ PIPELINE_NAME: str = "usvisa"
 ARTIFACT_DIR: str = "artifacts"
 
 MODEL_FILE_NAME: str = "model.pkl"
+MODEL_PROFILE_FILE_NAME: str = "profile.yaml"
+MODEL_FEATURE_PIPELINE_FILE_NAME: str = "feature_pipeline.yaml"
 PREPROCESSOR_FILE_NAME: str = "preprocessor.pkl"
 
 TARGET_COLUMN: str = "case_status"
-CURRENT_YEAR: int = datetime.now().year
 
 FILE_NAME = "us_visa_data.csv"
 TRAIN_FILE_NAME = "train.csv"
 TEST_FILE_NAME = "test.csv"
 SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
+# Read schema columns as category / pyarrow strings and downcast numerics
+DTYPE_PLAN_ENABLED: bool = os.getenv("DTYPE_PLAN_ENABLED", "1") == "1"
 
 AWS_ACCESS_KEY: str = os.getenv("AWS_ACCESS_KEY")
 AWS_SECRET_KEY: str = os.getenv("AWS_SECRET_KEY")
 AWS_REGION_NAME: str = os.getenv("AWS_REGION_NAME")
 
+# Storage backends: "s3"/"mongodb" talk to the real services,
+# "local" uses filesystem stand-ins for offline runs and benchmarks
+STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "s3")
+DATA_SOURCE_BACKEND: str = os.getenv("DATA_SOURCE_BACKEND", "mongodb")
+LOCAL_STORAGE_DIR: str = os.getenv("LOCAL_STORAGE_DIR", os.path.join("local_storage", "s3"))
+LOCAL_DATA_SOURCE_DIR: str = os.getenv("LOCAL_DATA_SOURCE_DIR", os.path.join("local_storage", "mongodb"))
+# Upserted part files a local collection accumulates before they are compacted into one
+LOCAL_COLLECTION_MAX_UPSERT_PARTS: int = 64
+
 # YAML Config Folder
 CONFIG_PATH = "config"
 
@@ -40,26 +60,82 @@ DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO: float = 0.2
 DATA_INGESTION_ARTIFACT_DIR: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested_data"
+# Server-side query: schema projection, range filters and an optional $sample for quick runs
+DATA_INGESTION_QUERY_PROJECT_SCHEMA_COLUMNS: bool = True
+DATA_INGESTION_QUERY_SAMPLE_SIZE: int = int(os.getenv("DATA_INGESTION_QUERY_SAMPLE_SIZE", 0)) or None
+# Hash split on the id column: stable membership, streamed chunk by chunk
+DATA_INGESTION_SPLIT_KEY_COLUMN: str = "case_id"
+DATA_INGESTION_SPLIT_SALT: str = "usvisa"
+DATA_INGESTION_SPLIT_HASH_BUCKETS: int = 10000
+DATA_INGESTION_SPLIT_CHUNK_SIZE: int = 100000
+# Parallel export: more than one worker exports _id-range partitions as Parquet parts plus a manifest
+DATA_INGESTION_EXPORT_WORKERS: int = int(os.getenv("DATA_INGESTION_EXPORT_WORKERS", 1))
+DATA_INGESTION_EXPORT_PARTITIONS_PER_WORKER: int = 4
+DATA_INGESTION_EXPORT_SPLIT_METHOD: str = "sample"
+DATA_INGESTION_FEATURE_STORE_PARTS_DIR: str = "parts"
+DATA_INGESTION_FEATURE_STORE_MANIFEST_FILE_NAME: str = "manifest.json"
 
 # Data Validation constants
 DATA_VALIDATION_DIR: str = "data_validation"
 DATA_VALIDATION_DRIFT_REPORT_DIR: str = "data_drift"
 DATA_VALIDATION_DRIFT_REPORT_FILE_NAME: str = "drift_report.yaml"
+DATA_VALIDATION_DETAILED_DRIFT_REPORT_FILE_NAME: str = "detailed_drift_report.yaml"
+DATA_VALIDATION_DETAILED_DRIFT_REPORT: bool = False
+DATA_VALIDATION_DRIFT_NUM_BINS: int = 10
+DATA_VALIDATION_PSI_THRESHOLD: float = 0.2
+DATA_VALIDATION_P_VALUE_THRESHOLD: float = 0.05
+DATA_VALIDATION_DRIFT_SHARE_THRESHOLD: float = 0.5
+DATA_VALIDATION_PROFILE_QUANTILES: int = 101
+DATA_VALIDATION_REFERENCE_PROFILE_FILE_NAME: str = "reference_profile.yaml"
+DATA_VALIDATION_REPORT_FILE_NAME: str = "validation_report.yaml"
+DATA_VALIDATION_CHUNK_SIZE: int = 100000
 
 # Data Transformation constants
 DATA_TRANSFORMATION_DIR_NAME: str = "data_transformation"
 DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR: str = "transformed"
 DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR: str = "transformed_object"
+# Reuse the production preprocessor while the schema is unchanged and its input is stable
+DATA_TRANSFORMATION_REUSE_PREPROCESSOR: bool = os.getenv("DATA_TRANSFORMATION_REUSE_PREPROCESSOR", "1") == "1"
+DATA_TRANSFORMATION_REFIT_PSI_THRESHOLD: float = 0.1
+DATA_TRANSFORMATION_REFIT_DRIFT_SHARE: float = 0.2
+# Seeded resampling, so the same input gives the same training arrays and resampled CV folds
+DATA_TRANSFORMATION_RESAMPLE_RANDOM_STATE: int = 42
+# Transformed training rows before resampling, which model selection cross-validates on
+DATA_TRANSFORMATION_UNSAMPLED_TRAIN_FILE_NAME: str = "train_unsampled.npy"
+
+# Training gate: skip transformation and training while the production model's data, schema
+# and model config are unchanged; a retrain is forced by a row count change or any drifted column
+TRAINING_GATE_DIR_NAME: str = "training_gate"
+TRAINING_GATE_REPORT_FILE_NAME: str = "training_gate.yaml"
+TRAINING_GATE_ENABLED: bool = os.getenv("TRAINING_GATE_ENABLED", "1") == "1"
+TRAINING_GATE_MAX_ROW_CHANGE: float = 0.05
+TRAINING_GATE_PSI_THRESHOLD: float = 0.1
 
 # Model Trainer constants
 MODEL_TRAINER_DIR_NAME: str = "model_trainer"
 MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_model"
 MODEL_TRAINER_TRAINED_MODEL_FILE_NAME: str = "model.pkl"
+MODEL_TRAINER_TRAINED_PROFILE_FILE_NAME: str = MODEL_PROFILE_FILE_NAME
+MODEL_TRAINER_TRAINED_FEATURE_PIPELINE_FILE_NAME: str = MODEL_FEATURE_PIPELINE_FILE_NAME
 MODEL_TRAINED_EXPECTED_SCORE: float = 0.6
 MODEL_TRAINER_CONFIG_PATH: str = os.path.join(CONFIG_PATH, "model.yaml")
+# Cross-validation fold scores kept across runs, keyed by fold data hash, model class, params and fold
+MODEL_TRAINER_CV_CACHE_ENABLED: bool = os.getenv("MODEL_TRAINER_CV_CACHE_ENABLED", "1") == "1"
+MODEL_TRAINER_CV_CACHE_PATH: str = os.getenv("MODEL_TRAINER_CV_CACHE_PATH", os.path.join(ARTIFACT_DIR, "cv_cache", "cv_results.yaml"))
+MODEL_TRAINER_CV_CACHE_MAX_ENTRIES: int = 10000
+# A cached fold is reused while at most this share of its data and validation rows changed since it was computed
+MODEL_TRAINER_CV_CACHE_MAX_CHANGED_SHARE: float = 0.05
+MODEL_TRAINER_CV_REPORT_FILE_NAME: str = "cv_report.yaml"
 
 # Model Evaluation constants
 MODEL_EVALUATION_CHANGED_THRESHOLD_SCORE: float = 0.02
+# Evaluation engine: scoring processes, test chunk size, sample mode (0 scores the whole test set)
+MODEL_EVALUATION_WORKERS: int = int(os.getenv("MODEL_EVALUATION_WORKERS", 1))
+MODEL_EVALUATION_CHUNK_SIZE: int = 50000
+MODEL_EVALUATION_SAMPLE_SIZE: int = int(os.getenv("MODEL_EVALUATION_SAMPLE_SIZE", 0)) or None
+MODEL_EVALUATION_CONFIDENCE: float = 0.95
+MODEL_EVALUATION_BOOTSTRAP_ROUNDS: int = 1000
+MODEL_EVALUATION_RANDOM_STATE: int = 42
 MODEL_BUCKET_NAME = "visabucket2025"
 MODEL_PUSHER_S3_KEY_PATH = "model-registry"
 
@@ -68,5 +144,75 @@ AWS_ACCESS_KEY_ID_ENV_KEY = os.getenv("AWS_ACCESS_KEY_ID_ENV_KEY")
 AWS_SECRET_ACCESS_KEY_ENV_KEY = os.getenv("AWS_SECRET_ACCESS_KEY_ENV_KEY")
 REGION_NAME = os.getenv("REGION_NAME")
 
+# Logging constants
+LOG_ASYNC: bool = True
+LOG_QUEUE_SIZE: int = 100000
+LOG_MAX_BYTES: int = 10 * 1024 * 1024
+LOG_BACKUP_COUNT: int = 10
+LOG_ROTATION_INTERVAL_SECONDS: int = 24 * 60 * 60
+LOG_PREDICTION_SAMPLE_RATE: float = 1.0
+LOG_JSON: bool = False
+
+# Prediction monitor constants
+PREDICTION_MONITOR_DIR: str = os.path.join(ARTIFACT_DIR, "monitoring")
+PREDICTION_MONITOR_FLUSH_INTERVAL_SECONDS: float = 10.0
+PREDICTION_MONITOR_BUFFER_SIZE: int = 100000
+PREDICTION_MONITOR_SNAPSHOT_TTL_SECONDS: float = 300.0
+# Distinct values counted per categorical column; further values are counted under PREDICTION_MONITOR_OTHER_CATEGORY
+PREDICTION_MONITOR_MAX_CATEGORIES: int = 100
+PREDICTION_MONITOR_OTHER_CATEGORY: str = "__other__"
+
+# Prediction cache constants
+PREDICTION_CACHE_ENABLED: bool = os.getenv("PREDICTION_CACHE_ENABLED", "1") == "1"
+PREDICTION_CACHE_MAX_ENTRIES: int = 10000
+PREDICTION_CACHE_TTL_SECONDS: float = 600.0
+PREDICTION_CACHE_MODEL_CHECK_INTERVAL_SECONDS: float = 60.0
+
+# Profiler constants
+PROFILER_DIR_NAME: str = "profiler"
+PROFILER_REPORT_FILE_NAME: str = "profile_report.json"
+PROFILER_SUMMARY_FILE_NAME: str = "profile_summary.txt"
+PROFILER_MEMORY_MODE: str = "rss"
+PROFILER_SAMPLE_INTERVAL_SECONDS: float = 0.05
+
+# Benchmark constants
+BENCHMARK_DIR: str = os.path.join(ARTIFACT_DIR, "benchmarks")
+BENCHMARK_REFERENCE_DATA_PATH: str = os.path.join("notebook", "Visadataset.csv")
+BENCHMARK_ROW_COUNTS: tuple = (25000, 250000, 2500000, 10000000)
+BENCHMARK_STRATA_COLUMNS: tuple = (TARGET_COLUMN, "unit_of_wage")
+BENCHMARK_CHUNK_SIZE: int = 500000
+BENCHMARK_SEED: int = 42
+BENCHMARK_CONCURRENCY_LEVELS: tuple = (1, 8, 32)
+BENCHMARK_WORKER_COUNTS: tuple = (1, 2, 4)
+BENCHMARK_REQUESTS_PER_LEVEL: int = 2000
+BENCHMARK_SERVER_PORT: int = 8765
+BENCHMARK_SERVER_STARTUP_TIMEOUT_SECONDS: float = 120.0
+
+# Serving constants
+SERVING_WORKERS: int = int(os.getenv("SERVING_WORKERS", os.cpu_count() or 1))
+SERVING_BACKLOG: int = 2048
+SERVING_RESTART_DELAY_SECONDS: float = 1.0
+
+# Batch prediction constants
+BATCH_PREDICTION_DIR: str = os.path.join(ARTIFACT_DIR, "batch_prediction")
+BATCH_PREDICTION_FILE_NAME: str = "predictions.parquet"
+BATCH_PREDICTION_CHUNK_SIZE: int = 50000
+BATCH_PREDICTION_WORKERS: int = os.cpu_count() or 1
+BATCH_PREDICTION_PENDING_CHUNKS_PER_WORKER: int = 2
+
+# Results sink constants
+RESULTS_SINK_ENABLED: bool = os.getenv("RESULTS_SINK_ENABLED", "0") == "1"
+RESULTS_SINK_COLLECTION_NAME: str = "VisaPredictions"
+RESULTS_SINK_KEY_COLUMN: str = "case_id"
+RESULTS_SINK_BATCH_SIZE: int = 1000
+RESULTS_SINK_BUFFER_SIZE: int = 100000
+RESULTS_SINK_FLUSH_INTERVAL_SECONDS: float = 5.0
+
+# Inference executor constants
+INFERENCE_EXECUTOR_WORKERS: int = int(os.getenv("INFERENCE_EXECUTOR_WORKERS", 4))
+INFERENCE_MAX_QUEUE_SIZE: int = int(os.getenv("INFERENCE_MAX_QUEUE_SIZE", 64))
+INFERENCE_TIMEOUT_SECONDS: float = float(os.getenv("INFERENCE_TIMEOUT_SECONDS", 2.0))
+INFERENCE_RETRY_AFTER_SECONDS: int = 1
+
 APP_HOST = "127.0.0.1"
 APP_PORT = "8000"
\ No newline at end of file
@@ -1,19 +1,54 @@
+import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Optional
 import pandas as pd
 import numpy as np
 
 from src.configuration.mongo_db_connection import MongoDbClient
+from src.configuration.local_document_connection import LocalDocumentClient
 from src.exception import CustomException
-from src.constants import DATABASE_NAME, COLLECTION_NAME
+from src.constants import DATABASE_NAME, COLLECTION_NAME, DATA_SOURCE_BACKEND, MONGO_FIND_BATCH_SIZE
 from src.exception import CustomException
-from src.logger.logger import setup_logger, log_file
+from src.logger.logger import setup_logger, log_file, log_event, log_stage
+from src.utils.dtype_utils import apply_dtype_plan
 
 
 # Initialize logger
 logger = setup_logger("data_access", log_file)
 
+# Range and set operators accepted in ingestion query filters
+QUERY_FILTER_OPERATORS = ("gt", "gte", "lt", "lte", "eq", "ne", "in", "nin")
+
+def compile_ingestion_query(columns: Optional[list] = None, filters: Optional[dict] = None,
+                            sample_size: Optional[int] = None) -> list:
+    '''
+    Compiles an ingestion query spec into a MongoDB aggregation pipeline, so the
+    database filters, samples and projects before anything crosses the wire.
+    :param columns: fields to keep (e.g. the schema.yaml columns); _id is always dropped
+    :param filters: {field: {operator: value}} with operators from QUERY_FILTER_OPERATORS,
+        e.g. {"yr_of_estab": {"gte": 1990}}; dates are passed as datetime values
+    :param sample_size: random sample of this many matching documents
+    :return: list of pipeline stages
+    '''
+    pipeline = []
+    if filters:
+        match = {}
+        for field, conditions in filters.items():
+            unknown = set(conditions) - set(QUERY_FILTER_OPERATORS)
+            if unknown:
+                raise ValueError(f"Unsupported filter operators for {field}: {sorted(unknown)}")
+            match[field] = {f"${operator}": value for operator, value in conditions.items()}
+        pipeline.append({"$match": match})
+    if sample_size:
+        pipeline.append({"$sample": {"size": int(sample_size)}})
+    if columns:
+        pipeline.append({"$project": {"_id": 0, **{column: 1 for column in columns}}})
+    return pipeline
+
 class DataAccess:
     '''
     DataAccess Class for handling data operations with MongoDB.
@@ -25,14 +60,18 @@ class DataAccess:
         '''
 
         try:
-            # Mongodb Client;
-            self.db_client = MongoDbClient(DATABASE_NAME)
+            # Mongodb Client, or the local document source for offline runs;
+            if DATA_SOURCE_BACKEND == "local":
+                self.db_client = LocalDocumentClient(DATABASE_NAME)
+            else:
+                self.db_client = MongoDbClient(DATABASE_NAME)
             
-            logger.info("Data access via Mongodb Client Successful.")
+            logger.info(f"Data access via {type(self.db_client).__name__} Successful.")
         except Exception as e:
             raise CustomException(e,sys)
         
-    def export_data_from_db(self,collection_name:str,database_name:Optional[str]=None) ->pd.DataFrame:
+    def export_data_from_db(self,collection_name:str,database_name:Optional[str]=None,
+                            pipeline:Optional[list]=None) ->pd.DataFrame:
         '''
         This function exports data from MongoDB collection as a pandas DataFrame.
         
@@ -41,6 +80,8 @@ class DataAccess:
         :type collection_name: str
         :param database_name: Description
         :type database_name: Optional[str]
+        :param pipeline: aggregation pipeline from compile_ingestion_query, run server-side
+        :type pipeline: Optional[list]
         :return: Description
         :rtype: DataFrame
         '''
@@ -52,14 +93,190 @@ class DataAccess:
                 database = self.db_client.database
                 collection = database[collection_name]
             
-            df = pd.DataFrame(collection.find())
+            with log_stage(logger, "db_export", collection=collection.name, stages=len(pipeline or [])) as metrics:
+                start = time.perf_counter()
+                # Local collections are read as whole columnar files;
+                if pipeline and hasattr(collection, "aggregate_dataframe"):
+                    df = collection.aggregate_dataframe(pipeline)
+                elif hasattr(collection, "to_dataframe"):
+                    df = collection.to_dataframe()
+                elif pipeline:
+                    # The database does the filtering, sampling and projection;
+                    cursor = self.db_client.export_collection(collection.name).aggregate(
+                        pipeline, batchSize=MONGO_FIND_BATCH_SIZE, allowDiskUse=True)
+                    df = pd.DataFrame(list(cursor))
+                    metrics.update(self.db_client.pool_stats())
+                else:
+                    # Secondary-preferred reads in large batches on the pooled client;
+                    df = pd.DataFrame(list(self.db_client.find_for_export(collection.name)))
+                    metrics.update(self.db_client.pool_stats())
+                elapsed = time.perf_counter() - start
+                metrics["rows"] = len(df)
+                metrics["docs_per_sec"] = round(len(df) / elapsed, 1) if elapsed else None
             if "_id" in df.columns.to_list():
                 df = df.drop(columns="_id",axis=1)
             df.replace({"na":np.nan}, inplace=True)
-            return df
+            # Same low-memory dtypes as the CSV and Parquet readers;
+            return apply_dtype_plan(df)
         
         except Exception as e:
             raise CustomException(e,sys)
+
+    def compute_partitions(self, collection_name: str, n_partitions: int, split_method: str = "sample",
+                           samples_per_partition: int = 100) -> list:
+        '''
+        Splits a collection into about n_partitions disjoint _id ranges.
+        split_method "sample" picks split points from a $sample of _ids (one cheap pass
+        over a small sample); "bucket_auto" asks $bucketAuto for evenly filled buckets
+        (exact, but groups every _id). Local collections are split by part file.
+        :return: list of partitions, each {"lower", "upper"} (None is unbounded) or {"files"}
+        '''
+        try:
+            collection = self.db_client.database[collection_name]
+            if hasattr(collection, "part_files"):
+                part_files = collection.part_files()
+                return [{"files": part_files[i::n_partitions]} for i in range(min(n_partitions, len(part_files)))]
+
+            export_collection = self.db_client.export_collection(collection_name)
+            if split_method == "bucket_auto":
+                buckets = export_collection.aggregate([{"$bucketAuto": {"groupBy": "$_id", "buckets": n_partitions}}],
+                                                      allowDiskUse=True)
+                split_points = [bucket["_id"]["min"] for bucket in buckets][1:]
+            else:
+                sample = export_collection.aggregate([{"$sample": {"size": n_partitions * samples_per_partition}},
+                                                      {"$project": {"_id": 1}}], allowDiskUse=True)
+                ids = sorted(document["_id"] for document in sample)
+                split_points = sorted({ids[len(ids) * i // n_partitions] for i in range(1, n_partitions)}) if ids else []
+            bounds = [None] + split_points + [None]
+            return [{"lower": lower, "upper": upper} for lower, upper in zip(bounds[:-1], bounds[1:])]
+        except Exception as e:
+            raise CustomException(e,sys)
+
+    def export_partition(self, collection_name: str, partition: dict, pipeline: Optional[list],
+                         file_path: str) -> dict:
+        '''
+        Exports one partition of the collection to a Parquet part file
+        :return: manifest entry of the part
+        '''
+        try:
+            start = time.perf_counter()
+            collection = self.db_client.database[collection_name]
+            if "files" in partition:
+                df = collection.aggregate_dataframe(pipeline or [], part_files=partition["files"])
+            else:
+                id_range = {}
+                if partition["lower"] is not None:
+                    id_range["$gte"] = partition["lower"]
+                if partition["upper"] is not None:
+                    id_range["$lt"] = partition["upper"]
+                partition_pipeline = ([{"$match": {"_id": id_range}}] if id_range else []) + list(pipeline or [])
+                cursor = self.db_client.export_collection(collection_name).aggregate(
+                    partition_pipeline, batchSize=MONGO_FIND_BATCH_SIZE, allowDiskUse=True)
+                df = pd.DataFrame(list(cursor))
+            if "_id" in df.columns:
+                df = df.drop(columns="_id")
+            df = df.replace({"na": np.nan})
+            # Written under a temporary name, so a partial part is never picked up;
+            df.to_parquet(file_path + ".tmp", index=False)
+            os.replace(file_path + ".tmp", file_path)
+            seconds = time.perf_counter() - start
+            return {
+                "file": os.path.basename(file_path),
+                "rows": len(df),
+                "bytes": os.path.getsize(file_path),
+                "seconds": round(seconds, 3),
+                "lower": partition.get("lower"),
+                "upper": partition.get("upper"),
+            }
+        except Exception as e:
+            raise CustomException(e,sys)
+
+    def export_partitioned(self, collection_name: str, output_dir: str, manifest_path: str,
+                           pipeline: Optional[list] = None, n_workers: int = 4, partitions_per_worker: int = 4,
+                           split_method: str = "sample") -> dict:
+        '''
+        Exports the collection as _id-range partitions read concurrently, one Parquet
+        part file per partition, and writes a manifest of the parts
+        :param pipeline: ingestion pipeline applied inside every partition
+        :return: the manifest
+        '''
+        try:
+            with log_stage(logger, "db_export_partitioned", collection=collection_name, workers=n_workers) as metrics:
+                start = time.perf_counter()
+                partitions = self.compute_partitions(collection_name, n_workers * partitions_per_worker, split_method)
+                os.makedirs(output_dir, exist_ok=True)
+                file_paths = [os.path.join(output_dir, f"part-{index:05d}.parquet") for index in range(len(partitions))]
+                # pymongo and pyarrow release the GIL on I/O, so threads overlap the partition reads;
+                with ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="export") as executor:
+                    parts = list(executor.map(
+                        lambda args: self.export_partition(collection_name, args[0], pipeline, args[1]),
+                        zip(partitions, file_paths)))
+                elapsed = time.perf_counter() - start
+                manifest = {
+                    "collection": collection_name,
+                    "created_at": datetime.now().isoformat(),
+                    "split_method": split_method if "files" not in (partitions or [{}])[0] else "part_files",
+                    "pipeline": pipeline or [],
+                    "rows": sum(part["rows"] for part in parts),
+                    "bytes": sum(part["bytes"] for part in parts),
+                    "seconds": round(elapsed, 3),
+                    "parts": parts,
+                }
+                with open(manifest_path + ".tmp", "w") as manifest_file:
+                    json.dump(manifest, manifest_file, indent=2, default=str)
+                os.replace(manifest_path + ".tmp", manifest_path)
+                metrics.update(rows=manifest["rows"], bytes=manifest["bytes"], partitions=len(parts),
+                               docs_per_sec=round(manifest["rows"] / elapsed, 1) if elapsed else None)
+            return manifest
+        except Exception as e:
+            raise CustomException(e,sys)
+
+    def iter_chunks_from_db(self, collection_name: str, chunk_size: int):
+        '''
+        Yields the collection as DataFrames of at most chunk_size rows, so a collection
+        larger than memory can be processed in a stream, each cast with the schema dtype plan
+        '''
+        try:
+            collection = self.db_client.database[collection_name]
+            if hasattr(collection, "part_files"):
+                documents = (chunk for file_path in collection.part_files()
+                             for chunk in self._split(collection.read_part(file_path), chunk_size))
+            else:
+                documents = self._batch_documents(self.db_client.find_for_export(collection_name), chunk_size)
+            # Only time spent reading counts, not the consumer's work between chunks;
+            rows, read_seconds = 0, 0.0
+            documents = iter(documents)
+            while True:
+                start = time.perf_counter()
+                df = next(documents, None)
+                read_seconds += time.perf_counter() - start
+                if df is None:
+                    break
+                rows += len(df)
+                if "_id" in df.columns:
+                    df = df.drop(columns="_id")
+                yield apply_dtype_plan(df.replace({"na": np.nan}))
+            log_event(logger, "db_export_stream", collection=collection_name, rows=rows,
+                      read_seconds=round(read_seconds, 3),
+                      docs_per_sec=round(rows / read_seconds, 1) if read_seconds else None)
+        except Exception as e:
+            raise CustomException(e,sys)
+
+    @staticmethod
+    def _split(df: pd.DataFrame, chunk_size: int):
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
+    @staticmethod
+    def _batch_documents(cursor, chunk_size: int):
+        batch = []
+        for document in cursor:
+            batch.append(document)
+            if len(batch) == chunk_size:
+                yield pd.DataFrame(batch)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch)
     
 if __name__ == "__main__":
     data_access = DataAccess()
@@ -0,0 +1,185 @@
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+import pandas as pd
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.entity.config_entity import ResultsSinkConfig
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file, log_event, log_stage
+
+
+# Initialize logger
+logger = setup_logger("results_sink", log_file)
+
+class ResultsSink:
+    '''
+    Persists prediction results (case_id, label, probability, model version, timestamp)
+    to a collection, one document per case_id.
+
+    Documents are written in batches of batch_size as unordered bulk upserts, so a
+    re-scored case replaces its previous result and one failing document does not
+    stop the rest of the batch; documents rejected by the server are counted and
+    logged, and the next batch is written. The batch scorer calls write() with whole
+    chunks; the API calls add() on the request path, which only appends to a bounded
+    buffer, and flush() from a background task. flush() takes one batch at a time off
+    the buffer, so when a write fails the unwritten results stay queued for the next
+    flush. Results dropped because the buffer was full are counted in `dropped`.
+    '''
+    def __init__(self, results_sink_config: ResultsSinkConfig = ResultsSinkConfig(), db_client=None):
+        '''
+        :param results_sink_config: collection, key column and batching settings
+        :param db_client: client to write through; defaults to the DataAccess client of this process
+        '''
+        try:
+            self.results_sink_config = results_sink_config
+            if db_client is None:
+                from src.data_access.data_access import DataAccess
+                db_client = DataAccess().db_client
+            self.collection = db_client.database[results_sink_config.collection_name]
+            self._buffer = deque(maxlen=results_sink_config.buffer_size)
+            self._flush_lock = threading.Lock()
+            self.written = 0
+            self.upserted = 0
+            self.modified = 0
+            self.write_errors = 0
+            self.dropped = 0
+            self.saturated_flushes = 0
+        except Exception as e:
+            raise CustomException(e,sys)
+
+    def add(self, case_id: str, label: str, probability: float, model_version: str) -> None:
+        '''
+        Hot path: queue one result; it is written by the next flush(). A full buffer
+        drops its oldest result to make room.
+        '''
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append({
+            self.results_sink_config.key_column: case_id,
+            "label": label,
+            "probability": probability,
+            "model_version": model_version,
+            "scored_at": datetime.now(timezone.utc),
+        })
+
+    def flush(self) -> int:
+        '''
+        Writes the buffered results batch by batch; a batch whose write fails is put
+        back at the front of the buffer with everything not yet written
+        :return: number of results written
+        '''
+        try:
+            with self._flush_lock:
+                n_rows = len(self._buffer)
+                if n_rows == self._buffer.maxlen:
+                    self.saturated_flushes += 1
+                written = 0
+                while written < n_rows:
+                    batch = [self._buffer.popleft()
+                             for _ in range(min(self.results_sink_config.batch_size, n_rows - written))]
+                    try:
+                        self._write_batch(pd.DataFrame(batch))
+                    except Exception:
+                        self.requeue(batch)
+                        raise
+                    written += len(batch)
+                return written
+        except Exception as e:
+            raise CustomException(e,sys)
+
+    def requeue(self, documents: list) -> None:
+        '''
+        Puts unwritten results back at the front of the buffer; when that overflows it,
+        the newest results are dropped and counted
+        '''
+        overflow = max(0, len(self._buffer) + len(documents) - self._buffer.maxlen)
+        self._buffer.extendleft(reversed(documents))
+        self.dropped += overflow
+        log_event(logger, "results_sink_requeued", level=logging.ERROR, rows=len(documents), dropped=overflow)
+
+    def write(self, predictions: pd.DataFrame, model_version: str) -> int:
+        '''
+        Writes a chunk of the batch scorer
+        :param predictions: DataFrame with the key column, prediction (label) and probability
+        :param model_version: version of the model that scored the chunk
+        :return: number of results written
+        '''
+        try:
+            key_column = self.results_sink_config.key_column
+            results = pd.DataFrame({
+                key_column: predictions[key_column].astype(str).to_numpy(),
+                "label": predictions["prediction"].to_numpy(),
+                "probability": predictions["probability"].to_numpy(),
+                "model_version": model_version,
+                "scored_at": datetime.now(timezone.utc),
+            })
+            return self.write_documents(results)
+        except Exception as e:
+            raise CustomException(e,sys)
+
+    def write_documents(self, results: pd.DataFrame) -> int:
+        '''
+        Upserts the results in batches of batch_size
+        '''
+        batch_size = self.results_sink_config.batch_size
+        for start in range(0, len(results), batch_size):
+            self._write_batch(results.iloc[start:start + batch_size])
+        return len(results)
+
+    def _write_batch(self, batch: pd.DataFrame) -> None:
+        key_column = self.results_sink_config.key_column
+        with log_stage(logger, "results_sink_write", sampled=True, rows=len(batch),
+                       collection=self.results_sink_config.collection_name) as metrics:
+            # Local collections append the upsert as a part file;
+            if hasattr(self.collection, "upsert_dataframe"):
+                self.collection.upsert_dataframe(batch, key_column)
+                self.written += len(batch)
+                return
+            documents = batch.astype(object).where(batch.notna(), None).to_dict(orient="records")
+            requests = [UpdateOne({key_column: document[key_column]}, {"$set": document}, upsert=True)
+                        for document in documents]
+            start = time.perf_counter()
+            try:
+                result = self.collection.bulk_write(requests, ordered=False)
+                self.written += len(batch)
+                self.upserted += result.upserted_count
+                self.modified += result.modified_count
+            except BulkWriteError as e:
+                # Unordered: every document without an error was still written;
+                errors = len(e.details.get("writeErrors", []))
+                self.written += len(batch) - errors
+                self.upserted += e.details.get("nUpserted", 0)
+                self.modified += e.details.get("nModified", 0)
+                self.write_errors += errors
+                log_event(logger, "results_sink_write_errors", level=logging.ERROR, errors=errors, rows=len(batch),
+                          first_error=(e.details.get("writeErrors") or [{}])[0].get("errmsg"))
+            finally:
+                elapsed = time.perf_counter() - start
+                metrics["docs_per_sec"] = round(len(batch) / elapsed, 1) if elapsed else None
+
+    def close(self) -> None:
+        self.flush()
+        # Local collections append a part per batch and drop replaced rows here, once;
+        if hasattr(self.collection, "compact"):
+            self.collection.compact(self.results_sink_config.key_column)
+
+    def stats(self) -> dict:
+        '''
+        Counters of this process's sink
+        '''
+        return {
+            "collection": self.results_sink_config.collection_name,
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "upserted": self.upserted,
+            "modified": self.modified,
+            "write_errors": self.write_errors,
+            "dropped": self.dropped,
+            "saturated_flushes": self.saturated_flushes,
+        }
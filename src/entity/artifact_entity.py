@@ -1,22 +1,35 @@
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass
 class DataIngestionArtifact:
     feature_store_path: str
     training_file_path: str
     testing_file_path: str 
+    feature_store_manifest_path: Optional[str] = None
     
 @dataclass
 class DataValidationArtifact:
     validation_status: str
     message: str
     drift_report_path: str
+    drift_status: bool
+    reference_profile_path: str
 
+@dataclass
+class TrainingGateArtifact:
+    skip_training: bool
+    reason: str
+    report_file_path: str
+    
 @dataclass
 class DataTransformationArtifact:
     transformed_train_path: str
     transformed_test_path: str
     preprocessor_object_path: str
+    feature_pipeline_path: str = ""
+    preprocessor_refitted: bool = True
+    transformed_unsampled_train_path: str = ""
     
 @dataclass
 class ClassificationMetricArtifact:
@@ -27,7 +40,9 @@ class ClassificationMetricArtifact:
 @dataclass
 class ModelTrainerArtifact:
     trained_model_path: str
+    trained_profile_path: str
     model_metric_artifact: ClassificationMetricArtifact
+    trained_feature_pipeline_path: str = ""
     
 @dataclass
 class ModelEvaluationArtifact:
@@ -35,6 +50,8 @@ class ModelEvaluationArtifact:
     changed_accuracy:float
     s3_model_path:str 
     trained_model_path:str
+    trained_profile_path:str
+    trained_feature_pipeline_path:str = ""
     
 @dataclass
 class ModelPusherArtifact:
@@ -1,5 +1,6 @@
 import os
 from dataclasses import dataclass
+from typing import Optional
 from src.constants import *
 from datetime import datetime
 
@@ -32,11 +33,42 @@ class DataIngestionConfig:
     )
     training_file_path: str = os.path.join(ingested_dir, TRAIN_FILE_NAME)
     testing_file_path: str = os.path.join(ingested_dir, TEST_FILE_NAME)
+    # Ingestion query spec, compiled into an aggregation pipeline; filters are
+    # {field: {operator: value}}, e.g. {"yr_of_estab": {"gte": 1990}}
+    query_project_schema_columns: bool = DATA_INGESTION_QUERY_PROJECT_SCHEMA_COLUMNS
+    query_filters: Optional[dict] = None
+    query_sample_size: Optional[int] = DATA_INGESTION_QUERY_SAMPLE_SIZE
+    split_key_column: str = DATA_INGESTION_SPLIT_KEY_COLUMN
+    split_stratify_column: Optional[str] = TARGET_COLUMN
+    split_salt: str = DATA_INGESTION_SPLIT_SALT
+    split_hash_buckets: int = DATA_INGESTION_SPLIT_HASH_BUCKETS
+    split_chunk_size: int = DATA_INGESTION_SPLIT_CHUNK_SIZE
+    export_workers: int = DATA_INGESTION_EXPORT_WORKERS
+    export_partitions_per_worker: int = DATA_INGESTION_EXPORT_PARTITIONS_PER_WORKER
+    export_split_method: str = DATA_INGESTION_EXPORT_SPLIT_METHOD
+    feature_store_parts_dir: str = os.path.join(
+        data_ingestion_artifact_dir,
+        DATA_INGESTION_FEATURE_STORE_DIR, DATA_INGESTION_FEATURE_STORE_PARTS_DIR
+    )
+    feature_store_manifest_path: str = os.path.join(
+        data_ingestion_artifact_dir,
+        DATA_INGESTION_FEATURE_STORE_DIR, DATA_INGESTION_FEATURE_STORE_MANIFEST_FILE_NAME
+    )
     
 @dataclass
 class DataValidationConfig:
     data_validation_dir: str = os.path.join(training_pipeline_config.artifact_dir, DATA_VALIDATION_DIR)
     drift_report_file: str = os.path.join(data_validation_dir,DATA_VALIDATION_DRIFT_REPORT_DIR,DATA_VALIDATION_DRIFT_REPORT_FILE_NAME)
+    detailed_drift_report_file: str = os.path.join(data_validation_dir,DATA_VALIDATION_DRIFT_REPORT_DIR,DATA_VALIDATION_DETAILED_DRIFT_REPORT_FILE_NAME)
+    detailed_drift_report: bool = DATA_VALIDATION_DETAILED_DRIFT_REPORT
+    drift_num_bins: int = DATA_VALIDATION_DRIFT_NUM_BINS
+    psi_threshold: float = DATA_VALIDATION_PSI_THRESHOLD
+    p_value_threshold: float = DATA_VALIDATION_P_VALUE_THRESHOLD
+    drift_share_threshold: float = DATA_VALIDATION_DRIFT_SHARE_THRESHOLD
+    profile_quantiles: int = DATA_VALIDATION_PROFILE_QUANTILES
+    reference_profile_file: str = os.path.join(data_validation_dir, DATA_VALIDATION_REFERENCE_PROFILE_FILE_NAME)
+    validation_report_file: str = os.path.join(data_validation_dir, DATA_VALIDATION_REPORT_FILE_NAME)
+    chunk_size: int = DATA_VALIDATION_CHUNK_SIZE
     
 @dataclass
 class DataTransformationConfig:
@@ -44,29 +76,155 @@ class DataTransformationConfig:
     transformed_data_dir: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR)
     transformed_train_path: str = os.path.join(transformed_data_dir, TRAIN_FILE_NAME.replace(".csv", ".npy"))
     transformed_test_path: str = os.path.join(transformed_data_dir, TEST_FILE_NAME.replace(".csv", ".npy"))
+    transformed_unsampled_train_path: str = os.path.join(transformed_data_dir, DATA_TRANSFORMATION_UNSAMPLED_TRAIN_FILE_NAME)
     preprocessor_object_dir: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR)
     preprocessor_object_path: str = os.path.join(preprocessor_object_dir, "preprocessor.pkl")
+    feature_pipeline_path: str = os.path.join(preprocessor_object_dir, MODEL_FEATURE_PIPELINE_FILE_NAME)
+    reuse_preprocessor: bool = DATA_TRANSFORMATION_REUSE_PREPROCESSOR
+    refit_psi_threshold: float = DATA_TRANSFORMATION_REFIT_PSI_THRESHOLD
+    refit_drift_share: float = DATA_TRANSFORMATION_REFIT_DRIFT_SHARE
+    resample_random_state: int = DATA_TRANSFORMATION_RESAMPLE_RANDOM_STATE
+    drift_num_bins: int = DATA_VALIDATION_DRIFT_NUM_BINS
+    profile_quantiles: int = DATA_VALIDATION_PROFILE_QUANTILES
+    bucket_name: str = MODEL_BUCKET_NAME
+    s3_model_key_path: str = MODEL_FILE_NAME
+    s3_feature_pipeline_key_path: str = MODEL_FEATURE_PIPELINE_FILE_NAME
     
 @dataclass
 class ModelTrainerConfig:
     model_trainer_dir: str = os.path.join(training_pipeline_config.artifact_dir, MODEL_TRAINER_DIR_NAME)
     trained_model_dir: str = os.path.join(model_trainer_dir, MODEL_TRAINER_TRAINED_MODEL_DIR)
     trained_model_path: str = os.path.join(trained_model_dir, MODEL_TRAINER_TRAINED_MODEL_FILE_NAME)
+    trained_profile_path: str = os.path.join(trained_model_dir, MODEL_TRAINER_TRAINED_PROFILE_FILE_NAME)
+    trained_feature_pipeline_path: str = os.path.join(trained_model_dir, MODEL_TRAINER_TRAINED_FEATURE_PIPELINE_FILE_NAME)
     expected_score: float = MODEL_TRAINED_EXPECTED_SCORE
     model_config_path: str = MODEL_TRAINER_CONFIG_PATH
+    cv_cache_enabled: bool = MODEL_TRAINER_CV_CACHE_ENABLED
+    cv_cache_path: str = MODEL_TRAINER_CV_CACHE_PATH
+    cv_cache_max_entries: int = MODEL_TRAINER_CV_CACHE_MAX_ENTRIES
+    cv_cache_max_changed_share: float = MODEL_TRAINER_CV_CACHE_MAX_CHANGED_SHARE
+    resample_random_state: int = DATA_TRANSFORMATION_RESAMPLE_RANDOM_STATE
+    cv_report_path: str = os.path.join(model_trainer_dir, MODEL_TRAINER_CV_REPORT_FILE_NAME)
     
 @dataclass
 class ModelEvaluationConfig:
     changed_threshold_score: float = MODEL_EVALUATION_CHANGED_THRESHOLD_SCORE
+    workers: int = MODEL_EVALUATION_WORKERS
+    chunk_size: int = MODEL_EVALUATION_CHUNK_SIZE
+    sample_size: Optional[int] = MODEL_EVALUATION_SAMPLE_SIZE
+    confidence: float = MODEL_EVALUATION_CONFIDENCE
+    bootstrap_rounds: int = MODEL_EVALUATION_BOOTSTRAP_ROUNDS
+    random_state: int = MODEL_EVALUATION_RANDOM_STATE
+    bucket_name: str = MODEL_BUCKET_NAME
+    s3_model_key_path: str = MODEL_FILE_NAME
+    s3_profile_key_path: str = MODEL_PROFILE_FILE_NAME
+    
+@dataclass
+class TrainingGateConfig:
+    training_gate_dir: str = os.path.join(training_pipeline_config.artifact_dir, TRAINING_GATE_DIR_NAME)
+    report_file_path: str = os.path.join(training_gate_dir, TRAINING_GATE_REPORT_FILE_NAME)
+    enabled: bool = TRAINING_GATE_ENABLED
+    max_row_change: float = TRAINING_GATE_MAX_ROW_CHANGE
+    psi_threshold: float = TRAINING_GATE_PSI_THRESHOLD
     bucket_name: str = MODEL_BUCKET_NAME
     s3_model_key_path: str = MODEL_FILE_NAME
+    s3_profile_key_path: str = MODEL_PROFILE_FILE_NAME
     
 @dataclass
 class ModelPusherConfig:
     bucket_name: str = MODEL_BUCKET_NAME
     s3_model_key_path: str = MODEL_FILE_NAME
+    s3_profile_key_path: str = MODEL_PROFILE_FILE_NAME
+    s3_feature_pipeline_key_path: str = MODEL_FEATURE_PIPELINE_FILE_NAME
     
 @dataclass
 class ModelPredictorConfig:
     bucket_name: str = MODEL_BUCKET_NAME
-    s3_model_key_path: str = MODEL_FILE_NAME
\ No newline at end of file
+    s3_model_key_path: str = MODEL_FILE_NAME
+    s3_profile_key_path: str = MODEL_PROFILE_FILE_NAME
+    
+@dataclass
+class PredictionCacheConfig:
+    enabled: bool = PREDICTION_CACHE_ENABLED
+    max_entries: int = PREDICTION_CACHE_MAX_ENTRIES
+    ttl: float = PREDICTION_CACHE_TTL_SECONDS
+    model_check_interval: float = PREDICTION_CACHE_MODEL_CHECK_INTERVAL_SECONDS
+
+@dataclass
+class PredictionMonitorConfig:
+    monitor_dir: str = PREDICTION_MONITOR_DIR
+    flush_interval: float = PREDICTION_MONITOR_FLUSH_INTERVAL_SECONDS
+    buffer_size: int = PREDICTION_MONITOR_BUFFER_SIZE
+    snapshot_ttl: float = PREDICTION_MONITOR_SNAPSHOT_TTL_SECONDS
+    max_categories: int = PREDICTION_MONITOR_MAX_CATEGORIES
+    schema_file_path: str = SCHEMA_FILE_PATH
+    target_column: str = TARGET_COLUMN
+    psi_threshold: float = DATA_VALIDATION_PSI_THRESHOLD
+    p_value_threshold: float = DATA_VALIDATION_P_VALUE_THRESHOLD
+    drift_share_threshold: float = DATA_VALIDATION_DRIFT_SHARE_THRESHOLD
+    bucket_name: str = MODEL_BUCKET_NAME
+    s3_model_key_path: str = MODEL_FILE_NAME
+    s3_profile_key_path: str = MODEL_PROFILE_FILE_NAME
+
+@dataclass
+class ProfilerConfig:
+    profiler_dir: str = os.path.join(training_pipeline_config.artifact_dir, PROFILER_DIR_NAME)
+    report_file_path: str = os.path.join(profiler_dir, PROFILER_REPORT_FILE_NAME)
+    summary_file_path: str = os.path.join(profiler_dir, PROFILER_SUMMARY_FILE_NAME)
+    memory_mode: str = PROFILER_MEMORY_MODE
+    sample_interval: float = PROFILER_SAMPLE_INTERVAL_SECONDS
+    cprofile: bool = False
+
+@dataclass
+class BenchmarkConfig:
+    benchmark_dir: str = BENCHMARK_DIR
+    reference_data_path: str = BENCHMARK_REFERENCE_DATA_PATH
+    row_counts: tuple = BENCHMARK_ROW_COUNTS
+    strata_columns: tuple = BENCHMARK_STRATA_COLUMNS
+    chunk_size: int = BENCHMARK_CHUNK_SIZE
+    seed: int = BENCHMARK_SEED
+    concurrency_levels: tuple = BENCHMARK_CONCURRENCY_LEVELS
+    worker_counts: tuple = BENCHMARK_WORKER_COUNTS
+    requests_per_level: int = BENCHMARK_REQUESTS_PER_LEVEL
+    server_host: str = APP_HOST
+    server_port: int = BENCHMARK_SERVER_PORT
+    server_startup_timeout: float = BENCHMARK_SERVER_STARTUP_TIMEOUT_SECONDS
+
+@dataclass
+class ServingConfig:
+    host: str = APP_HOST
+    port: int = int(APP_PORT)
+    workers: int = SERVING_WORKERS
+    backlog: int = SERVING_BACKLOG
+    restart_delay: float = SERVING_RESTART_DELAY_SECONDS
+
+@dataclass
+class ResultsSinkConfig:
+    enabled: bool = RESULTS_SINK_ENABLED
+    collection_name: str = RESULTS_SINK_COLLECTION_NAME
+    key_column: str = RESULTS_SINK_KEY_COLUMN
+    batch_size: int = RESULTS_SINK_BATCH_SIZE
+    buffer_size: int = RESULTS_SINK_BUFFER_SIZE
+    flush_interval: float = RESULTS_SINK_FLUSH_INTERVAL_SECONDS
+
+@dataclass
+class BatchPredictionConfig:
+    input_path: str = None
+    input_collection: str = COLLECTION_NAME
+    output_path: str = os.path.join(BATCH_PREDICTION_DIR, TIMESTAMP, BATCH_PREDICTION_FILE_NAME)
+    output_collection: str = None
+    chunk_size: int = BATCH_PREDICTION_CHUNK_SIZE
+    workers: int = BATCH_PREDICTION_WORKERS
+    pending_chunks_per_worker: int = BATCH_PREDICTION_PENDING_CHUNKS_PER_WORKER
+    sink_batch_size: int = RESULTS_SINK_BATCH_SIZE
+    id_column: str = "case_id"
+    target_column: str = TARGET_COLUMN
+    bucket_name: str = MODEL_BUCKET_NAME
+    s3_model_key_path: str = MODEL_FILE_NAME
+
+@dataclass
+class InferenceExecutorConfig:
+    max_workers: int = INFERENCE_EXECUTOR_WORKERS
+    max_queue_size: int = INFERENCE_MAX_QUEUE_SIZE
+    timeout: float = INFERENCE_TIMEOUT_SECONDS
+    retry_after: int = INFERENCE_RETRY_AFTER_SECONDS
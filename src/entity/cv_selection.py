@@ -0,0 +1,312 @@
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterGrid
+
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file, log_event
+from src.utils.main_utils import read_yaml_file, write_yaml_file
+
+# Initialize logger
+logger = setup_logger("cv_selection", log_file)
+
+# Odd 64-bit constant mixing the label hash into the feature row hash;
+LABEL_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+@dataclass
+class BestModelDetail:
+    best_model: object
+    best_score: float
+    best_parameters: dict
+    report: dict
+
+
+def row_hashes(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    uint64 hash of every (features, label) row
+    """
+    feature_hashes = pd.util.hash_pandas_object(pd.DataFrame(x), index=False).to_numpy()
+    label_hashes = pd.util.hash_array(np.asarray(y))
+    return feature_hashes ^ (label_hashes * LABEL_HASH_MULTIPLIER)
+
+
+def assign_folds(hashes: np.ndarray, cv: int) -> np.ndarray:
+    """
+    Fold of every row from its own hash, so a row keeps its fold whatever rows are added
+    or removed around it. The hash covers the label, so every class spreads evenly over the folds.
+    """
+    return (hashes % np.uint64(cv)).astype(np.int64)
+
+
+def partition_hash(hashes: np.ndarray) -> str:
+    """
+    Order-independent hash of a set of rows: the wrapping sum of their row hashes
+    """
+    return f"{len(hashes)}-{int(hashes.sum(dtype=np.uint64)):016x}"
+
+
+def fold_partitions(hashes: np.ndarray, folds: np.ndarray, cv: int) -> list:
+    """
+    Partition of every fold as the CVResultStore compares them: the hashes of the data
+    and of the fold's validation rows, and their sorted unique row hashes
+    """
+    data_hash, data_rows = partition_hash(hashes), np.unique(hashes)
+    partitions = []
+    for fold in range(cv):
+        validation_hashes = hashes[folds == fold]
+        if not len(validation_hashes):
+            raise ValueError(f"Fold {fold} of {cv} has no rows; too few rows for cross-validation")
+        partitions.append({"data_hash": data_hash, "validation_hash": partition_hash(validation_hashes),
+                           "data_rows": data_rows, "validation_rows": np.unique(validation_hashes)})
+    return partitions
+
+
+class CVResultStore:
+    """
+    Fold scores of past model selections, kept in one YAML file across runs, with the
+    row hashes of every partition an entry was computed on saved next to it as .npy.
+
+    An entry is keyed by the model class, its params, the resampler, the scoring, cv and the fold, and
+    records the hashes of the data and of the validation partition it was scored on.
+    It is reused exactly when both hashes match, and incrementally when the rows it was
+    computed on still fall in the same fold and at most max_changed_share of the data
+    and of the validation partition changed since; the entry stays anchored to the rows
+    it was computed on, so changes accumulate until the fold is recomputed. Least
+    recently used entries are evicted above max_entries.
+    """
+
+    def __init__(self, file_path: str, max_entries: int, enabled: bool = True, max_changed_share: float = 0.0):
+        self.file_path = file_path
+        self.partition_dir = os.path.join(os.path.dirname(file_path), "partitions")
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.max_changed_share = max_changed_share
+        self.entries = {}
+        self._partitions = {}
+        if enabled and os.path.exists(file_path):
+            self.entries = read_yaml_file(file_path) or {}
+
+    @staticmethod
+    def make_key(module: str, class_name: str, params: dict, scoring: str, cv: int, fold: int,
+                 resampler: str = None) -> str:
+        content = {"module": module, "class": class_name, "params": params, "scoring": scoring, "cv": cv, "fold": fold,
+                   "resampler": resampler}
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+    def load_partition(self, partition_key: str) -> np.ndarray:
+        """
+        Sorted unique row hashes of a stored partition, or None when it is not stored
+        """
+        if partition_key not in self._partitions:
+            partition_path = os.path.join(self.partition_dir, f"{partition_key}.npy")
+            self._partitions[partition_key] = np.load(partition_path) if os.path.exists(partition_path) else None
+        return self._partitions[partition_key]
+
+    @staticmethod
+    def changed_share(previous_rows: np.ndarray, current_rows: np.ndarray) -> float:
+        return len(np.setxor1d(previous_rows, current_rows, assume_unique=True)) / max(len(current_rows), 1)
+
+    def get(self, key: str, partition: dict) -> tuple:
+        """
+        Cached entry of a candidate fold and how it matched the current partition
+        :param partition: dict data_hash, validation_hash, data_rows and validation_rows of the current fold
+        :return: (entry, "hit" or "incremental_hit"), or (None, None) on a miss
+        """
+        entry = self.entries.get(key) if self.enabled else None
+        if entry is None:
+            return None, None
+        if entry["data_hash"] == partition["data_hash"] and entry["validation_hash"] == partition["validation_hash"]:
+            entry["last_used"] = time.time()
+            return entry, "hit"
+        if self.max_changed_share <= 0:
+            return None, None
+
+        previous_data, previous_validation = self.load_partition(entry["data_hash"]), self.load_partition(entry["validation_hash"])
+        if previous_data is None or previous_validation is None:
+            return None, None
+        # Rows scored in this validation fold before must still be in it;
+        kept_validation = np.intersect1d(previous_validation, partition["data_rows"], assume_unique=True)
+        if not np.isin(kept_validation, partition["validation_rows"], assume_unique=True).all():
+            return None, None
+        if self.changed_share(previous_data, partition["data_rows"]) > self.max_changed_share or \
+                self.changed_share(previous_validation, partition["validation_rows"]) > self.max_changed_share:
+            return None, None
+        entry["last_used"] = time.time()
+        return entry, "incremental_hit"
+
+    def put(self, key: str, entry: dict, partition: dict) -> None:
+        if self.enabled:
+            self.entries[key] = {**entry, "data_hash": partition["data_hash"],
+                                 "validation_hash": partition["validation_hash"], "last_used": time.time()}
+            self._partitions[partition["data_hash"]] = partition["data_rows"]
+            self._partitions[partition["validation_hash"]] = partition["validation_rows"]
+
+    def save(self) -> None:
+        """
+        Evicts the least recently used entries, writes the entries and the partitions they
+        reference, and removes partitions no entry references any more
+        """
+        try:
+            if not self.enabled:
+                return
+            if len(self.entries) > self.max_entries:
+                recent = sorted(self.entries.items(), key=lambda item: item[1]["last_used"], reverse=True)
+                self.entries = dict(recent[:self.max_entries])
+            write_yaml_file(self.file_path, self.entries, replace=True)
+
+            referenced = {entry[name] for entry in self.entries.values() for name in ("data_hash", "validation_hash")}
+            os.makedirs(self.partition_dir, exist_ok=True)
+            for partition_key in referenced:
+                partition_path = os.path.join(self.partition_dir, f"{partition_key}.npy")
+                if not os.path.exists(partition_path) and self._partitions.get(partition_key) is not None:
+                    np.save(partition_path, self._partitions[partition_key])
+            for file_name in os.listdir(self.partition_dir):
+                if file_name[:-len(".npy")] not in referenced:
+                    os.remove(os.path.join(self.partition_dir, file_name))
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+class FoldCachedModelSelector:
+    """
+    Grid search over the model_selection section of config/model.yaml, with the cv and
+    scoring of its grid_search params, that reuses cached fold scores.
+
+    Folds are assigned from row hashes instead of row positions, so reordered data
+    gets the same folds and appended rows leave every existing row in its fold. The
+    rows must be the real ones: with a resampler such as SMOTEENN only the training
+    split of every fold is resampled, once per fold and shared by all candidates, so
+    no synthetic row is ever validated on and the hashes stay comparable across runs.
+    Every (candidate, fold) score is looked up in the CVResultStore first and only the
+    misses are fitted; the best candidate is then refit on all rows, resampled. The
+    report counts exact hits, incremental hits and misses and the fit seconds the hits
+    saved, as measured when they were computed.
+    """
+
+    def __init__(self, model_config_path: str, cv_result_store: CVResultStore, resampler: object = None):
+        try:
+            self.resampler = resampler
+            self.resampler_key = None
+            if resampler is not None:
+                self.resampler_key = f"{type(resampler).__name__}{resampler.get_params(deep=False)}"
+            self.config = read_yaml_file(model_config_path)
+            grid_search_params = self.config["grid_search"].get("params") or {}
+            self.cv = int(grid_search_params.get("cv", 5))
+            self.scoring = grid_search_params.get("scoring")
+            self.cv_result_store = cv_result_store
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def iter_candidates(self):
+        """
+        Yields (module, class name, estimator, params) of every grid point of every model
+        """
+        for model_config in self.config["model_selection"].values():
+            model_class = getattr(importlib.import_module(model_config["module"]), model_config["class"])
+            base_params = model_config.get("params") or {}
+            for grid_params in ParameterGrid(model_config.get("search_param_grid") or {}):
+                params = {**base_params, **grid_params}
+                yield model_config["module"], model_config["class"], model_class(**params), params
+
+    def resample(self, x: np.ndarray, y: np.ndarray) -> tuple:
+        if self.resampler is None:
+            return x, y
+        return clone(self.resampler).fit_resample(x, y)
+
+    def score_fold(self, estimator: object, training_split: tuple, x_validation: np.ndarray,
+                   y_validation: np.ndarray) -> float:
+        model = clone(estimator).fit(*training_split)
+        if self.scoring:
+            return float(get_scorer(self.scoring)(model, x_validation, y_validation))
+        return float(model.score(x_validation, y_validation))
+
+    def get_best_model(self, x: np.ndarray, y: np.ndarray, refit_x: np.ndarray = None,
+                       refit_y: np.ndarray = None) -> BestModelDetail:
+        """
+        Method Name :   get_best_model
+        Description :   Mean CV score of every candidate on the rows before resampling, from the
+                        cache where possible, and the best candidate refit on all rows resampled;
+                        refit_x and refit_y are those resampled rows when already at hand
+
+        Output      :   BestModelDetail with the fitted best model, its mean CV score, params and the cache report
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            hashes = row_hashes(x, y)
+            folds = assign_folds(hashes, self.cv)
+            partitions = fold_partitions(hashes, folds, self.cv)
+
+            # Resampled training split of every fold, made on the first miss of the fold;
+            training_splits = {}
+            candidates, best = [], None
+            totals = {"hits": 0, "incremental_hits": 0, "misses": 0, "computed_seconds": 0.0, "saved_seconds": 0.0,
+                      "resample_seconds": 0.0}
+            for module, class_name, estimator, params in self.iter_candidates():
+                scores, hits = [], 0
+                for fold, partition in enumerate(partitions):
+                    key = CVResultStore.make_key(module, class_name, params, self.scoring, self.cv, fold,
+                                                 self.resampler_key)
+                    entry, match = self.cv_result_store.get(key, partition)
+                    if entry is not None:
+                        hits += 1
+                        totals["hits" if match == "hit" else "incremental_hits"] += 1
+                        totals["saved_seconds"] += entry["seconds"]
+                    else:
+                        if fold not in training_splits:
+                            start = time.perf_counter()
+                            training_splits[fold] = self.resample(x[folds != fold], y[folds != fold])
+                            totals["resample_seconds"] += time.perf_counter() - start
+                        start = time.perf_counter()
+                        score = self.score_fold(estimator, training_splits[fold], x[folds == fold], y[folds == fold])
+                        entry = {"score": score, "seconds": round(time.perf_counter() - start, 4),
+                                 "model": class_name, "fold": fold}
+                        totals["computed_seconds"] += entry["seconds"]
+                        self.cv_result_store.put(key, entry, partition)
+                    scores.append(entry["score"])
+                totals["misses"] += self.cv - hits
+                mean_score = float(np.mean(scores))
+                candidates.append({"model": class_name, "params": params, "mean_score": mean_score,
+                                   "fold_scores": scores, "cache_hits": hits})
+                if best is None or mean_score > best[0]:
+                    best = (mean_score, estimator, params)
+            self.cv_result_store.save()
+            training_splits.clear()
+
+            start = time.perf_counter()
+            if refit_x is None:
+                refit_x, refit_y = self.resample(x, y)
+            best_model = clone(best[1]).fit(refit_x, refit_y)
+            folds_total = totals["hits"] + totals["incremental_hits"] + totals["misses"]
+            report = {
+                "cv": self.cv,
+                "scoring": self.scoring or "score",
+                "candidates": candidates,
+                "folds": folds_total,
+                "hits": totals["hits"],
+                "incremental_hits": totals["incremental_hits"],
+                "misses": totals["misses"],
+                "hit_ratio": round((totals["hits"] + totals["incremental_hits"]) / folds_total, 4) if folds_total else 0.0,
+                "resampler": self.resampler_key,
+                "resample_seconds": round(totals["resample_seconds"], 3),
+                "computed_seconds": round(totals["computed_seconds"], 3),
+                "saved_seconds": round(totals["saved_seconds"], 3),
+                "refit_seconds": round(time.perf_counter() - start, 3),
+            }
+            log_event(logger, "cv_cache", folds=folds_total, hits=report["hits"],
+                      incremental_hits=report["incremental_hits"], misses=report["misses"],
+                      hit_ratio=report["hit_ratio"], computed_seconds=report["computed_seconds"],
+                      saved_seconds=report["saved_seconds"], best_model=type(best_model).__name__,
+                      best_score=round(best[0], 4))
+            return BestModelDetail(best_model=best_model, best_score=best[0], best_parameters=best[2], report=report)
+        except Exception as e:
+            raise CustomException(e, sys) from e
@@ -1,7 +1,9 @@
 import sys
 
+import numpy as np
 from pandas import DataFrame
 from sklearn.pipeline import Pipeline 
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler, PowerTransformer
 from src.exception import CustomException
 from src.logger.logger import setup_logger, log_file
 
@@ -18,6 +20,153 @@ class TargetValueMapping:
         mapping_response = self._asdict()
         return dict(zip(mapping_response.values(),mapping_response.keys()))
     
+class RequestEncoder:
+    """
+    Serving-side view of a fitted ColumnTransformer.
+
+    Category lookups are built once from the fitted encoders' categories_ with interned
+    keys, so a request is validated and encoded with plain dict lookups. transform()
+    assembles the same feature matrix as the ColumnTransformer from the pre-encoded
+    rows without building a DataFrame. Numerical blocks are supported for StandardScaler
+    and yeo-johnson PowerTransformer (also inside a Pipeline); any other transformer
+    leaves supported=False and callers fall back to preprocessing_object.transform.
+    """
+
+    def __init__(self, preprocessing_object: object):
+        """
+        :param preprocessing_object: fitted ColumnTransformer
+        """
+        try:
+            self.categorical_lookups = {}
+            self.onehot_columns = []
+            self.ordinal_columns = []
+            self.numerical_columns = []
+            self.numerical_blocks = []
+            self.supported = True
+
+            offset = 0
+            for name, transformer, columns in preprocessing_object.transformers_:
+                if transformer == "drop" or name == "remainder":
+                    continue
+                columns = list(columns)
+                if isinstance(transformer, OneHotEncoder):
+                    if transformer.drop is not None:
+                        self.supported = False
+                    for col_name, categories in zip(columns, transformer.categories_):
+                        self.categorical_lookups[col_name] = {
+                            sys.intern(str(category)): offset + i for i, category in enumerate(categories)
+                        }
+                        self.onehot_columns.append((col_name, len(categories)))
+                        offset += len(categories)
+                elif isinstance(transformer, OrdinalEncoder):
+                    for col_name, categories in zip(columns, transformer.categories_):
+                        self.categorical_lookups[col_name] = {
+                            sys.intern(str(category)): float(i) for i, category in enumerate(categories)
+                        }
+                        self.ordinal_columns.append((col_name, offset))
+                        offset += 1
+                else:
+                    steps = [step for _, step in transformer.steps] if isinstance(transformer, Pipeline) else [transformer]
+                    if not all(self._is_supported_step(step) for step in steps):
+                        self.supported = False
+                    for col_name in columns:
+                        if col_name not in self.numerical_columns:
+                            self.numerical_columns.append(col_name)
+                    source = [self.numerical_columns.index(col_name) for col_name in columns]
+                    self.numerical_blocks.append((source, steps, offset))
+                    offset += len(columns)
+            self.n_features = offset
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    @staticmethod
+    def _is_supported_step(step) -> bool:
+        if isinstance(step, StandardScaler):
+            return True
+        if isinstance(step, PowerTransformer):
+            return step.method == "yeo-johnson" and (not step.standardize or hasattr(step, "_scaler"))
+        return step == "passthrough"
+
+    @staticmethod
+    def _apply_step(step, values: np.ndarray) -> np.ndarray:
+        if isinstance(step, StandardScaler):
+            if step.mean_ is not None:
+                values = values - step.mean_
+            return values / step.scale_ if step.scale_ is not None else values
+        if isinstance(step, PowerTransformer):
+            lambdas = step.lambdas_
+            out = np.empty_like(values)
+            positive = values >= 0
+            for j, lmbda in enumerate(lambdas):
+                x, pos = values[:, j], positive[:, j]
+                col = np.empty_like(x)
+                col[pos] = np.log1p(x[pos]) if abs(lmbda) < np.spacing(1.0) else (np.power(x[pos] + 1, lmbda) - 1) / lmbda
+                col[~pos] = -np.log1p(-x[~pos]) if abs(lmbda - 2) < np.spacing(1.0) \
+                    else -(np.power(-x[~pos] + 1, 2 - lmbda) - 1) / (2 - lmbda)
+                out[:, j] = col
+            return RequestEncoder._apply_step(step._scaler, out) if step.standardize else out
+        return values
+
+    def schema(self) -> dict:
+        """
+        Allowed values of every categorical input, generated from the fitted encoders
+        """
+        return {col_name: list(lookup) for col_name, lookup in self.categorical_lookups.items()}
+
+    def encode(self, features: dict) -> tuple:
+        """
+        Validates a request and encodes it into category indices
+        :param features: mapping of input feature name to raw value
+        :return: (encoded row, list of validation errors)
+        """
+        errors = []
+        onehot_positions = []
+        for col_name, _ in self.onehot_columns:
+            position = self.categorical_lookups[col_name].get(features.get(col_name))
+            if position is None:
+                errors.append(f"{col_name}: '{features.get(col_name)}' is not one of {list(self.categorical_lookups[col_name])}")
+            onehot_positions.append(position)
+        ordinal_codes = []
+        for col_name, _ in self.ordinal_columns:
+            code = self.categorical_lookups[col_name].get(features.get(col_name))
+            if code is None:
+                errors.append(f"{col_name}: '{features.get(col_name)}' is not one of {list(self.categorical_lookups[col_name])}")
+            ordinal_codes.append(code)
+        numerical_values = []
+        for col_name in self.numerical_columns:
+            value = features.get(col_name)
+            if value is None:
+                errors.append(f"{col_name}: value is required")
+            numerical_values.append(value)
+        return (tuple(onehot_positions), tuple(ordinal_codes), tuple(numerical_values)), errors
+
+    def transform(self, encoded_rows: list) -> np.ndarray:
+        """
+        Builds the model input matrix from rows returned by encode()
+        :param encoded_rows: list of valid encoded rows
+        :return: np.ndarray same layout as the ColumnTransformer output
+        """
+        try:
+            n_rows = len(encoded_rows)
+            matrix = np.zeros((n_rows, self.n_features), dtype=np.float64)
+            if self.onehot_columns:
+                positions = np.array([row[0] for row in encoded_rows], dtype=np.intp)
+                matrix[np.repeat(np.arange(n_rows), positions.shape[1]), positions.ravel()] = 1.0
+            if self.ordinal_columns:
+                codes = np.array([row[1] for row in encoded_rows], dtype=np.float64)
+                matrix[:, [offset for _, offset in self.ordinal_columns]] = codes
+            if self.numerical_columns:
+                values = np.array([row[2] for row in encoded_rows], dtype=np.float64)
+                for source, steps, offset in self.numerical_blocks:
+                    block = values[:, source]
+                    for step in steps:
+                        block = self._apply_step(step, block)
+                    matrix[:, offset:offset + len(source)] = block
+            return matrix
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
 class VisaModel:
     def __init__(self, preprocessing_object: object, trained_model_object: object):
         """
@@ -45,6 +194,54 @@ class VisaModel:
         except Exception as e:
             raise CustomException(e, sys) from e
 
+    def predict_with_probability(self, dataframe: DataFrame) -> tuple:
+        """
+        Predictions together with the probability of each predicted class, from one
+        pass of the model; probabilities are NaN when the model has no predict_proba
+        """
+        try:
+            return self._predict_with_probability(self.preprocessing_object.transform(dataframe))
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def _predict_with_probability(self, transformed_feature) -> tuple:
+        model = self.trained_model_object
+        if hasattr(model, "predict_proba") and hasattr(model, "classes_"):
+            probabilities = model.predict_proba(transformed_feature)
+            best = probabilities.argmax(axis=1)
+            return model.classes_[best], probabilities[np.arange(len(best)), best]
+        predictions = model.predict(transformed_feature)
+        return predictions, np.full(len(predictions), np.nan)
+
+    def get_request_encoder(self) -> RequestEncoder:
+        """
+        Request encoder built once from the fitted preprocessing_object and kept on the instance
+        """
+        request_encoder = getattr(self, "_request_encoder", None)
+        if request_encoder is None:
+            request_encoder = RequestEncoder(self.preprocessing_object)
+            self._request_encoder = request_encoder
+        return request_encoder
+
+    def predict_encoded(self, encoded_rows: list):
+        """
+        Fast path for rows already validated and encoded by the request encoder
+        """
+        try:
+            transformed_feature = self.get_request_encoder().transform(encoded_rows)
+            return self.trained_model_object.predict(transformed_feature)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def predict_encoded_with_probability(self, encoded_rows: list) -> tuple:
+        """
+        Fast path of predict_with_probability for rows encoded by the request encoder
+        """
+        try:
+            return self._predict_with_probability(self.get_request_encoder().transform(encoded_rows))
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
     def __repr__(self):
         return f"{type(self.trained_model_object).__name__}()"
 
@@ -0,0 +1,169 @@
+import sys
+import time
+
+import numpy as np
+from pandas import DataFrame
+from sklearn.metrics import roc_auc_score
+
+from src.constants import TARGET_COLUMN
+from src.entity.config_entity import ModelEvaluationConfig
+from src.entity.estimator import TargetValueMapping
+from src.entity.feature_engineering import get_feature_engineering
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file, log_event
+from src.utils.dtype_utils import read_csv_with_plan
+from src.utils.parallel_utils import ordered_bounded_map
+
+# Initialize logger
+logger = setup_logger("evaluation_engine", log_file)
+
+# Bootstrap weights are drawn in blocks of rounds so a block holds at most this many weights;
+BOOTSTRAP_BLOCK_WEIGHTS: int = 2_000_000
+
+def score_evaluation_chunk(chunk: DataFrame, models: dict) -> tuple:
+    """
+    Scores one chunk of labelled raw rows with every model
+    chunk: DataFrame rows of test.csv
+    models: dict model name -> VisaModel
+    return: (labels, dict model name -> (predictions, probability of the positive class))
+    """
+    features = get_feature_engineering().transform(chunk)
+    labels = chunk[TARGET_COLUMN].map(TargetValueMapping()._asdict()).to_numpy(dtype=np.int8)
+    scores = {}
+    for name, model in models.items():
+        predictions, probabilities = model.predict_with_probability(features)
+        predictions = np.asarray(predictions).astype(np.int8)
+        # predict_with_probability returns the probability of the predicted class;
+        positive_probability = np.where(predictions == 1, probabilities, 1 - probabilities).astype(np.float32)
+        scores[name] = (predictions, positive_probability)
+    return labels, scores
+
+
+def confusion_counts(labels: np.ndarray, predictions: np.ndarray, weights: np.ndarray = None) -> tuple:
+    """
+    (tp, fp, fn, tn) of binary labels and predictions; with a (rounds, n) weight matrix
+    every count is a vector with one entry per round
+    """
+    positive, predicted = labels == 1, predictions == 1
+    masks = (positive & predicted, ~positive & predicted, positive & ~predicted, ~positive & ~predicted)
+    if weights is None:
+        return tuple(int(mask.sum()) for mask in masks)
+    return tuple(weights @ mask.astype(np.float64) for mask in masks)
+
+
+def f1_from_counts(tp, fp, fn) -> np.ndarray:
+    """
+    F1 from confusion counts, elementwise over bootstrap count vectors
+    """
+    numerator = 2 * np.asarray(tp, dtype=np.float64)
+    denominator = numerator + np.asarray(fp, dtype=np.float64) + np.asarray(fn, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros_like(denominator), where=denominator > 0)
+
+
+def classification_metrics(labels: np.ndarray, predictions: np.ndarray, positive_probability: np.ndarray) -> dict:
+    """
+    Accuracy, precision, recall, F1, ROC AUC and the confusion matrix from one pass over the confusion counts
+    """
+    tp, fp, fn, tn = confusion_counts(labels, predictions)
+    total = tp + fp + fn + tn
+    roc_auc = None
+    if len(np.unique(labels)) == 2 and not np.isnan(positive_probability).any():
+        roc_auc = float(roc_auc_score(labels, positive_probability))
+    return {
+        "rows": int(total),
+        "accuracy": (tp + tn) / total if total else 0.0,
+        "precision": tp / (tp + fp) if tp + fp else 0.0,
+        "recall": tp / (tp + fn) if tp + fn else 0.0,
+        "f1_score": float(f1_from_counts(tp, fp, fn)),
+        "roc_auc": roc_auc,
+        "confusion_matrix": {"tp": tp, "fp": fp, "fn": fn, "tn": tn},
+    }
+
+
+class EvaluationEngine:
+    """
+    Scores the trained and production models on the held-out test set.
+
+    The test file is streamed in chunks; each chunk is scored by both models in one
+    task, and tasks run across worker processes forked from the parent so the models
+    are shared copy-on-write. Only labels, predictions and positive-class probabilities
+    come back, and every metric is computed from them in one pass. In sample mode a
+    random sample of sample_size rows is scored and a paired Poisson bootstrap gives a
+    confidence interval on the F1 difference between the models.
+    """
+
+    def __init__(self, model_evaluation_config: ModelEvaluationConfig):
+        self.model_evaluation_config = model_evaluation_config
+
+    def iter_test_chunks(self, testing_file_path: str):
+        """
+        Yields test.csv in chunks; in sample mode each chunk is thinned to the sample fraction
+        """
+        config = self.model_evaluation_config
+        fraction = 1.0
+        if config.sample_size:
+            with open(testing_file_path, "rb") as test_file:
+                total_rows = max(sum(1 for _ in test_file) - 1, 1)
+            fraction = min(1.0, config.sample_size / total_rows)
+        rng = np.random.default_rng(config.random_state)
+        for chunk in read_csv_with_plan(testing_file_path, chunksize=config.chunk_size):
+            yield chunk if fraction >= 1.0 else chunk[rng.random(len(chunk)) < fraction]
+
+    def f1_difference_interval(self, labels: np.ndarray, trained: np.ndarray, production: np.ndarray) -> tuple:
+        """
+        Paired bootstrap confidence interval of F1(trained) - F1(production): every round
+        reweights the same rows for both models with Poisson(1) weights
+        """
+        config = self.model_evaluation_config
+        rng = np.random.default_rng(config.random_state)
+        block_rounds = max(1, BOOTSTRAP_BLOCK_WEIGHTS // len(labels))
+        differences = []
+        for start in range(0, config.bootstrap_rounds, block_rounds):
+            rounds = min(block_rounds, config.bootstrap_rounds - start)
+            weights = rng.poisson(1.0, size=(rounds, len(labels))).astype(np.float64)
+            tp, fp, fn, _ = confusion_counts(labels, trained, weights)
+            trained_f1 = f1_from_counts(tp, fp, fn)
+            tp, fp, fn, _ = confusion_counts(labels, production, weights)
+            differences.append(trained_f1 - f1_from_counts(tp, fp, fn))
+        differences = np.concatenate(differences)
+        alpha = (1 - config.confidence) / 2
+        low, high = np.quantile(differences, [alpha, 1 - alpha])
+        return float(low), float(high)
+
+    def evaluate(self, testing_file_path: str, models: dict) -> dict:
+        """
+        Metrics of every model on the test set
+        :param testing_file_path: test.csv of the data ingestion artifact
+        :param models: dict name -> VisaModel, e.g. trained and production
+        :return: dict with rows, seconds, mode, per-model metrics and, with two models in
+                 sample mode, the confidence interval of the F1 difference of the first minus the second
+        """
+        try:
+            config = self.model_evaluation_config
+            start = time.perf_counter()
+            results = list(ordered_bounded_map(score_evaluation_chunk, self.iter_test_chunks(testing_file_path),
+                                               config.workers, state=models))
+
+            labels = np.concatenate([result_labels for result_labels, _ in results])
+            predictions = {name: np.concatenate([scores[name][0] for _, scores in results]) for name in models}
+            probabilities = {name: np.concatenate([scores[name][1] for _, scores in results]) for name in models}
+            report = {
+                "mode": "sample" if config.sample_size else "full",
+                "rows": int(len(labels)),
+                "seconds": round(time.perf_counter() - start, 3),
+                "workers": config.workers,
+                "metrics": {name: classification_metrics(labels, predictions[name], probabilities[name])
+                            for name in models},
+                "f1_difference_interval": None,
+            }
+            names = list(models)
+            if config.sample_size and len(names) == 2 and len(labels):
+                report["f1_difference_interval"] = self.f1_difference_interval(
+                    labels, predictions[names[0]], predictions[names[1]])
+            log_event(logger, "model_evaluation_scored", mode=report["mode"], rows=report["rows"],
+                      seconds=report["seconds"], workers=config.workers,
+                      f1_scores={name: round(metrics["f1_score"], 4) for name, metrics in report["metrics"].items()},
+                      f1_difference_interval=report["f1_difference_interval"])
+            return report
+        except Exception as e:
+            raise CustomException(e, sys) from e
@@ -0,0 +1,98 @@
+import sys
+from datetime import datetime
+from functools import lru_cache
+
+from pandas import DataFrame
+
+from src.constants import SCHEMA_FILE_PATH, TARGET_COLUMN
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file
+from src.utils.main_utils import read_yaml_file
+
+# Initialize logger
+logger = setup_logger("feature_engineering", log_file)
+
+
+def current_year() -> int:
+    """
+    Year of the call, so long-running processes follow the calendar
+    """
+    return datetime.now().year
+
+
+# Operations a derived feature can be declared with: (values of the source column, current year) -> values;
+DERIVED_FEATURE_OPERATIONS = {
+    "years_since": lambda values, year: year - values,
+}
+
+
+class FeatureEngineering:
+    """
+    Model input features built from raw application rows, compiled once from the
+    derived_features, drop_columns and target of config/schema.yaml.
+
+    Training, evaluation, batch scoring and the API all go through this class, so
+    the features are computed the same way online and offline. A DataFrame is
+    transformed in one vectorized step: the kept columns are selected once and the
+    derived columns added to that selection, with no drop/assign chain copying the
+    whole frame.
+    """
+
+    def __init__(self, schema_file_data: dict, target_column: str = TARGET_COLUMN):
+        """
+        :param schema_file_data: parsed content of config/schema.yaml
+        :param target_column: label column, never part of the features
+        """
+        try:
+            self.derived_features = {}
+            for name, spec in (schema_file_data.get("derived_features") or {}).items():
+                (operation, source_column), = spec.items()
+                if operation not in DERIVED_FEATURE_OPERATIONS:
+                    raise ValueError(f"Unknown operation '{operation}' for derived feature {name}; "
+                                     f"expected one of {list(DERIVED_FEATURE_OPERATIONS)}")
+                self.derived_features[name] = (DERIVED_FEATURE_OPERATIONS[operation], source_column)
+            self.excluded_columns = set(schema_file_data.get("drop_columns") or []) | {target_column}
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def transform(self, dataframe: DataFrame) -> DataFrame:
+        """
+        Features of a batch of raw rows
+        :param dataframe: raw rows, with or without the target column
+        :return: DataFrame of the kept raw columns followed by the derived features
+        """
+        try:
+            year = current_year()
+            kept_columns = [col_name for col_name in dataframe.columns
+                            if col_name not in self.excluded_columns and col_name not in self.derived_features]
+            features = dataframe.loc[:, kept_columns]
+            for name, (operation, source_column) in self.derived_features.items():
+                features[name] = operation(dataframe[source_column], year)
+            return features
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def transform_record(self, record: dict) -> dict:
+        """
+        Features of one raw request. A derived feature sent by the caller is kept as is;
+        otherwise it is computed from its source column.
+        :param record: mapping of raw column name to value
+        :return: dict of features
+        """
+        try:
+            year = current_year()
+            features = {col_name: value for col_name, value in record.items() if col_name not in self.excluded_columns}
+            for name, (operation, source_column) in self.derived_features.items():
+                if features.get(name) is None and record.get(source_column) is not None:
+                    features[name] = operation(record[source_column], year)
+            return features
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+@lru_cache(maxsize=None)
+def get_feature_engineering(schema_file_path: str = SCHEMA_FILE_PATH, target_column: str = TARGET_COLUMN) -> FeatureEngineering:
+    """
+    FeatureEngineering of a schema file, parsed once per process
+    """
+    return FeatureEngineering(read_yaml_file(file_path=schema_file_path), target_column=target_column)
@@ -1,4 +1,5 @@
 from src.cloud_storage.aws_storage import SimpleStorageService
+from src.cloud_storage.local_storage import get_storage_service
 from src.exception import CustomException
 from src.entity.estimator import VisaModel
 import sys
@@ -19,7 +20,7 @@ class S3ModelEstimator:
         :param model_path: Location of your model in bucket
         """
         self.bucket_name: str = bucket_name
-        self.s3: SimpleStorageService = SimpleStorageService()
+        self.s3: SimpleStorageService = get_storage_service()
         self.model_path: str = model_path
         self.loaded_model:VisaModel=None
         
@@ -38,6 +39,15 @@ class S3ModelEstimator:
             logger.error(f"Error while checking model presence: {e}")
             return False
 
+    def get_model_version(self)->str:
+        """
+        Version of the stored model: the ETag of its object, which changes on every push
+        """
+        try:
+            return self.s3.get_file_object(self.model_path, self.bucket_name).e_tag.strip('"')
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def load_model(self)->VisaModel:
         """
         Load the model from the model_path
@@ -67,6 +77,43 @@ class S3ModelEstimator:
             logger.error(f"Error while saving model: {e}")
             raise CustomException(e, sys)
 
+    def is_profile_present(self,profile_path:str)->bool:
+        try:
+            return self.s3.s3_key_path_available(bucket_name=self.bucket_name, s3_key=profile_path)
+        except CustomException as e:
+            logger.error(f"Error while checking profile presence: {e}")
+            return False
+
+    def load_profile(self,profile_path:str)->dict:
+        """
+        Load the reference data profile saved next to the model
+        :param profile_path: Location of the profile in bucket
+        :return: profile dictionary
+        """
+        try:
+            return self.s3.load_yaml(profile_path,bucket_name=self.bucket_name)
+        except Exception as e:
+            logger.error(f"Error while loading profile: {e}")
+            raise CustomException(e, sys)
+
+    def save_profile(self,from_file,profile_path:str,remove:bool=False)->None:
+        """
+        Save the reference data profile next to the model
+        :param from_file: Your local system profile path
+        :param profile_path: Location of the profile in bucket
+        :param remove: By default it is false that mean you will have your profile locally available in your system folder
+        :return:
+        """
+        try:
+            self.s3.upload_file(from_file,
+                                to_filename=profile_path,
+                                bucket_name=self.bucket_name,
+                                remove=remove
+                            )
+        except Exception as e:
+            logger.error(f"Error while saving profile: {e}")
+            raise CustomException(e, sys)
+
     def predict(self,dataframe:DataFrame):
         """
         :param dataframe:
@@ -0,0 +1,193 @@
+import sys
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src.entity.feature_engineering import current_year
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file
+
+# Initialize logger
+logger = setup_logger("schema_validator", log_file)
+
+
+class SchemaValidator:
+    """
+    Validator compiled once from config/schema.yaml.
+
+    Each chunk is checked in one vectorized pass: column presence, numeric dtype,
+    allowed category sets, numeric ranges, null ratios and duplicate ids. Counts
+    are accumulated across chunks so arbitrarily large files can be streamed.
+    """
+
+    def __init__(self, schema_file_data: dict):
+        """
+        :param schema_file_data: parsed content of config/schema.yaml
+        """
+        try:
+            self.expected_columns = [list(column.keys())[0] for column in schema_file_data["columns"]]
+            self.numerical_columns = list(schema_file_data["numerical_columns"])
+            self.id_column = schema_file_data.get("id_column")
+            self.max_null_ratio = schema_file_data.get("max_null_ratio", 0.0)
+            self.max_invalid_ratio = schema_file_data.get("max_invalid_ratio", 0.0)
+
+            # Compile the rules once; allowed sets become pandas Index for fast isin;
+            self.allowed_values = {}
+            self.ranges = {}
+            for col_name, rule in (schema_file_data.get("column_rules") or {}).items():
+                if "allowed" in rule:
+                    self.allowed_values[col_name] = pd.Index([str(v) for v in rule["allowed"]])
+                if "min" in rule or "max" in rule:
+                    self.ranges[col_name] = (self._resolve_bound(rule.get("min"), -np.inf),
+                                             self._resolve_bound(rule.get("max"), np.inf))
+            self.reset()
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    @staticmethod
+    def _resolve_bound(bound, default: float) -> float:
+        if bound is None:
+            return default
+        if bound == "current_year":
+            return float(current_year())
+        return float(bound)
+
+    def reset(self) -> None:
+        """
+        Clears the counters so the validator can stream a new input
+        """
+        self.rows = 0
+        self.invalid_rows = 0
+        self.duplicate_ids = 0
+        self.missing_columns = set()
+        self.unexpected_columns = set()
+        self.dtype_mismatches = {}
+        self.null_counts = dict.fromkeys(self.expected_columns, 0)
+        self.invalid_counts = dict.fromkeys(self.expected_columns, 0)
+        self.seen_ids = np.array([], dtype=np.uint64)
+
+    def validate_chunk(self, chunk: DataFrame) -> None:
+        """
+        Validates one chunk and adds its violation counts to the running totals
+        :param chunk: DataFrame chunk of the input
+        """
+        try:
+            present = chunk.columns
+            self.missing_columns.update(c for c in self.expected_columns if c not in present)
+            self.unexpected_columns.update(c for c in present if c not in self.expected_columns)
+
+            row_invalid = np.zeros(len(chunk), dtype=bool)
+            for col_name in self.expected_columns:
+                if col_name not in present:
+                    continue
+                column = chunk[col_name]
+                is_null = column.isna().to_numpy()
+                invalid = np.zeros(len(chunk), dtype=bool)
+
+                if col_name in self.numerical_columns:
+                    if not pd.api.types.is_numeric_dtype(column):
+                        self.dtype_mismatches[col_name] = str(column.dtype)
+                        column = pd.to_numeric(column, errors="coerce")
+                        invalid |= column.isna().to_numpy() & ~is_null
+                    if col_name in self.ranges:
+                        low, high = self.ranges[col_name]
+                        values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+                        invalid |= (values < low) | (values > high)
+
+                if col_name in self.allowed_values:
+                    invalid |= ~column.astype(str).isin(self.allowed_values[col_name]).to_numpy() & ~is_null
+
+                self.null_counts[col_name] += int(is_null.sum())
+                self.invalid_counts[col_name] += int(invalid.sum())
+                row_invalid |= invalid | is_null
+
+            # Duplicate ids within the chunk and against every earlier chunk;
+            if self.id_column in present:
+                id_hashes = pd.util.hash_pandas_object(chunk[self.id_column], index=False).to_numpy()
+                duplicated = pd.Series(id_hashes).duplicated().to_numpy() | np.isin(id_hashes, self.seen_ids)
+                self.duplicate_ids += int(duplicated.sum())
+                row_invalid |= duplicated
+                self.seen_ids = np.union1d(self.seen_ids, id_hashes)
+
+            self.rows += len(chunk)
+            self.invalid_rows += int(row_invalid.sum())
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def count_shared_ids(self, other_ids: np.ndarray) -> int:
+        """
+        Number of ids validated since the last reset that are also in other_ids,
+        the seen_ids of the validation of another file
+        """
+        return int(len(np.intersect1d(self.seen_ids, other_ids, assume_unique=True)))
+
+    def report(self) -> dict:
+        """
+        Structured validation report of everything validated since the last reset
+        :return: dict report with status, errors and per-column violation counts
+        """
+        try:
+            rows = max(self.rows, 1)
+            columns = {}
+            errors = []
+            for col_name in self.expected_columns:
+                if col_name in self.missing_columns:
+                    continue
+                null_ratio = self.null_counts[col_name] / rows
+                invalid_ratio = self.invalid_counts[col_name] / rows
+                columns[col_name] = {
+                    "null_count": self.null_counts[col_name],
+                    "null_ratio": float(null_ratio),
+                    "invalid_count": self.invalid_counts[col_name],
+                    "invalid_ratio": float(invalid_ratio),
+                }
+                if null_ratio > self.max_null_ratio:
+                    errors.append(f"{col_name}: null ratio {null_ratio:.4f} above {self.max_null_ratio}")
+                if invalid_ratio > self.max_invalid_ratio:
+                    errors.append(f"{col_name}: invalid ratio {invalid_ratio:.4f} above {self.max_invalid_ratio}")
+
+            if self.missing_columns:
+                errors.append(f"Missing columns: {sorted(self.missing_columns)}")
+            if self.unexpected_columns:
+                errors.append(f"Unexpected columns: {sorted(self.unexpected_columns)}")
+            for col_name, dtype in self.dtype_mismatches.items():
+                errors.append(f"{col_name}: expected numerical dtype, got {dtype}")
+            if self.duplicate_ids:
+                errors.append(f"{self.id_column}: {self.duplicate_ids} duplicate ids")
+
+            return {
+                "status": len(errors) == 0,
+                "errors": errors,
+                "rows": self.rows,
+                "invalid_rows": self.invalid_rows,
+                "duplicate_ids": self.duplicate_ids,
+                "missing_columns": sorted(self.missing_columns),
+                "unexpected_columns": sorted(self.unexpected_columns),
+                "dtype_mismatches": dict(self.dtype_mismatches),
+                "columns": columns,
+            }
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def validate_dataframe(self, dataframe: DataFrame) -> dict:
+        """
+        Validates an in-memory DataFrame
+        """
+        self.reset()
+        self.validate_chunk(dataframe)
+        return self.report()
+
+    def validate_file(self, file_path: str, chunksize: int) -> dict:
+        """
+        Streams a CSV file in chunks through the validator
+        """
+        try:
+            self.reset()
+            for chunk in pd.read_csv(file_path, chunksize=chunksize):
+                self.validate_chunk(chunk)
+            report = self.report()
+            logger.info(f"Validated {report['rows']} rows of {file_path}: status={report['status']}, invalid_rows={report['invalid_rows']}")
+            return report
+        except Exception as e:
+            raise CustomException(e, sys) from e
@@ -1,34 +1,207 @@
 # src/logger/logger.py
 
+from contextlib import contextmanager
 from datetime import datetime
+import atexit
+import contextvars
+import json
 import logging
+import os
+import queue
+import random
+import time
+import uuid
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from from_root import from_root
 
+from src.constants import (LOG_ASYNC, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_ROTATION_INTERVAL_SECONDS,
+                           LOG_QUEUE_SIZE, LOG_PREDICTION_SAMPLE_RATE, LOG_JSON)
+
 # Logs directory
 logs_root = Path(from_root("logs"))
 date_dir = logs_root / datetime.now().strftime("%Y-%m-%d")
 date_dir.mkdir(parents=True, exist_ok=True)
-log_file = date_dir / f"{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}.log"
+# The pid keeps processes started in the same second, e.g. spawned workers, off each other's file
+log_file = date_dir / f"{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}-{os.getpid()}.log"
+
+# Run id attached to every record; pipelines and requests set their own
+run_id_var: contextvars.ContextVar = contextvars.ContextVar("run_id", default=uuid.uuid4().hex[:12])
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Formats records logged through log_event / log_stage with their fields.
+    In JSON mode every record becomes one JSON object per line; in text mode
+    the usual line is followed by the fields as a JSON object
+    """
+    def __init__(self, json_output: bool = LOG_JSON):
+        super().__init__("%(asctime)s - %(name)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+        self.json_output = json_output
+
+    def format(self, record) -> str:
+        fields = getattr(record, "fields", None)
+        if self.json_output:
+            payload = {
+                "time": self.formatTime(record, self.datefmt),
+                "logger": record.name,
+                "level": record.levelname,
+                "message": record.getMessage(),
+                "run_id": getattr(record, "run_id", None),
+            }
+            payload.update(fields or {})
+            return json.dumps(payload, default=str)
+        line = super().format(record)
+        if fields is None:
+            return line
+        return f"{line} {json.dumps({'run_id': getattr(record, 'run_id', None), **fields}, default=str)}"
+
+
+class RunIdFilter(logging.Filter):
+    """
+    Stamps the current run id on the record in the calling thread
+    """
+    def filter(self, record) -> bool:
+        record.run_id = run_id_var.get()
+        return True
+
+
+formatter = StructuredFormatter()
+
+# One background writer per log file, shared by every named logger
+_queue_listeners = {}
+_queue_handlers = {}
+
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    """
+    File handler that rolls over when the file reaches max_bytes or when
+    interval seconds have passed since the last rollover, whichever comes first
+    """
+    def __init__(self, filename, max_bytes: int = 0, backup_count: int = 0, interval: int = 0):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+        self.interval = interval
+        self.rollover_at = time.time() + interval if interval else None
+
+    def shouldRollover(self, record) -> bool:
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        if self.interval:
+            self.rollover_at = time.time() + self.interval
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a share of the records logged with extra={"sampled": True};
+    every other record passes untouched
+    """
+    def __init__(self, sample_rate: float = LOG_PREDICTION_SAMPLE_RATE):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record) -> bool:
+        if not getattr(record, "sampled", False) or self.sample_rate >= 1.0:
+            return True
+        return random.random() < self.sample_rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that drops a record instead of blocking the caller when the queue is full
+    """
+    def enqueue(self, record) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def _create_writer_handlers(log_file: Path) -> list:
+    # File handler
+    file_handler = SizeAndTimeRotatingFileHandler(
+        log_file, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT, interval=LOG_ROTATION_INTERVAL_SECONDS
+    )
+    file_handler.setFormatter(formatter)
+
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
+    return [file_handler, console_handler]
+
+
+def _start_queue_listener(log_file: Path) -> queue.Queue:
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    listener = QueueListener(log_queue, *_create_writer_handlers(log_file), respect_handler_level=True)
+    listener.start()
+    _queue_listeners[str(log_file)] = listener
+    return log_queue
+
+
+def get_queue_handler(log_file: Path) -> QueueHandler:
+    """
+    Returns the queue handler feeding the single background writer thread of log_file
+    """
+    key = str(log_file)
+    if key not in _queue_handlers:
+        _queue_handlers[key] = NonBlockingQueueHandler(_start_queue_listener(log_file))
+    return _queue_handlers[key]
+
+
+def stop_queue_listeners() -> None:
+    """
+    Flushes the queued records and stops the background writers
+    """
+    for listener in _queue_listeners.values():
+        listener.stop()
+    _queue_listeners.clear()
+
+
+def worker_log_file(log_file: Path, pid: int) -> Path:
+    """
+    Log file of a forked worker: the parent's file name with the worker's pid, so every
+    process rotates only its own file and backups
+    """
+    return log_file.with_name(f"{log_file.stem}-{pid}{log_file.suffix}")
+
+
+def _restart_queue_listeners_in_child() -> None:
+    # The writer thread does not survive fork; give each child its own queue, writer and file;
+    _queue_listeners.clear()
+    for key, handler in _queue_handlers.items():
+        handler.queue = _start_queue_listener(worker_log_file(Path(key), os.getpid()))
+
+
+atexit.register(stop_queue_listeners)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_queue_listeners_in_child)
 
 """
 Creates and returns a logger with file + console handlers
+With LOG_ASYNC the handlers run on one background thread behind a queue,
+so callers never block on file or console writes
 """
 def setup_logger(name: str, log_file: Path = log_file) -> logging.Logger:
 
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
-    
+
     logger.propagate = False  # THIS FIXES DUPLICATION
 
     # Prevent duplicate logs
     if logger.handlers:
         return logger
 
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
+    logger.addFilter(SamplingFilter())
+    logger.addFilter(RunIdFilter())
+
+    if LOG_ASYNC:
+        logger.addHandler(get_queue_handler(log_file))
+        return logger
 
     # File handler
     file_handler = logging.FileHandler(log_file)
@@ -42,3 +215,37 @@ def setup_logger(name: str, log_file: Path = log_file) -> logging.Logger:
     logger.addHandler(console_handler)
 
     return logger
+
+
+def set_run_id(run_id: str) -> contextvars.Token:
+    """
+    Sets the run id stamped on every following record of this context
+    """
+    return run_id_var.set(run_id)
+
+
+def log_event(logger: logging.Logger, event: str, level: int = logging.INFO, sampled: bool = False, **fields) -> None:
+    """
+    Logs a structured record; fields are emitted as JSON next to the event name
+    sampled: the record is subject to LOG_PREDICTION_SAMPLE_RATE
+    """
+    logger.log(level, event, extra={"fields": {"event": event, **fields}, "sampled": sampled})
+
+
+@contextmanager
+def log_stage(logger: logging.Logger, stage: str, sampled: bool = False, **fields):
+    """
+    Times the wrapped block and logs one structured record with stage, status and
+    duration_ms; the yielded dict collects extra fields such as rows or bytes
+    """
+    metrics = dict(fields)
+    status = "success"
+    start = time.perf_counter()
+    try:
+        yield metrics
+    except BaseException:
+        status = "failed"
+        raise
+    finally:
+        metrics["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        log_event(logger, "stage_completed", sampled=sampled, stage=stage, status=status, **metrics)
@@ -0,0 +1,188 @@
+import os
+import sys
+import time
+from contextlib import closing
+from functools import partial
+
+import pandas as pd
+
+from src.data_access.results_sink import ResultsSink
+from src.entity.config_entity import BatchPredictionConfig, ModelPredictorConfig, ResultsSinkConfig
+from src.entity.estimator import TargetValueMapping, VisaModel
+from src.entity.feature_engineering import get_feature_engineering
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file, log_event, log_stage
+from src.pipeline.prediction_pipeline import ModelPredictor
+from src.utils.dtype_utils import apply_dtype_plan, read_csv_with_plan
+from src.utils.parallel_utils import ordered_bounded_map
+from src.utils.profiler import profile_section
+
+# Initialize logger
+logger = setup_logger("batch_prediction_pipeline", log_file)
+
+def score_chunk(chunk: pd.DataFrame, model: VisaModel, id_column: str, target_column: str,
+                start_row: int = 0) -> pd.DataFrame:
+    """
+    Scores one chunk of raw applications
+    chunk: DataFrame rows in the schema of the VisaApplications collection
+    start_row: int row number of the first row, used as id when the id column is missing
+    return: DataFrame with the id, the predicted label and its probability
+    """
+    features = get_feature_engineering(target_column=target_column).transform(chunk)
+    predictions, probabilities = model.predict_with_probability(features)
+    ids = (chunk[id_column].astype(str).to_numpy() if id_column in chunk.columns
+           else pd.RangeIndex(start_row, start_row + len(chunk)).astype(str))
+    return pd.DataFrame({
+        id_column: ids,
+        "prediction": pd.Series(predictions).map(TargetValueMapping().reverse_mapping()).to_numpy(),
+        "probability": probabilities,
+    })
+
+
+def score_numbered_chunk(numbered_chunk: tuple, model: VisaModel, id_column: str, target_column: str) -> pd.DataFrame:
+    chunk, start_row = numbered_chunk
+    return score_chunk(chunk, model, id_column, target_column, start_row)
+
+
+class PredictionWriter:
+    """
+    Streams scored chunks to a Parquet or CSV file, or to a collection through the results sink
+    """
+
+    def __init__(self, output_path: str = None, results_sink: ResultsSink = None, model_version: str = None):
+        self.output_path = output_path
+        self.results_sink = results_sink
+        self.model_version = model_version
+        self._parquet_writer = None
+        self._csv_header = True
+
+    def write(self, predictions: pd.DataFrame) -> None:
+        if self.results_sink is not None:
+            self.results_sink.write(predictions, self.model_version)
+        elif self.output_path.endswith(".csv"):
+            predictions.to_csv(self.output_path, mode="w" if self._csv_header else "a",
+                               header=self._csv_header, index=False)
+            self._csv_header = False
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(predictions, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.output_path, table.schema)
+            self._parquet_writer.write_table(table)
+
+    def close(self) -> None:
+        if self.results_sink is not None:
+            self.results_sink.close()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+
+class BatchPredictionPipeline:
+    """
+    Offline scoring of a file or collection with the production model.
+
+    Input is read in chunks and output written chunk by chunk, so memory stays
+    bounded by the number of chunks in flight whatever the input size. The model is
+    loaded once in the parent; worker processes are forked from it and share it
+    copy-on-write. Chunks are scored in parallel and written in input order.
+    """
+
+    def __init__(self, batch_prediction_config: BatchPredictionConfig = BatchPredictionConfig()):
+        self.batch_prediction_config = batch_prediction_config
+
+    def iter_input_chunks(self):
+        """
+        Yields the input as DataFrames of at most chunk_size rows
+        """
+        try:
+            input_path = self.batch_prediction_config.input_path
+            chunk_size = self.batch_prediction_config.chunk_size
+            if input_path is None:
+                from src.data_access.data_access import DataAccess
+
+                yield from DataAccess().iter_chunks_from_db(self.batch_prediction_config.input_collection, chunk_size)
+            elif input_path.endswith((".parquet", ".pq")):
+                import pyarrow.parquet as pq
+
+                for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunk_size):
+                    yield apply_dtype_plan(batch.to_pandas())
+            else:
+                yield from read_csv_with_plan(input_path, chunksize=chunk_size)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def iter_numbered_chunks(self):
+        """
+        Yields (chunk, row number of its first row) for every input chunk
+        """
+        start_row = 0
+        for chunk in self.iter_input_chunks():
+            yield chunk, start_row
+            start_row += len(chunk)
+
+    def get_writer(self, model_version: str = None) -> PredictionWriter:
+        output_collection = self.batch_prediction_config.output_collection
+        if output_collection is not None:
+            results_sink = ResultsSink(ResultsSinkConfig(collection_name=output_collection,
+                                                         key_column=self.batch_prediction_config.id_column,
+                                                         batch_size=self.batch_prediction_config.sink_batch_size))
+            return PredictionWriter(results_sink=results_sink, model_version=model_version)
+        os.makedirs(os.path.dirname(self.batch_prediction_config.output_path) or ".", exist_ok=True)
+        return PredictionWriter(output_path=self.batch_prediction_config.output_path)
+
+    def run(self) -> dict:
+        """
+        Scores the whole input and streams the predictions to the output
+        :return: dict with rows, chunks, seconds, rows_per_sec and the model version
+        """
+        logger.info("Entered run method of BatchPredictionPipeline class")
+
+        try:
+            config = self.batch_prediction_config
+            model_predictor = ModelPredictor(ModelPredictorConfig(bucket_name=config.bucket_name,
+                                                                  s3_model_key_path=config.s3_model_key_path))
+            model, model_version = model_predictor.get_versioned_model()
+            writer = self.get_writer(model_version)
+
+            rows = chunks = 0
+            start = time.perf_counter()
+
+            def write(predictions: pd.DataFrame) -> None:
+                nonlocal rows, chunks
+                writer.write(predictions)
+                rows += len(predictions)
+                chunks += 1
+                elapsed = time.perf_counter() - start
+                log_event(logger, "batch_chunk_scored", chunk=chunks, rows=len(predictions), total_rows=rows,
+                          rows_per_sec=round(rows / elapsed, 1) if elapsed else None)
+
+            with profile_section("batch_prediction"), log_stage(logger, "batch_prediction",
+                                                                 workers=config.workers) as metrics:
+                score = partial(score_numbered_chunk, id_column=config.id_column, target_column=config.target_column)
+                try:
+                    # Bounded look-ahead keeps memory flat and the output in input order;
+                    with closing(ordered_bounded_map(score, self.iter_numbered_chunks(), config.workers, state=model,
+                                                     pending_per_worker=config.pending_chunks_per_worker)) as scored:
+                        for predictions in scored:
+                            write(predictions)
+                finally:
+                    writer.close()
+                metrics["rows"] = rows
+
+            seconds = time.perf_counter() - start
+            summary = {
+                "rows": rows,
+                "chunks": chunks,
+                "seconds": round(seconds, 3),
+                "rows_per_sec": round(rows / seconds, 1) if seconds else None,
+                "workers": config.workers,
+                "model_version": model_version,
+                "output": config.output_collection or config.output_path,
+            }
+            logger.info(f"Batch prediction finished: {summary}")
+            return summary
+        except Exception as e:
+            raise CustomException(e, sys) from e
@@ -0,0 +1,325 @@
+import http.client
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.constants import SCHEMA_FILE_PATH
+from src.entity.config_entity import BenchmarkConfig
+from src.entity.feature_engineering import get_feature_engineering
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file
+from src.utils.main_utils import read_yaml_file
+
+# Initialize logger
+logger = setup_logger("benchmark_pipeline", log_file)
+
+# Request features of the /predict endpoint
+PREDICT_FEATURES = ["continent", "education_of_employee", "has_job_experience", "requires_job_training",
+                    "no_of_employees", "region_of_employment", "prevailing_wage", "unit_of_wage",
+                    "full_time_position", "company_age"]
+
+
+def _serve_model(host: str, port: int, workers: int) -> None:
+    # Runs in a spawned process; the API loads the pushed model from the local object store;
+    from src.entity.config_entity import ServingConfig
+    from src.pipeline.serving_pipeline import PreforkServer
+
+    PreforkServer(ServingConfig(host=host, port=port, workers=workers)).run()
+
+
+def _latency_summary(latencies_ms: list, errors: int, elapsed: float, concurrency: int) -> dict:
+    latencies = np.asarray(latencies_ms, dtype=np.float64)
+    return {
+        "concurrency": concurrency,
+        "requests": int(len(latencies) + errors),
+        "errors": int(errors),
+        "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+        "p90_ms": float(np.percentile(latencies, 90)) if len(latencies) else None,
+        "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else None,
+        "mean_ms": float(latencies.mean()) if len(latencies) else None,
+        "throughput_rps": float(len(latencies) / elapsed) if elapsed else None,
+    }
+
+
+class BenchmarkPipeline:
+    """
+    End-to-end benchmark of training and serving on synthetic data.
+
+    Each scale runs in a fresh spawned process on the local storage and data
+    source backends, so it gets its own artifact directory, model registry and an
+    isolated peak memory. Stage timings come from the pipeline profiler; serving is
+    measured against the API started in a separate process.
+    """
+
+    def __init__(self, benchmark_config: BenchmarkConfig = BenchmarkConfig()):
+        self.benchmark_config = benchmark_config
+
+    def run_training(self, n_rows: int) -> dict:
+        """
+        Loads n_rows synthetic rows into the local data source and runs the whole training pipeline on them
+        :return: dict with per-stage timings, model size and model paths
+        """
+        try:
+            from src.configuration.local_document_connection import LocalDocumentClient
+            from src.constants import DATABASE_NAME, DATA_INGESTION_COLLECTION_NAME
+            from src.entity.config_entity import ProfilerConfig, training_pipeline_config
+            from src.pipeline.training_pipeline import TrainingPipeline
+            from src.utils.main_utils import get_file_size
+            from src.utils.profiler import enable_profiling, disable_profiling, profile_section
+            from src.utils.synthetic_data import build_synthetic_profile, iter_synthetic_chunks
+
+            profiler = enable_profiling(ProfilerConfig())
+            try:
+                with profile_section("data_generation"):
+                    reference_df = pd.read_csv(self.benchmark_config.reference_data_path)
+                    synthetic_profile = build_synthetic_profile(reference_df, read_yaml_file(SCHEMA_FILE_PATH),
+                                                                list(self.benchmark_config.strata_columns))
+                    collection = LocalDocumentClient(DATABASE_NAME).database[DATA_INGESTION_COLLECTION_NAME]
+                    collection.drop()
+                    for chunk in iter_synthetic_chunks(synthetic_profile, n_rows, self.benchmark_config.chunk_size,
+                                                       seed=self.benchmark_config.seed):
+                        collection.insert_dataframe(chunk)
+
+                training_pipeline = TrainingPipeline()
+                data_ingestion_artifact = training_pipeline.start_data_ingestion()
+                data_validation_artifact = training_pipeline.start_data_validation(data_ingestion_artifact=data_ingestion_artifact)
+                data_transformation_artifact = training_pipeline.start_data_transformation(
+                    data_ingestion_artifact=data_ingestion_artifact, data_validation_artifact=data_validation_artifact)
+                model_trainer_artifact = training_pipeline.start_model_trainer(
+                    data_validation_artifact=data_validation_artifact, data_transformation_artifact=data_transformation_artifact)
+                model_evaluation_artifact = training_pipeline.start_model_evaluation(
+                    data_ingestion_artifact=data_ingestion_artifact, model_trainer_artifact=model_trainer_artifact)
+                if model_evaluation_artifact.is_model_accepted:
+                    training_pipeline.start_model_pusher(model_evaluation_artifact=model_evaluation_artifact)
+            finally:
+                disable_profiling()
+                profiler.write_report()
+
+            return {
+                "rows": n_rows,
+                "artifact_dir": training_pipeline_config.artifact_dir,
+                "feature_store_bytes": get_file_size(training_pipeline.data_ingestion_config.feature_store_path),
+                "stages": profiler.aggregate(),
+                "model_path": model_trainer_artifact.trained_model_path,
+                "model_size_bytes": get_file_size(model_trainer_artifact.trained_model_path),
+                "model_f1_score": float(model_trainer_artifact.model_metric_artifact.model_f1_score),
+                "is_model_accepted": model_evaluation_artifact.is_model_accepted,
+                "testing_file_path": data_ingestion_artifact.testing_file_path,
+            }
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    @staticmethod
+    def measure_model_load(model_path: str) -> dict:
+        """
+        Time to unpickle the model and build its request encoder, and the memory it takes
+        """
+        try:
+            from src.utils.main_utils import load_object
+            from src.utils.profiler import current_rss
+
+            rss_before = current_rss()
+            start = time.perf_counter()
+            model = load_object(model_path)
+            load_seconds = time.perf_counter() - start
+            model.get_request_encoder()
+            return {
+                "model_load_seconds": load_seconds,
+                "model_warm_seconds": time.perf_counter() - start,
+                "model_rss_mb": (current_rss() - rss_before) / 2**20,
+            }
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def load_payloads(self, testing_file_path: str, n_payloads: int = 1000) -> list:
+        """
+        /predict request bodies built from the held-out synthetic rows
+        """
+        try:
+            test_df = get_feature_engineering().transform(pd.read_csv(testing_file_path, nrows=n_payloads))
+            return json.loads(test_df[PREDICT_FEATURES].to_json(orient="records"))
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def wait_for_server(self, server_process, started_at: float) -> float:
+        """
+        Polls the API until it answers; returns the seconds since the server process started
+        """
+        deadline = started_at + self.benchmark_config.server_startup_timeout
+        while time.perf_counter() < deadline:
+            if not server_process.is_alive():
+                raise Exception("Benchmark server exited during startup")
+            try:
+                connection = http.client.HTTPConnection(self.benchmark_config.server_host,
+                                                        self.benchmark_config.server_port, timeout=1)
+                connection.request("GET", "/schema")
+                if connection.getresponse().status == 200:
+                    return time.perf_counter() - started_at
+            except OSError:
+                pass
+            time.sleep(0.1)
+        raise Exception("Benchmark server did not start in time")
+
+    def run_load(self, payloads: list, concurrency: int, n_requests: int) -> dict:
+        """
+        Sends n_requests /predict calls from `concurrency` keep-alive clients
+        """
+        latencies, errors, lock = [], [0], threading.Lock()
+        bodies = [json.dumps(payload) for payload in payloads]
+        counter = iter(range(n_requests))
+
+        def client():
+            connection = http.client.HTTPConnection(self.benchmark_config.server_host, self.benchmark_config.server_port)
+            local_latencies, local_errors = [], 0
+            for i in counter:
+                start = time.perf_counter()
+                try:
+                    connection.request("POST", "/predict", body=bodies[i % len(bodies)],
+                                       headers={"Content-Type": "application/json"})
+                    response = connection.getresponse()
+                    response.read()
+                    if response.status == 200:
+                        local_latencies.append((time.perf_counter() - start) * 1000)
+                    else:
+                        local_errors += 1
+                except OSError:
+                    local_errors += 1
+                    connection.close()
+                    connection = http.client.HTTPConnection(self.benchmark_config.server_host, self.benchmark_config.server_port)
+            connection.close()
+            with lock:
+                latencies.extend(local_latencies)
+                errors[0] += local_errors
+
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return _latency_summary(latencies, errors[0], time.perf_counter() - start, concurrency)
+
+    def run_serving(self, testing_file_path: str) -> list:
+        """
+        For every worker count: cold start, memory per worker and /predict
+        latency/throughput at every configured concurrency level
+        """
+        try:
+            from src.pipeline.serving_pipeline import child_pids, process_memory
+
+            payloads = self.load_payloads(testing_file_path)
+            context = multiprocessing.get_context("spawn")
+            results = []
+            for workers in self.benchmark_config.worker_counts:
+                server_process = context.Process(target=_serve_model, daemon=False,
+                                                 args=(self.benchmark_config.server_host, self.benchmark_config.server_port, workers))
+                started_at = time.perf_counter()
+                server_process.start()
+                try:
+                    cold_start_seconds = self.wait_for_server(server_process, started_at)
+                    # Warm-up pass so connection setup and lazy imports are not measured;
+                    self.run_load(payloads, concurrency=workers, n_requests=min(50 * workers, self.benchmark_config.requests_per_level))
+                    levels = [self.run_load(payloads, concurrency, self.benchmark_config.requests_per_level)
+                              for concurrency in self.benchmark_config.concurrency_levels]
+                    worker_memory = [process_memory(pid) for pid in child_pids(server_process.pid)]
+                    results.append({
+                        "workers": workers,
+                        "cold_start_seconds": cold_start_seconds,
+                        "parent_memory": process_memory(server_process.pid),
+                        "worker_memory": worker_memory,
+                        "pss_mb_per_worker": float(np.mean([m.get("pss_mb", 0.0) for m in worker_memory])) if worker_memory else None,
+                        "peak_throughput_rps": max(level["throughput_rps"] or 0.0 for level in levels),
+                        "load": levels,
+                    })
+                finally:
+                    server_process.terminate()
+                    server_process.join()
+            return results
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def run_scale(self, n_rows: int) -> dict:
+        """
+        Training, model load and serving benchmark at one scale
+        """
+        logger.info(f"Running benchmark at {n_rows} rows")
+        result = self.run_training(n_rows)
+        result.update(self.measure_model_load(result["model_path"]))
+        result["serving"] = self.run_serving(result["testing_file_path"])
+        return result
+
+    @staticmethod
+    def environment() -> dict:
+        """
+        Commit and machine the results were measured on
+        """
+        try:
+            commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip() or None
+        except OSError:
+            commit = None
+        return {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        }
+
+    def run(self) -> str:
+        """
+        Runs every configured scale, each in its own spawned process, and writes the JSON results
+        :return: path of the results file
+        """
+        try:
+            results = {**self.environment(), "config": {
+                "row_counts": list(self.benchmark_config.row_counts),
+                "concurrency_levels": list(self.benchmark_config.concurrency_levels),
+                "worker_counts": list(self.benchmark_config.worker_counts),
+                "requests_per_level": self.benchmark_config.requests_per_level,
+                "seed": self.benchmark_config.seed,
+                "prediction_cache": False,
+                "cv_cache": "empty per scale",
+            }, "scales": []}
+
+            for n_rows in self.benchmark_config.row_counts:
+                # Children read the backends from src.constants at import, so select them through the environment;
+                # the payloads repeat, so the prediction cache is off to time inference rather than cache hits,
+                # and every scale starts with an empty CV cache so model selection is timed, not cache lookups;
+                scale_dir = os.path.join(self.benchmark_config.benchmark_dir, "local_storage", str(n_rows))
+                shutil.rmtree(scale_dir, ignore_errors=True)
+                os.environ.update({
+                    "STORAGE_BACKEND": "local",
+                    "DATA_SOURCE_BACKEND": "local",
+                    "LOCAL_STORAGE_DIR": os.path.join(scale_dir, "s3"),
+                    "LOCAL_DATA_SOURCE_DIR": os.path.join(scale_dir, "mongodb"),
+                    "PREDICTION_CACHE_ENABLED": "0",
+                    "MODEL_TRAINER_CV_CACHE_PATH": os.path.join(scale_dir, "cv_cache", "cv_results.yaml"),
+                })
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    try:
+                        results["scales"].append(executor.submit(self.run_scale, n_rows).result())
+                    except Exception as e:
+                        logger.error(f"Benchmark at {n_rows} rows failed: {e}")
+                        results["scales"].append({"rows": n_rows, "error": str(e)})
+
+            os.makedirs(self.benchmark_config.benchmark_dir, exist_ok=True)
+            results_path = os.path.join(self.benchmark_config.benchmark_dir,
+                                        f"benchmark_{(results['commit'] or 'nocommit')[:12]}_{datetime.now().strftime('%m_%d_%Y__%H_%M_%S')}.json")
+            with open(results_path, "w") as results_file:
+                json.dump(results, results_file, indent=2)
+            logger.info(f"Benchmark results written to {results_path}")
+            return results_path
+        except Exception as e:
+            raise CustomException(e, sys) from e
@@ -0,0 +1,88 @@
+import asyncio
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.entity.config_entity import InferenceExecutorConfig
+from src.logger.logger import setup_logger, log_file, log_event
+
+# Initialize logger
+logger = setup_logger("inference_executor", log_file)
+
+
+class InferenceQueueFullError(Exception):
+    """
+    Raised when every inference thread is busy and the wait queue is full
+    """
+
+
+class InferenceExecutor:
+    """
+    Bounded thread pool that keeps CPU-bound scoring off the asyncio event loop.
+
+    At most max_workers calls run at once and at most max_queue_size wait behind
+    them; anything beyond is rejected immediately so bursts turn into fast 503s
+    instead of a growing backlog. A call that exceeds the timeout is answered with
+    a timeout, but keeps its slot until its thread actually finishes, so the
+    capacity accounting never over-admits. Threads are used rather than processes
+    because the model is resident in this worker and numpy/sklearn release the
+    GIL for the heavy parts; scale across cores with the pre-fork workers.
+    """
+
+    def __init__(self, inference_executor_config: InferenceExecutorConfig):
+        self.inference_executor_config = inference_executor_config
+        self.capacity = inference_executor_config.max_workers + inference_executor_config.max_queue_size
+        self._executor = ThreadPoolExecutor(max_workers=inference_executor_config.max_workers,
+                                            thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    async def run(self, func, *args, timeout: float = None):
+        """
+        Runs func(*args) on the pool
+        :raises InferenceQueueFullError: when the pool and its queue are full
+        :raises asyncio.TimeoutError: when the call takes longer than the timeout
+        """
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                log_event(logger, "inference_rejected", level=logging.WARNING, in_flight=self.in_flight, capacity=self.capacity)
+                raise InferenceQueueFullError(f"Inference queue full ({self.in_flight} requests in flight)")
+            self.in_flight += 1
+        # Run in a copy of the caller's context so the request's run_id reaches the pool thread;
+        future = self._executor.submit(contextvars.copy_context().run, func, *args)
+        future.add_done_callback(self._release)
+
+        timeout = self.inference_executor_config.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timed_out += 1
+            log_event(logger, "inference_timeout", level=logging.WARNING, timeout=timeout, in_flight=self.in_flight)
+            raise
+
+    def stats(self) -> dict:
+        """
+        Counters of this worker's executor
+        """
+        return {
+            "max_workers": self.inference_executor_config.max_workers,
+            "max_queue_size": self.inference_executor_config.max_queue_size,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+
+from src.entity.config_entity import PredictionCacheConfig
+from src.logger.logger import setup_logger, log_file, log_event
+
+# Initialize logger
+logger = setup_logger("prediction_cache", log_file)
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of predictions with a time-to-live, local to one serving worker.
+
+    Entries are keyed on the normalized request features and belong to one model
+    version: the first lookup with a different version drops every entry, so a new
+    production model never answers from the previous model's results. Memory is
+    bounded by max_entries; the least recently used entry is evicted first.
+    """
+
+    def __init__(self, prediction_cache_config: PredictionCacheConfig):
+        self.prediction_cache_config = prediction_cache_config
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.model_version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(features: dict) -> tuple:
+        """
+        Normalized feature tuple: values in field-name order, types already coerced by the request model
+        """
+        return tuple(features[name] for name in sorted(features))
+
+    def _check_version(self, model_version: str) -> None:
+        if model_version != self.model_version:
+            if self._entries:
+                self.invalidations += 1
+                log_event(logger, "prediction_cache_invalidated", entries=len(self._entries),
+                          old_version=self.model_version, new_version=model_version)
+            self._entries.clear()
+            self.model_version = model_version
+
+    def get(self, model_version: str, key: tuple):
+        """
+        Cached prediction of key under model_version, or None
+        """
+        if not self.prediction_cache_config.enabled or model_version is None:
+            return None
+        with self._lock:
+            self._check_version(model_version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, model_version: str, key: tuple, value) -> None:
+        if not self.prediction_cache_config.enabled or model_version is None:
+            return
+        with self._lock:
+            self._check_version(model_version)
+            self._entries[key] = (value, time.monotonic() + self.prediction_cache_config.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.prediction_cache_config.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Counters of this worker's cache
+        """
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.prediction_cache_config.enabled,
+            "model_version": self.model_version,
+            "entries": len(self._entries),
+            "max_entries": self.prediction_cache_config.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
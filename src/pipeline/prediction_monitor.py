@@ -0,0 +1,229 @@
+import os
+import sys
+import time
+import threading
+from collections import deque
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.constants import PREDICTION_MONITOR_OTHER_CATEGORY
+from src.entity.feature_engineering import current_year
+from src.entity.config_entity import PredictionMonitorConfig
+from src.entity.estimator import TargetValueMapping
+from src.entity.s3_estimator import S3ModelEstimator
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file
+from src.utils.main_utils import read_yaml_file, write_yaml_file
+from src.utils.drift_utils import compare_counts_to_profile
+
+# Initialize logger
+logger = setup_logger("prediction_monitor", log_file)
+
+
+class PredictionMonitor:
+    """
+    Streaming drift and data-quality monitor for the serving process.
+
+    The request path only appends (features, prediction) to a bounded deque, which is
+    atomic under the GIL, so no lock is taken. flush() drains the deque and folds the
+    rows into per-worker histograms and frequency tables in one vectorized step, then
+    writes this worker's snapshot; drift_report() merges the fresh snapshots of all
+    workers and compares them against the training reference profile.
+
+    The counters have a fixed size: numerical columns are binned on the edges of the
+    reference profile and only null-counted until one is loaded, and frequencies are
+    kept for the schema's categorical columns only, at most max_categories values each.
+    """
+
+    def __init__(self, prediction_monitor_config: PredictionMonitorConfig, reference_profile: Optional[dict] = None):
+        self.prediction_monitor_config = prediction_monitor_config
+        self.reference_profile = reference_profile
+        self.target_reverse_mapping = TargetValueMapping().reverse_mapping()
+        schema_file_data = read_yaml_file(self.prediction_monitor_config.schema_file_path)
+        self.categorical_columns = set(schema_file_data["categorical_columns"]) - {schema_file_data.get("id_column")}
+        self._buffer = deque(maxlen=self.prediction_monitor_config.buffer_size)
+        self._flush_lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clears the counters of this worker
+        """
+        self.rows = 0
+        self.saturated_flushes = 0
+        self.column_counts = {}
+        self.out_of_range = {}
+        self.prediction_counts = {}
+        self.last_flush = time.time()
+
+    @property
+    def snapshot_path(self) -> str:
+        # Resolved per call so forked workers each write their own file;
+        return os.path.join(self.prediction_monitor_config.monitor_dir, f"worker_{os.getpid()}.yaml")
+
+    def load_reference_profile(self) -> Optional[dict]:
+        """
+        Loads the reference profile saved next to the production model
+        """
+        try:
+            estimator = S3ModelEstimator(bucket_name=self.prediction_monitor_config.bucket_name,
+                                         model_path=self.prediction_monitor_config.s3_model_key_path)
+            if estimator.is_profile_present(self.prediction_monitor_config.s3_profile_key_path):
+                self.reference_profile = estimator.load_profile(self.prediction_monitor_config.s3_profile_key_path)
+                logger.info("Loaded reference profile for prediction monitor")
+            else:
+                logger.info("No reference profile found, prediction monitor only keeps counts")
+            return self.reference_profile
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def add_frequencies(self, frequencies: dict, counts) -> None:
+        """
+        Adds (value, count) pairs to a frequency table of at most max_categories values
+        """
+        for value, count in counts:
+            if value not in frequencies and len(frequencies) >= self.prediction_monitor_config.max_categories:
+                value = PREDICTION_MONITOR_OTHER_CATEGORY
+            frequencies[value] = frequencies.get(value, 0) + int(count)
+
+    def record(self, features, prediction) -> None:
+        """
+        Hot path: queue one scored request; aggregation happens in flush()
+        :param features: mapping or pydantic model of the request features
+        :param prediction: raw model output for the request
+        """
+        self._buffer.append((features, prediction))
+
+    def flush(self) -> int:
+        """
+        Drains the buffered requests into the counters and writes this worker's snapshot
+        :return: number of rows folded in
+        """
+        try:
+            # Only flushers serialize; popleft is atomic so record() never waits;
+            with self._flush_lock:
+                n_rows = len(self._buffer)
+                if n_rows == self._buffer.maxlen:
+                    self.saturated_flushes += 1
+                batch = [self._buffer.popleft() for _ in range(n_rows)]
+                if batch:
+                    self.fold(batch)
+                self.last_flush = time.time()
+                write_yaml_file(self.snapshot_path, self.snapshot(), replace=True)
+            return n_rows
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def fold(self, batch: list) -> None:
+        """
+        Folds a batch of (features, prediction) rows into the counters in one vectorized pass
+        """
+        dataframe = pd.DataFrame([dict(features) for features, _ in batch])
+        if "company_age" in dataframe.columns and "yr_of_estab" not in dataframe.columns:
+            dataframe["yr_of_estab"] = current_year() - dataframe["company_age"]
+        self.rows += len(dataframe)
+
+        profile_columns = self.reference_profile["columns"] if self.reference_profile else {}
+        for col_name in dataframe.columns:
+            column = dataframe[col_name]
+            column_profile = profile_columns.get(col_name)
+            counts = self.column_counts.setdefault(col_name, {"null_count": 0})
+            counts["null_count"] += int(column.isna().sum())
+
+            if column_profile is not None and column_profile["type"] == "numerical":
+                values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+                values = values[~np.isnan(values)]
+                edges = np.asarray(column_profile["bin_edges"], dtype=np.float64)
+                bin_counts = np.bincount(np.searchsorted(edges, values, side="left"), minlength=len(edges) + 1)
+                counts["bin_counts"] = (np.asarray(counts.get("bin_counts", 0)) + bin_counts).tolist()
+                if column_profile["quantiles"]:
+                    low, high = column_profile["quantiles"][0], column_profile["quantiles"][-1]
+                    self.out_of_range[col_name] = self.out_of_range.get(col_name, 0) + \
+                        int(((values < low) | (values > high)).sum())
+            elif col_name in self.categorical_columns:
+                self.add_frequencies(counts.setdefault("frequencies", {}),
+                                     column.dropna().astype(str).value_counts().items())
+
+        # Prediction distribution, labelled like the training target;
+        for value, count in pd.Series([prediction for _, prediction in batch]).value_counts().items():
+            label = self.target_reverse_mapping.get(int(value), str(value)) \
+                if isinstance(value, (int, np.integer, float, np.floating)) else str(value)
+            self.prediction_counts[label] = self.prediction_counts.get(label, 0) + int(count)
+
+    def snapshot(self) -> dict:
+        """
+        Plain-type view of this worker's counters
+        """
+        return {
+            "pid": os.getpid(),
+            "updated_at": time.time(),
+            "rows": self.rows,
+            "saturated_flushes": self.saturated_flushes,
+            "pending_rows": len(self._buffer),
+            "column_counts": self.column_counts,
+            "out_of_range": self.out_of_range,
+            "prediction_counts": self.prediction_counts,
+        }
+
+    def merged_snapshot(self) -> dict:
+        """
+        Merges the fresh snapshots of all serving workers
+        """
+        try:
+            merged = {"workers": 0, "rows": 0, "column_counts": {}, "out_of_range": {}, "prediction_counts": {}}
+            monitor_dir = self.prediction_monitor_config.monitor_dir
+            snapshot_files = [os.path.join(monitor_dir, f) for f in os.listdir(monitor_dir)] if os.path.isdir(monitor_dir) else []
+            for snapshot_file in snapshot_files:
+                snapshot = read_yaml_file(snapshot_file)
+                if not snapshot or time.time() - snapshot["updated_at"] > self.prediction_monitor_config.snapshot_ttl:
+                    continue
+                merged["workers"] += 1
+                merged["rows"] += snapshot["rows"]
+                for col_name, counts in snapshot["column_counts"].items():
+                    merged_counts = merged["column_counts"].setdefault(col_name, {"null_count": 0})
+                    merged_counts["null_count"] += counts["null_count"]
+                    if "bin_counts" in counts:
+                        merged_counts["bin_counts"] = (np.asarray(merged_counts.get("bin_counts", 0)) + np.asarray(counts["bin_counts"])).tolist()
+                    if "frequencies" in counts:
+                        self.add_frequencies(merged_counts.setdefault("frequencies", {}), counts["frequencies"].items())
+                for col_name, count in snapshot["out_of_range"].items():
+                    merged["out_of_range"][col_name] = merged["out_of_range"].get(col_name, 0) + count
+                for label, count in snapshot["prediction_counts"].items():
+                    merged["prediction_counts"][label] = merged["prediction_counts"].get(label, 0) + count
+            return merged
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def drift_report(self) -> dict:
+        """
+        Drift and data-quality report of the scored traffic against the training profile
+        """
+        try:
+            self.flush()
+            merged = self.merged_snapshot()
+            report = {
+                "workers": merged["workers"],
+                "rows": merged["rows"],
+                "prediction_counts": merged["prediction_counts"],
+                "out_of_range": merged["out_of_range"],
+                "null_counts": {col_name: counts["null_count"] for col_name, counts in merged["column_counts"].items()},
+                "drift": None,
+            }
+            if self.reference_profile is not None and merged["rows"]:
+                column_counts = dict(merged["column_counts"])
+                target_column = self.prediction_monitor_config.target_column
+                if merged["prediction_counts"]:
+                    column_counts[target_column] = {"frequencies": merged["prediction_counts"], "null_count": 0}
+                report["drift"] = compare_counts_to_profile(
+                    reference_profile=self.reference_profile,
+                    column_counts=column_counts,
+                    current_rows=merged["rows"],
+                    psi_threshold=self.prediction_monitor_config.psi_threshold,
+                    p_value_threshold=self.prediction_monitor_config.p_value_threshold,
+                    drift_share=self.prediction_monitor_config.drift_share_threshold
+                )
+            return report
+        except Exception as e:
+            raise CustomException(e, sys) from e
@@ -1,5 +1,6 @@
 import os
 import sys
+import threading
 import pandas as pd
 from pandas import DataFrame
 
@@ -7,6 +8,7 @@ from src.logger.logger import setup_logger, log_file
 from src.exception import CustomException
 from src.entity.config_entity import ModelPredictorConfig
 from src.entity.s3_estimator import S3ModelEstimator
+from src.entity.estimator import VisaModel, RequestEncoder
 
 # Initialize logger
 logger = setup_logger("prediction_pipeline", log_file)
@@ -85,6 +87,79 @@ class ModelPredictor:
     
     def __init__(self, model_predictor_config: ModelPredictorConfig):
         self.model_predictor_config = model_predictor_config
+        self.model_estimator: S3ModelEstimator = None
+        self.loaded_model: VisaModel = None
+        self.model_version: str = None
+        self._model_lock = threading.Lock()
+    
+    def get_model_estimator(self) -> S3ModelEstimator:
+        if self.model_estimator is None:
+            self.model_estimator = S3ModelEstimator(
+                bucket_name=self.model_predictor_config.bucket_name,
+                model_path=self.model_predictor_config.s3_model_key_path,
+            )
+        return self.model_estimator
+    
+    def get_model(self) -> VisaModel:
+        """
+        Loads the production model once and keeps it resident for later requests
+        """
+        return self.get_versioned_model()[0]
+    
+    def get_versioned_model(self) -> tuple:
+        """
+        Resident model together with its version, read as one pair so a concurrent reload
+        never mixes the results of one model with the version of the other
+        """
+        try:
+            with self._model_lock:
+                if self.loaded_model is None:
+                    model_estimator = self.get_model_estimator()
+                    # Version first: a push in between makes the next refresh reload, never the reverse;
+                    self.model_version = model_estimator.get_model_version()
+                    self.loaded_model = model_estimator.load_model()
+                return self.loaded_model, self.model_version
+        except Exception as e:
+            raise CustomException(e, sys)
+    
+    def refresh_model(self) -> bool:
+        """
+        Reloads the production model when its stored version changed
+        Returns: True when a new model was loaded
+        """
+        try:
+            if self.loaded_model is None or self.model_version is None:
+                return False
+            model_estimator = self.get_model_estimator()
+            model_version = model_estimator.get_model_version()
+            if model_version == self.model_version:
+                return False
+            model = model_estimator.load_model()
+            # Build the encoder before the swap so requests never wait on it;
+            model.get_request_encoder()
+            with self._model_lock:
+                self.loaded_model, self.model_version = model, model_version
+            logger.info(f"Loaded production model version {model_version}")
+            return True
+        except Exception as e:
+            raise CustomException(e, sys)
+    
+    def set_model(self, model: VisaModel, model_version: str = None) -> None:
+        """
+        Serves an already loaded model, e.g. a locally trained one, instead of the production model
+        """
+        with self._model_lock:
+            self.loaded_model = model
+            self.model_version = model_version
+    
+    def get_request_encoder(self) -> RequestEncoder:
+        """
+        Request encoder generated from the fitted encoders of the resident model
+        """
+        try:
+            return self.get_model().get_request_encoder()
+        except Exception as e:
+            raise CustomException(e, sys)
     
     def predict(self, dataframe) -> str:
         """
@@ -93,16 +168,21 @@ class ModelPredictor:
         """
         try:
             logger.info("Entered predict method of USvisaClassifier class")
-            model = S3ModelEstimator(
-                bucket_name=self.model_predictor_config.bucket_name,
-                model_path=self.model_predictor_config.s3_model_key_path,
-            )
-            result =  model.predict(dataframe)
+            result = self.get_model().predict(dataframe)
             logger.info("Exited predict method of USvisaClassifier class")
             return result
         
         except Exception as e:
             raise CustomException(e, sys)
+    
+    def predict_encoded(self, encoded_rows: list):
+        """
+        Predicts rows already validated and encoded by get_request_encoder().encode
+        """
+        try:
+            return self.get_model().predict_encoded(encoded_rows)
+        except Exception as e:
+            raise CustomException(e, sys)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,162 @@
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+from src.entity.config_entity import ServingConfig
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file, log_event, log_stage
+
+# Initialize logger
+logger = setup_logger("serving_pipeline", log_file)
+
+
+def child_pids(pid: int) -> list:
+    """
+    Direct children of a process, read from /proc (Linux)
+    """
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as children:
+            return [int(child) for child in children.read().split()]
+    except OSError:
+        return []
+
+
+def process_memory(pid: int) -> dict:
+    """
+    Memory of one process in MB from /proc/<pid>/smaps_rollup: rss counts shared pages
+    in full, pss splits them between the processes sharing them, private is what
+    the process holds alone
+    """
+    try:
+        fields = {}
+        with open(f"/proc/{pid}/smaps_rollup") as smaps:
+            for line in smaps:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+        return {
+            "pid": pid,
+            "rss_mb": fields.get("Rss", 0.0),
+            "pss_mb": fields.get("Pss", 0.0),
+            "shared_mb": fields.get("Shared_Clean", 0.0) + fields.get("Shared_Dirty", 0.0),
+            "private_mb": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+        }
+    except OSError:
+        return {"pid": pid}
+
+
+class PreforkServer:
+    """
+    Production entry point: N uvicorn workers forked from one parent.
+
+    The parent imports the app, loads the production model and its request encoder,
+    then freezes the heap (gc.freeze) so the collector never writes to those objects
+    and the pages stay shared copy-on-write. Every worker serves the same listening
+    socket; the parent restarts workers that die and forwards shutdown signals.
+    Platforms without fork fall back to uvicorn's own (spawn) workers.
+    """
+
+    def __init__(self, serving_config: ServingConfig = ServingConfig()):
+        self.serving_config = serving_config
+        self.workers = {}
+        self.should_exit = False
+
+    def preload(self):
+        """
+        Imports the app and loads everything the workers share
+        """
+        try:
+            import main
+
+            with log_stage(logger, "model_preload") as metrics:
+                main.model_predictor.get_request_encoder()
+                try:
+                    main.prediction_monitor.load_reference_profile()
+                except Exception as e:
+                    logger.error(f"Workers start without reference profile: {e}")
+                gc.collect()
+                gc.freeze()
+                metrics["frozen_objects"] = gc.get_freeze_count()
+            return main.app
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Accepted connections inherit this; without it small responses wait on delayed ACKs (~40 ms);
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.bind((self.serving_config.host, self.serving_config.port))
+        sock.listen(self.serving_config.backlog)
+        sock.set_inheritable(True)
+        return sock
+
+    def spawn_worker(self, app, sock: socket.socket, index: int) -> None:
+        import uvicorn
+
+        pid = os.fork()
+        if pid == 0:
+            # Worker: default signal handling, uvicorn installs its own on serve;
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            try:
+                uvicorn.Server(uvicorn.Config(app, log_level="warning")).run(sockets=[sock])
+            finally:
+                os._exit(0)
+        self.workers[pid] = index
+        log_event(logger, "worker_started", pid=pid, worker=index)
+
+    def stop(self, signum=None, frame=None) -> None:
+        self.should_exit = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def memory_report(self) -> list:
+        """
+        Memory of every live worker
+        """
+        return [{"worker": index, **process_memory(pid)} for pid, index in self.workers.items()]
+
+    def run(self) -> None:
+        """
+        Preloads the model, forks the workers and supervises them until shutdown
+        """
+        try:
+            if not hasattr(os, "fork"):
+                import uvicorn
+                logger.warning("fork is not available; starting uvicorn workers without a shared model")
+                uvicorn.run("main:app", host=self.serving_config.host, port=self.serving_config.port,
+                            workers=self.serving_config.workers)
+                return
+
+            app = self.preload()
+            sock = self.bind()
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+            for index in range(self.serving_config.workers):
+                self.spawn_worker(app, sock, index)
+            logger.info(f"Serving on {self.serving_config.host}:{self.serving_config.port} with {self.serving_config.workers} workers")
+
+            while self.workers:
+                try:
+                    pid, status = os.wait()
+                except ChildProcessError:
+                    break
+                except InterruptedError:
+                    continue
+                index = self.workers.pop(pid, None)
+                if index is None or self.should_exit:
+                    continue
+                log_event(logger, "worker_exited", level=logging.ERROR, pid=pid, worker=index, status=status)
+                time.sleep(self.serving_config.restart_delay)
+                self.spawn_worker(app, sock, index)
+            sock.close()
+        except Exception as e:
+            raise CustomException(e, sys) from e
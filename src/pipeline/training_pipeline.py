@@ -1,11 +1,14 @@
 import os
 import sys
+import numpy as np
 
 from src.components import data_transformation
 from src.exception import CustomException
-from src.entity.config_entity import DataIngestionConfig, DataTransformationConfig, DataValidationConfig, ModelTrainerConfig, ModelEvaluationConfig, ModelPusherConfig
-from src.entity.artifact_entity import DataIngestionArtifact, DataTransformationArtifact, DataValidationArtifact, ModelTrainerArtifact, ModelEvaluationArtifact, ModelPusherArtifact
-from src.logger.logger import setup_logger, log_file
+from src.entity.config_entity import DataIngestionConfig, DataTransformationConfig, DataValidationConfig, TrainingGateConfig, ModelTrainerConfig, ModelEvaluationConfig, ModelPusherConfig, training_pipeline_config
+from src.entity.artifact_entity import DataIngestionArtifact, DataTransformationArtifact, DataValidationArtifact, TrainingGateArtifact, ModelTrainerArtifact, ModelEvaluationArtifact, ModelPusherArtifact
+from src.logger.logger import setup_logger, log_file, log_stage, set_run_id
+from src.utils.main_utils import get_file_size
+from src.utils.profiler import profile_section
 
 # Initialize logger
 logger = setup_logger("training_pipeline", log_file)
@@ -22,6 +25,8 @@ class TrainingPipeline:
         :type data_ingestion_config: DataIngestionConfig
         '''
         try:
+            # Run id of this training run, same as its artifact folder
+            set_run_id(training_pipeline_config.TIMESTAMP)
             logger.info("Training Pipeline initialized.")
             self.data_ingestion_config = DataIngestionConfig()
             self.data_validation_config = DataValidationConfig()
@@ -40,8 +45,12 @@ class TrainingPipeline:
         try:
             from src.components.data_ingestion import DataIngestion
             
-            data_ingestion = DataIngestion(data_ingestion_config=self.data_ingestion_config)
-            data_ingestion_artifact = data_ingestion.initiate_data_ingestion()
+            with profile_section("data_ingestion", cprofile=True), log_stage(logger, "data_ingestion") as metrics:
+                data_ingestion = DataIngestion(data_ingestion_config=self.data_ingestion_config)
+                data_ingestion_artifact = data_ingestion.initiate_data_ingestion()
+                metrics["bytes"] = get_file_size(data_ingestion_artifact.feature_store_path,
+                                                 data_ingestion_artifact.training_file_path,
+                                                 data_ingestion_artifact.testing_file_path)
             
             logger.info(f"Data Ingestion Artifact: {data_ingestion_artifact}")
             return data_ingestion_artifact
@@ -60,9 +69,14 @@ class TrainingPipeline:
         try:
             from src.components.data_validation import DataValidation
             
-            data_validation = DataValidation(data_ingestion_artifact=data_ingestion_artifact,
-                                data_validation_config=self.data_validation_config)
-            data_validation_artifact = data_validation.initiate_data_validation()
+            with profile_section("data_validation", cprofile=True), log_stage(logger, "data_validation") as metrics:
+                data_validation = DataValidation(data_ingestion_artifact=data_ingestion_artifact,
+                                    data_validation_config=self.data_validation_config)
+                data_validation_artifact = data_validation.initiate_data_validation()
+                metrics["bytes"] = get_file_size(data_ingestion_artifact.training_file_path,
+                                                 data_ingestion_artifact.testing_file_path)
+                metrics["validation_status"] = data_validation_artifact.validation_status
+                metrics["drift_status"] = data_validation_artifact.drift_status
             
             logger.info(f"Data Validation Artifact: {data_validation_artifact}")
             return data_validation_artifact
@@ -70,6 +84,27 @@ class TrainingPipeline:
         except Exception as e:
             raise CustomException(e, sys)
     
+    def start_training_gate(self, data_ingestion_artifact: DataIngestionArtifact, data_validation_artifact: DataValidationArtifact) -> TrainingGateArtifact:
+        """
+        This method of TrainPipeline class is responsible for starting training gate component
+        """
+        try:
+            from src.components.training_gate import TrainingGate
+            
+            with profile_section("training_gate"), log_stage(logger, "training_gate") as metrics:
+                training_gate = TrainingGate(data_ingestion_artifact=data_ingestion_artifact,
+                                             data_validation_artifact=data_validation_artifact,
+                                             training_gate_config=TrainingGateConfig())
+                training_gate_artifact = training_gate.initiate_training_gate()
+                metrics["skip_training"] = training_gate_artifact.skip_training
+                metrics["reason"] = training_gate_artifact.reason
+            
+            logger.info(f"Training Gate Artifact: {training_gate_artifact}")
+            return training_gate_artifact
+        
+        except Exception as e:
+            raise CustomException(e, sys)
+    
     def start_data_transformation(self, data_ingestion_artifact: DataIngestionArtifact, data_validation_artifact: DataValidationArtifact) -> DataTransformationArtifact:
         """
         This method of TrainPipeline class is responsible for starting data transformation component
@@ -77,24 +112,33 @@ class TrainingPipeline:
         try:
             
             from src.components.data_transformation import DataTransformation
-            data_transformation = DataTransformation(data_ingestion_artifact=data_ingestion_artifact,
-                                    data_transformation_config=self.data_transformation_config,
-                                    data_validation_artifact=data_validation_artifact)
-            data_transformation_artifact = data_transformation.initiate_data_transformation()
+            with profile_section("data_transformation", cprofile=True), log_stage(logger, "data_transformation") as metrics:
+                data_transformation = DataTransformation(data_ingestion_artifact=data_ingestion_artifact,
+                                        data_transformation_config=self.data_transformation_config,
+                                        data_validation_artifact=data_validation_artifact)
+                data_transformation_artifact = data_transformation.initiate_data_transformation()
+                metrics["rows"] = int(np.load(data_transformation_artifact.transformed_train_path, mmap_mode="r").shape[0])
+                metrics["bytes"] = get_file_size(data_transformation_artifact.transformed_train_path,
+                                                 data_transformation_artifact.transformed_test_path,
+                                                 data_transformation_artifact.preprocessor_object_path)
             return data_transformation_artifact
         
         except Exception as e:
             raise CustomException(e, sys)
         
-    def start_model_trainer(self, data_transformation_artifact: DataTransformationArtifact) -> ModelTrainerArtifact:
+    def start_model_trainer(self, data_validation_artifact: DataValidationArtifact, data_transformation_artifact: DataTransformationArtifact) -> ModelTrainerArtifact:
         """
         This method of TrainPipeline class is responsible for starting model trainer component
         """
         try:
             from src.components.model_trainer import ModelTrainer
             
-            model_trainer = ModelTrainer(model_trainer_config=ModelTrainerConfig(), data_transformation_artifact=data_transformation_artifact)
-            model_trainer_artifact = model_trainer.initiate_model_trainer()
+            with profile_section("model_trainer", cprofile=True), log_stage(logger, "model_trainer") as metrics:
+                model_trainer = ModelTrainer(model_trainer_config=ModelTrainerConfig(), data_transformation_artifact=data_transformation_artifact,
+                                             data_validation_artifact=data_validation_artifact)
+                model_trainer_artifact = model_trainer.initiate_model_trainer()
+                metrics["bytes"] = get_file_size(model_trainer_artifact.trained_model_path)
+                metrics["f1_score"] = float(model_trainer_artifact.model_metric_artifact.model_f1_score)
             
             logger.info(f"Model Trainer Artifact: {model_trainer_artifact}")
             return model_trainer_artifact
@@ -109,10 +153,13 @@ class TrainingPipeline:
         try:
             from src.components.model_evaluation import ModelEvaluation
             
-            model_evaluation = ModelEvaluation(model_evaluation_config=ModelEvaluationConfig(),
-                                            data_ingestion_artifact=data_ingestion_artifact,
-                                            model_trainer_artifact=model_trainer_artifact)
-            model_evaluation_artifact = model_evaluation.initiate_model_evaluation()
+            with profile_section("model_evaluation", cprofile=True), log_stage(logger, "model_evaluation") as metrics:
+                model_evaluation = ModelEvaluation(model_evaluation_config=ModelEvaluationConfig(),
+                                                data_ingestion_artifact=data_ingestion_artifact,
+                                                model_trainer_artifact=model_trainer_artifact)
+                model_evaluation_artifact = model_evaluation.initiate_model_evaluation()
+                metrics["bytes"] = get_file_size(data_ingestion_artifact.testing_file_path)
+                metrics["is_model_accepted"] = model_evaluation_artifact.is_model_accepted
             
             logger.info(f"Model Evaluation Artifact: {model_evaluation_artifact}")
             return model_evaluation_artifact
@@ -127,8 +174,11 @@ class TrainingPipeline:
         try:
             from src.components.model_pusher import ModelPusher
             
-            model_pusher = ModelPusher(model_pusher_config=ModelPusherConfig(), model_evaluation_artifact=model_evaluation_artifact)
-            model_pusher_artifact = model_pusher.initiate_model_pusher()
+            with profile_section("model_pusher", cprofile=True), log_stage(logger, "model_pusher") as metrics:
+                model_pusher = ModelPusher(model_pusher_config=ModelPusherConfig(), model_evaluation_artifact=model_evaluation_artifact)
+                model_pusher_artifact = model_pusher.initiate_model_pusher()
+                metrics["bytes"] = get_file_size(model_evaluation_artifact.trained_model_path,
+                                                 model_evaluation_artifact.trained_profile_path)
             
             logger.info(f"Model Pusher Artifact: {model_pusher_artifact}")
             return model_pusher_artifact
@@ -152,18 +202,27 @@ class TrainingPipeline:
             # Data Validation;
             data_validation_artifact = self.start_data_validation            (data_ingestion_artifact=data_ingestion_artifact)
             
+            # Training gate; nothing to train when the production model was trained on the same data;
+            training_gate_artifact = self.start_training_gate(data_ingestion_artifact=data_ingestion_artifact,
+                                                              data_validation_artifact=data_validation_artifact)
+            if training_gate_artifact.skip_training:
+                logger.info(f"No meaningful change since the production model was trained ({training_gate_artifact.reason}). "
+                            "Transformation, training and evaluation will not be initiated.")
+                return
+            
             # Data Transformation;
             data_transformation_artifact = self.start_data_transformation(data_ingestion_artifact=data_ingestion_artifact,
             data_validation_artifact=data_validation_artifact)
             
             # Model Trainer;
-            model_trainer_artifact = self.start_model_trainer(data_transformation_artifact=data_transformation_artifact)
+            model_trainer_artifact = self.start_model_trainer(data_validation_artifact=data_validation_artifact,
+                                                              data_transformation_artifact=data_transformation_artifact)
             
             # Model Evaluation;
             model_evaluation_artifact = self.start_model_evaluation(data_ingestion_artifact=data_ingestion_artifact, model_trainer_artifact=model_trainer_artifact)
             
             if not model_evaluation_artifact.is_model_accepted:
-                logger.info("Trained model is not better than the best model. Model pusher will not be initiated.")
+                logger.info("Trained model does not improve on the best model by the changed threshold score. Model pusher will not be initiated.")
                 return
             
             # Model Pusher;
@@ -0,0 +1,364 @@
+import sys
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+from scipy import stats
+
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file
+
+# File specific Logger;
+logger = setup_logger('drift_utils', log_file)
+
+# Floor applied to empty bins so PSI stays finite;
+PSI_EPSILON: float = 1e-4
+
+
+def population_stability_index(expected_counts: np.ndarray, actual_counts: np.ndarray) -> float:
+    """
+    Population Stability Index between two aligned count vectors
+    expected_counts: np.ndarray bin/category counts of the reference data
+    actual_counts: np.ndarray bin/category counts of the current data
+    return: float PSI value
+    """
+    try:
+        expected = np.asarray(expected_counts, dtype=np.float64)
+        actual = np.asarray(actual_counts, dtype=np.float64)
+        expected = np.clip(expected / max(expected.sum(), 1.0), PSI_EPSILON, None)
+        actual = np.clip(actual / max(actual.sum(), 1.0), PSI_EPSILON, None)
+        return float(np.sum((actual - expected) * np.log(actual / expected)))
+    except Exception as e:
+        logger.info("Error in population_stability_index method of drift_utils")
+        raise CustomException(e, sys) from e
+
+
+def chi_square_test(expected_counts: np.ndarray, actual_counts: np.ndarray) -> tuple:
+    """
+    Chi-square test of homogeneity on the 2 x K contingency table of two count vectors
+    expected_counts: np.ndarray category counts of the reference data
+    actual_counts: np.ndarray category counts of the current data
+    return: (statistic, p_value)
+    """
+    try:
+        table = np.vstack([expected_counts, actual_counts]).astype(np.float64)
+        table = table[:, table.sum(axis=0) > 0]
+        if table.shape[1] < 2 or (table.sum(axis=1) == 0).any():
+            return 0.0, 1.0
+
+        expected = table.sum(axis=1, keepdims=True) * table.sum(axis=0, keepdims=True) / table.sum()
+        statistic = float(((table - expected) ** 2 / expected).sum())
+        p_value = float(stats.chi2.sf(statistic, df=table.shape[1] - 1))
+        return statistic, p_value
+    except Exception as e:
+        logger.info("Error in chi_square_test method of drift_utils")
+        raise CustomException(e, sys) from e
+
+
+def build_numerical_profile(column: Series, n_bins: int, n_quantiles: int) -> dict:
+    """
+    Compact sketch of a numerical column: quantiles with their exact CDF values,
+    reference quantile histogram and null rate
+    column: Series reference column
+    n_bins: int number of quantile bins used for PSI
+    n_quantiles: int number of quantile points kept for KS
+    return: dict column profile
+    """
+    try:
+        values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+        values_sorted = np.sort(values[~np.isnan(values)])
+        count = len(values_sorted)
+
+        if count:
+            quantiles = np.unique(np.quantile(values_sorted, np.linspace(0, 1, n_quantiles)))
+            quantile_cdf = np.searchsorted(values_sorted, quantiles, side="right") / count
+            bin_edges = np.unique(np.quantile(values_sorted, np.linspace(0, 1, n_bins + 1)[1:-1]))
+        else:
+            quantiles = quantile_cdf = bin_edges = np.array([])
+        edges = np.concatenate([[-np.inf], bin_edges, [np.inf]])
+        bin_counts = np.diff(np.searchsorted(values_sorted, edges, side="right"))
+
+        return {
+            "type": "numerical",
+            "count": int(count),
+            "null_rate": float(1 - count / max(len(values), 1)),
+            "mean": float(values_sorted.mean()) if count else 0.0,
+            "std": float(values_sorted.std()) if count else 0.0,
+            "quantiles": quantiles.tolist(),
+            "quantile_cdf": quantile_cdf.tolist(),
+            "bin_edges": bin_edges.tolist(),
+            "bin_counts": bin_counts.tolist(),
+        }
+    except Exception as e:
+        logger.info("Error in build_numerical_profile method of drift_utils")
+        raise CustomException(e, sys) from e
+
+
+def build_categorical_profile(column: Series) -> dict:
+    """
+    Compact sketch of a categorical column: category frequency table and null rate
+    column: Series reference column
+    return: dict column profile
+    """
+    try:
+        frequencies = column.value_counts()
+        return {
+            "type": "categorical",
+            "count": int(frequencies.sum()),
+            "null_rate": float(column.isna().mean()) if len(column) else 0.0,
+            "frequencies": {str(k): int(v) for k, v in frequencies.items()},
+        }
+    except Exception as e:
+        logger.info("Error in build_categorical_profile method of drift_utils")
+        raise CustomException(e, sys) from e
+
+
+def build_reference_profile(dataframe: DataFrame, numerical_columns: list, categorical_columns: list,
+                            n_bins: int = 10, n_quantiles: int = 101) -> dict:
+    """
+    Reference profile of a dataset; drift checks compare new data against this
+    profile so the reference data is scanned once and never reloaded
+    dataframe: DataFrame reference data
+    numerical_columns: list columns sketched with quantiles + histogram
+    categorical_columns: list columns sketched with frequency tables
+    return: dict profile, safe to dump with write_yaml_file
+    """
+    logger.info("Entered build_reference_profile method of drift_utils")
+
+    try:
+        columns = {}
+        for col_name in numerical_columns:
+            columns[col_name] = build_numerical_profile(dataframe[col_name], n_bins, n_quantiles)
+        for col_name in categorical_columns:
+            columns[col_name] = build_categorical_profile(dataframe[col_name])
+
+        profile = {
+            "rows": int(len(dataframe)),
+            "columns": columns,
+        }
+
+        logger.info("Exited build_reference_profile method of drift_utils")
+        return profile
+
+    except Exception as e:
+        logger.info("Error in build_reference_profile method of drift_utils")
+        raise CustomException(e, sys) from e
+
+
+def numerical_column_drift(column_profile: dict, current: Series) -> dict:
+    """
+    PSI and KS statistics of a numerical column against its reference profile;
+    the current values are sorted once and both the histogram counts and the
+    empirical CDF at the reference quantiles are read off with searchsorted
+    column_profile: dict reference profile of the column
+    current: Series current column
+    return: dict column statistics
+    """
+    try:
+        current_values = current.to_numpy(dtype=np.float64, na_value=np.nan)
+        current_sorted = np.sort(current_values[~np.isnan(current_values)])
+        n_ref, n_cur = column_profile["count"], len(current_sorted)
+
+        edges = np.concatenate([[-np.inf], column_profile["bin_edges"], [np.inf]])
+        current_counts = np.diff(np.searchsorted(current_sorted, edges, side="right"))
+
+        # KS statistic evaluated on the reference quantile grid;
+        ks_statistic, p_value = 0.0, 1.0
+        if n_ref and n_cur:
+            cdf_cur = np.searchsorted(current_sorted, column_profile["quantiles"], side="right") / n_cur
+            ks_statistic = float(np.max(np.abs(np.asarray(column_profile["quantile_cdf"]) - cdf_cur)))
+            effective_n = np.sqrt(n_ref * n_cur / (n_ref + n_cur))
+            p_value = float(stats.kstwobign.sf(ks_statistic * effective_n))
+
+        return {
+            "type": "numerical",
+            "stattest": "ks",
+            "psi": population_stability_index(column_profile["bin_counts"], current_counts),
+            "statistic": ks_statistic,
+            "p_value": p_value,
+            "reference_null_rate": column_profile["null_rate"],
+            "current_null_rate": float(1 - n_cur / max(len(current_values), 1)),
+        }
+    except Exception as e:
+        logger.info("Error in numerical_column_drift method of drift_utils")
+        raise CustomException(e, sys) from e
+
+
+def categorical_column_drift(column_profile: dict, current: Series) -> dict:
+    """
+    PSI and chi-square statistics of a categorical column against its reference frequency table
+    column_profile: dict reference profile of the column
+    current: Series current column
+    return: dict column statistics
+    """
+    try:
+        current_frequencies = current.value_counts()
+        current_frequencies.index = current_frequencies.index.astype(str)
+        counts = pd.concat(
+            [pd.Series(column_profile["frequencies"], dtype=np.float64), current_frequencies],
+            axis=1, keys=["reference", "current"]
+        ).fillna(0)
+        reference_counts = counts["reference"].to_numpy()
+        current_counts = counts["current"].to_numpy()
+
+        chi2_statistic, p_value = chi_square_test(reference_counts, current_counts)
+        return {
+            "type": "categorical",
+            "stattest": "chi_square",
+            "psi": population_stability_index(reference_counts, current_counts),
+            "statistic": chi2_statistic,
+            "p_value": p_value,
+            "reference_null_rate": column_profile["null_rate"],
+            "current_null_rate": float(current.isna().mean()) if len(current) else 0.0,
+            "unseen_categories": [str(c) for c in counts.index[(reference_counts == 0) & (current_counts > 0)]],
+        }
+    except Exception as e:
+        logger.info("Error in categorical_column_drift method of drift_utils")
+        raise CustomException(e, sys) from e
+
+
+def compare_to_profile(reference_profile: dict, current_df: DataFrame, psi_threshold: float = 0.2,
+                       p_value_threshold: float = 0.05, drift_share: float = 0.5) -> dict:
+    """
+    Drift report of current_df against a reference profile over the profiled columns
+    A column drifts when its PSI reaches psi_threshold or its p-value falls below
+    p_value_threshold; the dataset drifts when the share of drifted columns reaches drift_share
+    reference_profile: dict profile built by build_reference_profile
+    current_df: DataFrame current data
+    return: dict drift report, safe to dump with write_yaml_file
+    """
+    logger.info("Entered compare_to_profile method of drift_utils")
+
+    try:
+        columns = {}
+        for col_name, column_profile in reference_profile["columns"].items():
+            if column_profile["type"] == "numerical":
+                columns[col_name] = numerical_column_drift(column_profile, current_df[col_name])
+            else:
+                columns[col_name] = categorical_column_drift(column_profile, current_df[col_name])
+
+        report = summarize_drift(columns, reference_rows=reference_profile["rows"], current_rows=len(current_df),
+                                 psi_threshold=psi_threshold, p_value_threshold=p_value_threshold,
+                                 drift_share=drift_share)
+
+        logger.info("Exited compare_to_profile method of drift_utils")
+        return report
+
+    except Exception as e:
+        logger.info("Error in compare_to_profile method of drift_utils")
+        raise CustomException(e, sys) from e
+
+
+def compare_counts_to_profile(reference_profile: dict, column_counts: dict, current_rows: int,
+                              psi_threshold: float = 0.2, p_value_threshold: float = 0.05,
+                              drift_share: float = 0.5) -> dict:
+    """
+    Drift report from pre-aggregated counts, for streaming callers that never hold the raw rows
+    Numerical columns carry counts over the profile bins and are tested with PSI + a
+    KS statistic on the bin edges; categorical columns carry frequency tables
+    reference_profile: dict profile built by build_reference_profile
+    column_counts: dict column -> {"bin_counts": list} or {"frequencies": dict}, plus "null_count"
+    current_rows: int number of rows the counts were aggregated over
+    return: dict drift report, safe to dump with write_yaml_file
+    """
+    try:
+        columns = {}
+        for col_name, counts in column_counts.items():
+            column_profile = reference_profile["columns"].get(col_name)
+            if column_profile is None:
+                continue
+            seen = sum(counts["bin_counts"]) if "bin_counts" in counts else sum(counts["frequencies"].values())
+            null_rate = float(counts.get("null_count", 0) / max(seen + counts.get("null_count", 0), 1))
+
+            if column_profile["type"] == "numerical":
+                reference_counts = np.asarray(column_profile["bin_counts"], dtype=np.float64)
+                current_counts = np.asarray(counts["bin_counts"], dtype=np.float64)
+                ks_statistic, p_value = 0.0, 1.0
+                if reference_counts.sum() and current_counts.sum():
+                    cdf_ref = np.cumsum(reference_counts) / reference_counts.sum()
+                    cdf_cur = np.cumsum(current_counts) / current_counts.sum()
+                    ks_statistic = float(np.max(np.abs(cdf_ref - cdf_cur)))
+                    n_ref, n_cur = reference_counts.sum(), current_counts.sum()
+                    p_value = float(stats.kstwobign.sf(ks_statistic * np.sqrt(n_ref * n_cur / (n_ref + n_cur))))
+                columns[col_name] = {
+                    "type": "numerical",
+                    "stattest": "ks_binned",
+                    "psi": population_stability_index(reference_counts, current_counts),
+                    "statistic": ks_statistic,
+                    "p_value": p_value,
+                    "reference_null_rate": column_profile["null_rate"],
+                    "current_null_rate": null_rate,
+                }
+            else:
+                categories = list(column_profile["frequencies"]) + \
+                    [c for c in counts["frequencies"] if c not in column_profile["frequencies"]]
+                reference_counts = np.array([column_profile["frequencies"].get(c, 0) for c in categories], dtype=np.float64)
+                current_counts = np.array([counts["frequencies"].get(c, 0) for c in categories], dtype=np.float64)
+                chi2_statistic, p_value = chi_square_test(reference_counts, current_counts)
+                columns[col_name] = {
+                    "type": "categorical",
+                    "stattest": "chi_square",
+                    "psi": population_stability_index(reference_counts, current_counts),
+                    "statistic": chi2_statistic,
+                    "p_value": p_value,
+                    "reference_null_rate": column_profile["null_rate"],
+                    "current_null_rate": null_rate,
+                    "unseen_categories": [c for c in counts["frequencies"] if c not in column_profile["frequencies"]],
+                }
+
+        return summarize_drift(columns, reference_rows=reference_profile["rows"], current_rows=current_rows,
+                               psi_threshold=psi_threshold, p_value_threshold=p_value_threshold,
+                               drift_share=drift_share)
+
+    except Exception as e:
+        logger.info("Error in compare_counts_to_profile method of drift_utils")
+        raise CustomException(e, sys) from e
+
+
+def summarize_drift(columns: dict, reference_rows: int, current_rows: int, psi_threshold: float,
+                    p_value_threshold: float, drift_share: float) -> dict:
+    """
+    Flags drifted columns and assembles the drift report from per-column statistics
+    columns: dict column -> statistics with "psi" and "p_value"
+    return: dict drift report
+    """
+    for column_report in columns.values():
+        column_report["drift_detected"] = bool(
+            column_report["psi"] >= psi_threshold or column_report["p_value"] < p_value_threshold
+        )
+
+    drifted_features = [col_name for col_name, report in columns.items() if report["drift_detected"]]
+    total_features = len(columns)
+    drifted_share = len(drifted_features) / total_features if total_features else 0.0
+
+    return {
+        "total_features": total_features,
+        "drifted_feature_count": len(drifted_features),
+        "drifted_features": drifted_features,
+        "drifted_share": float(drifted_share),
+        "dataset_drift": bool(total_features > 0 and drifted_share >= drift_share),
+        "reference_rows": int(reference_rows),
+        "current_rows": int(current_rows),
+        "thresholds": {
+            "psi": psi_threshold,
+            "p_value": p_value_threshold,
+            "drift_share": drift_share,
+        },
+        "columns": columns,
+    }
+
+
+def compute_drift_report(reference_df: DataFrame, current_df: DataFrame, numerical_columns: list,
+                         categorical_columns: list, n_bins: int = 10, psi_threshold: float = 0.2,
+                         p_value_threshold: float = 0.05, drift_share: float = 0.5) -> dict:
+    """
+    Drift report of current_df against reference_df; profiles the reference first
+    reference_df: DataFrame reference data
+    current_df: DataFrame current data
+    numerical_columns: list columns tested with PSI + KS
+    categorical_columns: list columns tested with PSI + chi-square
+    return: dict drift report, safe to dump with write_yaml_file
+    """
+    reference_profile = build_reference_profile(reference_df, numerical_columns, categorical_columns, n_bins=n_bins)
+    return compare_to_profile(reference_profile, current_df, psi_threshold=psi_threshold,
+                              p_value_threshold=p_value_threshold, drift_share=drift_share)
@@ -0,0 +1,130 @@
+import importlib.util
+import sys
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src.constants import SCHEMA_FILE_PATH, DTYPE_PLAN_ENABLED
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file, log_event
+from src.utils.main_utils import read_yaml_file
+
+# File specific Logger;
+logger = setup_logger('dtype_utils', log_file)
+
+# Bytes of one Python str header and of one object pointer, for the default-dtype footprint estimate;
+STR_OBJECT_OVERHEAD: int = sys.getsizeof("")
+OBJECT_POINTER_BYTES: int = 8
+
+
+def build_dtype_plan(schema_file_data: dict) -> dict:
+    """
+    Low-memory dtypes of the schema columns: category for the categorical columns,
+    a pyarrow-backed string for the id column (unique per row, so category would
+    not help), and numerical columns downcast after the read to the smallest
+    integer type or to float32
+    schema_file_data: dict parsed config/schema.yaml
+    return: dict with read_dtypes (passed to read_csv) and numerical_columns
+    """
+    try:
+        id_column = schema_file_data.get("id_column")
+        string_dtype = pd.StringDtype("pyarrow") if importlib.util.find_spec("pyarrow") else pd.StringDtype()
+        read_dtypes = {col_name: "category" for col_name in schema_file_data["categorical_columns"]
+                       if col_name != id_column}
+        if id_column:
+            read_dtypes[id_column] = string_dtype
+        return {
+            "read_dtypes": read_dtypes,
+            "numerical_columns": list(schema_file_data["numerical_columns"]),
+        }
+    except Exception as e:
+        logger.info("Error in build_dtype_plan method of dtype_utils")
+        raise CustomException(e, sys) from e
+
+
+@lru_cache(maxsize=None)
+def get_dtype_plan(schema_file_path: str = SCHEMA_FILE_PATH) -> dict:
+    """
+    Dtype plan of a schema file, built once per process
+    """
+    return build_dtype_plan(read_yaml_file(file_path=schema_file_path))
+
+
+def apply_dtype_plan(dataframe: DataFrame, dtype_plan: dict = None) -> DataFrame:
+    """
+    Casts the planned columns of a DataFrame in place; columns already read with the
+    planned dtype are left alone, so this is cheap after read_csv(dtype=...)
+    dataframe: DataFrame read with any dtypes, e.g. from Parquet
+    dtype_plan: dict built by build_dtype_plan; defaults to the plan of config/schema.yaml
+    return: the same DataFrame
+    """
+    try:
+        if not DTYPE_PLAN_ENABLED:
+            return dataframe
+        dtype_plan = dtype_plan or get_dtype_plan()
+        for col_name, dtype in dtype_plan["read_dtypes"].items():
+            if col_name in dataframe.columns and dataframe[col_name].dtype != dtype:
+                dataframe[col_name] = dataframe[col_name].astype(dtype)
+        for col_name in dtype_plan["numerical_columns"]:
+            if col_name in dataframe.columns:
+                column = dataframe[col_name]
+                if pd.api.types.is_integer_dtype(column.dtype):
+                    dataframe[col_name] = pd.to_numeric(column, downcast="integer")
+                elif pd.api.types.is_float_dtype(column.dtype):
+                    # to_numeric only downcasts floats that round-trip exactly, which wages rarely do;
+                    dataframe[col_name] = column.astype(np.float32)
+        return dataframe
+    except Exception as e:
+        logger.info("Error in apply_dtype_plan method of dtype_utils")
+        raise CustomException(e, sys) from e
+
+
+def default_dtype_memory(dataframe: DataFrame) -> int:
+    """
+    Estimated deep memory of the DataFrame with read_csv's default dtypes: one Python
+    str object per value for string and category columns, 8 bytes per numerical value.
+    Computed from the category codes, so the default-dtype frame is never built.
+    """
+    total = 0
+    for col_name in dataframe.columns:
+        column = dataframe[col_name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            sizes = np.array([STR_OBJECT_OVERHEAD + len(str(c).encode()) for c in column.cat.categories] + [0])
+            total += int(sizes[column.cat.codes.to_numpy()].sum()) + OBJECT_POINTER_BYTES * len(column)
+        elif pd.api.types.is_string_dtype(column.dtype) or column.dtype == object:
+            lengths = column.astype(str).str.len().fillna(0).to_numpy()
+            total += int(lengths.sum() + STR_OBJECT_OVERHEAD * len(column)) + OBJECT_POINTER_BYTES * len(column)
+        else:
+            total += 8 * len(column)
+    return total
+
+
+def read_csv_with_plan(file_path: str, dtype_plan: dict = None, **kwargs):
+    """
+    pd.read_csv with the dtype plan of config/schema.yaml. Strings are parsed straight
+    into category / pyarrow strings and numerical columns are downcast. Without
+    chunksize the memory before (default dtypes, estimated) and after is logged.
+    file_path: str CSV file
+    dtype_plan: dict plan to apply; defaults to the plan of config/schema.yaml
+    kwargs: passed to pd.read_csv
+    return: DataFrame, or an iterator of DataFrames when chunksize is given
+    """
+    try:
+        if not DTYPE_PLAN_ENABLED:
+            return pd.read_csv(file_path, **kwargs)
+        dtype_plan = dtype_plan or get_dtype_plan()
+        reader = pd.read_csv(file_path, dtype=dtype_plan["read_dtypes"], **kwargs)
+        if kwargs.get("chunksize"):
+            return (apply_dtype_plan(chunk, dtype_plan) for chunk in reader)
+
+        dataframe = apply_dtype_plan(reader, dtype_plan)
+        bytes_before = default_dtype_memory(dataframe)
+        bytes_after = int(dataframe.memory_usage(deep=True).sum())
+        log_event(logger, "dtype_plan_applied", file=file_path, rows=len(dataframe), bytes_before=bytes_before,
+                  bytes_after=bytes_after, reduction=round(bytes_before / bytes_after, 2) if bytes_after else None)
+        return dataframe
+    except Exception as e:
+        logger.info("Error in read_csv_with_plan method of dtype_utils")
+        raise CustomException(e, sys) from e
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import sys
+
+import numpy as np
+from pandas import DataFrame
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler, PowerTransformer
+
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file
+from src.utils.drift_utils import build_reference_profile, compare_to_profile
+
+# File specific Logger;
+logger = setup_logger('feature_pipeline_utils', log_file)
+
+# Schema sections that decide the layout of the fitted preprocessor;
+SCHEMA_HASH_KEYS: tuple = ("columns", "derived_features", "drop_columns", "oh_columns", "or_columns",
+                           "transform_columns", "num_features")
+
+
+def schema_hash(schema: dict) -> str:
+    """
+    Hash of the schema sections the preprocessor depends on; a fitted preprocessor can
+    only be reused when this hash is unchanged
+    schema: dict parsed schema.yaml
+    return: str sha256 hex digest
+    """
+    try:
+        content = {key: schema.get(key) for key in SCHEMA_HASH_KEYS}
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+    except Exception as e:
+        logger.info("Error in schema_hash method of feature_pipeline_utils")
+        raise CustomException(e, sys) from e
+
+
+def get_input_columns(schema: dict) -> tuple:
+    """
+    Numerical and categorical input columns of the preprocessor
+    return: (numerical_columns, categorical_columns)
+    """
+    numerical_columns = list(dict.fromkeys(schema["transform_columns"] + schema["num_features"]))
+    categorical_columns = list(dict.fromkeys(schema["oh_columns"] + schema["or_columns"]))
+    return numerical_columns, categorical_columns
+
+
+def _to_list(values) -> list:
+    return [float(v) for v in np.asarray(values, dtype=np.float64).ravel()]
+
+
+def fitted_statistics(preprocessor: object) -> dict:
+    """
+    Fitted state of every block of a ColumnTransformer in plain YAML-safe types:
+    encoder categories, scaler means and scales, power transform lambdas
+    preprocessor: fitted ColumnTransformer
+    return: dict block name -> statistics
+    """
+    try:
+        statistics = {}
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == "drop" or name == "remainder":
+                continue
+            steps = transformer.steps if isinstance(transformer, Pipeline) else [(name, transformer)]
+            block = {"columns": list(columns)}
+            for _, step in steps:
+                if isinstance(step, (OneHotEncoder, OrdinalEncoder)):
+                    block["categories"] = {col_name: [str(c) for c in categories]
+                                           for col_name, categories in zip(columns, step.categories_)}
+                elif isinstance(step, StandardScaler):
+                    block["mean"] = _to_list(step.mean_)
+                    block["scale"] = _to_list(step.scale_)
+                    block["n_samples_seen"] = int(np.max(step.n_samples_seen_))
+                elif isinstance(step, PowerTransformer):
+                    block["lambdas"] = _to_list(step.lambdas_)
+                    if step.standardize:
+                        block["mean"] = _to_list(step._scaler.mean_)
+                        block["scale"] = _to_list(step._scaler.scale_)
+            statistics[name] = block
+        return statistics
+    except Exception as e:
+        logger.info("Error in fitted_statistics method of feature_pipeline_utils")
+        raise CustomException(e, sys) from e
+
+
+def build_feature_pipeline_metadata(preprocessor: object, schema: dict, input_df: DataFrame, fitted_run: str,
+                                    n_bins: int = 10, n_quantiles: int = 101) -> dict:
+    """
+    Feature pipeline artifact of a freshly fitted preprocessor: schema hash, output
+    feature names, fitted statistics and the profile of the input it was fitted on
+    preprocessor: fitted ColumnTransformer
+    schema: dict parsed schema.yaml
+    input_df: DataFrame input features the preprocessor was fitted on
+    fitted_run: str run id of the fit
+    return: dict metadata, safe to dump with write_yaml_file
+    """
+    try:
+        numerical_columns, categorical_columns = get_input_columns(schema)
+        return {
+            "schema_hash": schema_hash(schema),
+            "fitted_run": fitted_run,
+            "fitted_rows": int(len(input_df)),
+            "reuse_count": 0,
+            "feature_names": [str(name) for name in preprocessor.get_feature_names_out()],
+            "fitted_statistics": fitted_statistics(preprocessor),
+            "input_profile": build_reference_profile(input_df, numerical_columns, categorical_columns,
+                                                     n_bins=n_bins, n_quantiles=n_quantiles),
+        }
+    except Exception as e:
+        logger.info("Error in build_feature_pipeline_metadata method of feature_pipeline_utils")
+        raise CustomException(e, sys) from e
+
+
+def check_reuse(metadata: dict, schema: dict, input_df: DataFrame, psi_threshold: float,
+                drift_share: float) -> tuple:
+    """
+    Decides whether a previously fitted preprocessor can transform input_df as is.
+    It cannot when the schema changed, when an encoded column has categories the
+    encoders never saw, or when the share of input columns whose PSI against the fit
+    profile reaches psi_threshold reaches drift_share. Only PSI is used: with training
+    sized samples the p-values flag shifts far too small to matter for the fit.
+    metadata: dict feature pipeline artifact of the previous fit
+    schema: dict parsed schema.yaml
+    input_df: DataFrame new input features
+    return: (reuse: bool, reason: str, drift_report: dict or None)
+    """
+    try:
+        if metadata.get("schema_hash") != schema_hash(schema):
+            return False, "schema_changed", None
+
+        drift_report = compare_to_profile(metadata["input_profile"], input_df, psi_threshold=psi_threshold,
+                                          p_value_threshold=0.0, drift_share=drift_share)
+        unseen = {col_name: report["unseen_categories"] for col_name, report in drift_report["columns"].items()
+                  if report.get("unseen_categories")}
+        if unseen:
+            return False, f"unseen_categories: {unseen}", drift_report
+        if drift_report["dataset_drift"]:
+            return False, "drift", drift_report
+        return True, "stable", drift_report
+    except Exception as e:
+        logger.info("Error in check_reuse method of feature_pipeline_utils")
+        raise CustomException(e, sys) from e
@@ -1,9 +1,11 @@
+import hashlib
 import os
 import sys
 
 import numpy as np
 import dill
 import yaml
+import pandas as pd
 from pandas import DataFrame
 
 from src.exception import CustomException
@@ -117,6 +119,44 @@ def save_object(file_path: str, obj: object) -> None:
         raise CustomException(e, sys) from e
 
 
+def get_file_size(*file_paths: str) -> int:
+    """
+    Total size in bytes of the given files, missing files count as 0
+    file_paths: str locations of files
+    """
+    return sum(os.path.getsize(file_path) for file_path in file_paths if file_path and os.path.exists(file_path))
+
+
+def file_hash(file_path: str) -> str:
+    """
+    sha256 of a file's content
+    file_path: str location of file
+    """
+    try:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    except Exception as e:
+        logger.info("Error in file_hash method of utils")
+        raise CustomException(e, sys) from e
+
+
+def dataframe_fingerprint(df: DataFrame) -> str:
+    """
+    Order-independent fingerprint of a DataFrame's rows: the wrapping sum of the row hashes,
+    so the same rows give the same fingerprint whatever order they were exported in
+    df: pandas DataFrame
+    """
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        return f"{len(df)}-{int(row_hashes.sum(dtype=np.uint64)):016x}"
+    except Exception as e:
+        logger.info("Error in dataframe_fingerprint method of utils")
+        raise CustomException(e, sys) from e
+
+
 def drop_columns(df: DataFrame, cols: list)-> DataFrame:
 
     """
@@ -127,7 +167,7 @@ def drop_columns(df: DataFrame, cols: list)-> DataFrame:
     logger.info("Entered drop_columns methon of utils")
 
     try:
-        df = df.drop(columns=cols, axis=1)
+        df = df.drop(columns=cols)
 
         logger.info("Exited the drop_columns method of utils")
         
@@ -0,0 +1,50 @@
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+# Shared state of a worker process, set once by _init_worker
+_worker_state = None
+
+
+def _init_worker(state) -> None:
+    # Forked workers inherit the parent's state copy-on-write; spawned ones unpickle it once;
+    global _worker_state
+    _worker_state = state
+
+
+def _call_in_worker(fn: Callable, item):
+    return fn(item, _worker_state)
+
+
+def ordered_bounded_map(fn: Callable, iterable: Iterable, workers: int, state=None,
+                        pending_per_worker: int = 2) -> Iterator:
+    """
+    Yields fn(item, state) for every item of iterable, in input order.
+
+    With more than one worker the calls run in a process pool, forked where the
+    platform allows so a large state such as a model is shared copy-on-write, and
+    at most workers * pending_per_worker items are in flight, which keeps memory
+    flat however long the input is. state is handed to every worker once instead
+    of with every item; fn and the items must be picklable. With one worker
+    everything runs in this process. Closing the generator shuts the pool down.
+    """
+    if workers <= 1:
+        for item in iterable:
+            yield fn(item, state)
+        return
+
+    start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method),
+                                   initializer=_init_worker, initargs=(state,))
+    max_pending = max(1, workers * pending_per_worker)
+    try:
+        pending = deque()
+        for item in iterable:
+            pending.append(executor.submit(_call_in_worker, fn, item))
+            while len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
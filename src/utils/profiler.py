@@ -0,0 +1,243 @@
+import cProfile
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Optional
+
+from src.entity.config_entity import ProfilerConfig
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file
+
+# Initialize logger
+logger = setup_logger("profiler", log_file)
+
+# Profiler of this process; None unless profiling was enabled
+_active_profiler = None
+
+
+def current_rss() -> int:
+    """
+    Resident set size of this process in bytes; falls back to the peak RSS
+    from getrusage where /proc is not available
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class PipelineProfiler:
+    """
+    Opt-in profiler for the training pipeline.
+
+    Each section records wall-clock time, CPU time and its peak memory, either the
+    RSS sampled by a background thread or the Python heap peak from tracemalloc.
+    Sections nest: a child's peak is folded into its parent so every level reports
+    the true peak of its block. Sections opened with cprofile=True also dump a
+    cProfile file next to the report.
+    """
+
+    def __init__(self, profiler_config: ProfilerConfig):
+        self.profiler_config = profiler_config
+        self.sections = []
+        self._stack = []
+        self._peak = 0
+        self._started_perf = time.perf_counter()
+        self._cprofile_active = False
+        self._stop_sampler = threading.Event()
+        self._sampler = None
+
+    def start(self) -> None:
+        """
+        Starts memory tracking
+        """
+        if self.profiler_config.memory_mode == "tracemalloc":
+            tracemalloc.start()
+        else:
+            self._peak = current_rss()
+            self._sampler = threading.Thread(target=self._sample_rss, name="profiler-rss-sampler", daemon=True)
+            self._sampler.start()
+        self.started_at = time.time()
+        self._started_perf = time.perf_counter()
+        logger.info(f"Profiler started with memory mode {self.profiler_config.memory_mode}")
+
+    def stop(self) -> None:
+        """
+        Stops memory tracking
+        """
+        if self._sampler is not None:
+            self._stop_sampler.set()
+            self._sampler.join()
+            self._sampler = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def _sample_rss(self) -> None:
+        while not self._stop_sampler.wait(self.profiler_config.sample_interval):
+            self._peak = max(self._peak, current_rss())
+
+    def _memory_now(self) -> int:
+        if self.profiler_config.memory_mode == "tracemalloc":
+            return tracemalloc.get_traced_memory()[0]
+        return current_rss()
+
+    def _reset_peak(self) -> None:
+        if self.profiler_config.memory_mode == "tracemalloc":
+            tracemalloc.reset_peak()
+        self._peak = self._memory_now()
+
+    def _read_peak(self) -> int:
+        if self.profiler_config.memory_mode == "tracemalloc":
+            return max(self._peak, tracemalloc.get_traced_memory()[1])
+        return max(self._peak, current_rss())
+
+    @contextmanager
+    def section(self, name: str, cprofile: bool = False):
+        """
+        Profiles the wrapped block as one section
+        :param name: section name, shown with its parent sections in the report
+        :param cprofile: dump a cProfile file for this block when cProfile dumps are enabled
+        """
+        parent_peak = self._read_peak()
+        memory_start = self._memory_now()
+        self._reset_peak()
+        path = "/".join([*self._stack, name])
+        self._stack.append(name)
+
+        profile = None
+        if cprofile and self.profiler_config.cprofile and not self._cprofile_active:
+            profile = cProfile.Profile()
+            self._cprofile_active = True
+            profile.enable()
+
+        status = "success"
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        except BaseException:
+            status = "failed"
+            raise
+        finally:
+            wall_ms = (time.perf_counter() - wall_start) * 1000
+            cpu_ms = (time.process_time() - cpu_start) * 1000
+            if profile is not None:
+                profile.disable()
+                self._cprofile_active = False
+            peak = self._read_peak()
+            self._stack.pop()
+
+            record = {
+                "section": path,
+                "depth": len(self._stack),
+                "status": status,
+                "start_ms": round((wall_start - self._started_perf) * 1000, 3),
+                "wall_ms": round(wall_ms, 3),
+                "cpu_ms": round(cpu_ms, 3),
+                "memory_start_mb": round(memory_start / 2**20, 3),
+                "memory_end_mb": round(self._memory_now() / 2**20, 3),
+                "peak_memory_mb": round(peak / 2**20, 3),
+            }
+            if profile is not None:
+                os.makedirs(self.profiler_config.profiler_dir, exist_ok=True)
+                record["cprofile_path"] = os.path.join(self.profiler_config.profiler_dir, f"{path.replace('/', '.')}.prof")
+                profile.dump_stats(record["cprofile_path"])
+            self.sections.append(record)
+
+            # The parent carries the higher of its own peak so far and this child's peak;
+            self._reset_peak()
+            self._peak = max(parent_peak, peak)
+
+    def aggregate(self) -> list:
+        """
+        Sums the sections by name, so repeated inner calls appear once with their call count
+        """
+        totals = {}
+        for record in self.sections:
+            total = totals.setdefault(record["section"], {
+                "section": record["section"], "depth": record["depth"], "start_ms": record["start_ms"], "calls": 0,
+                "wall_ms": 0.0, "cpu_ms": 0.0, "peak_memory_mb": 0.0, "failed": 0,
+            })
+            total["calls"] += 1
+            total["start_ms"] = min(total["start_ms"], record["start_ms"])
+            total["wall_ms"] = round(total["wall_ms"] + record["wall_ms"], 3)
+            total["cpu_ms"] = round(total["cpu_ms"] + record["cpu_ms"], 3)
+            total["peak_memory_mb"] = max(total["peak_memory_mb"], record["peak_memory_mb"])
+            total["failed"] += record["status"] == "failed"
+        # First-started order puts every parent above its children;
+        return sorted(totals.values(), key=lambda total: (total["start_ms"], total["depth"]))
+
+    def summary_table(self) -> str:
+        """
+        Plain-text table of the aggregated sections
+        """
+        memory_label = "peak heap MB" if self.profiler_config.memory_mode == "tracemalloc" else "peak RSS MB"
+        header = f"{'section':<60} {'calls':>6} {'wall ms':>12} {'cpu ms':>12} {memory_label:>14}"
+        lines = [header, "-" * len(header)]
+        for total in self.aggregate():
+            name = "  " * total["depth"] + total["section"].split("/")[-1]
+            lines.append(f"{name:<60} {total['calls']:>6} {total['wall_ms']:>12.1f} "
+                         f"{total['cpu_ms']:>12.1f} {total['peak_memory_mb']:>14.1f}")
+        return "\n".join(lines)
+
+    def write_report(self) -> str:
+        """
+        Writes the JSON report and the summary table into the profiler directory
+        :return: path of the JSON report
+        """
+        try:
+            os.makedirs(self.profiler_config.profiler_dir, exist_ok=True)
+            report = {
+                "started_at": getattr(self, "started_at", None),
+                "memory_mode": self.profiler_config.memory_mode,
+                "sample_interval": self.profiler_config.sample_interval,
+                "summary": self.aggregate(),
+                "sections": self.sections,
+            }
+            with open(self.profiler_config.report_file_path, "w") as report_file:
+                json.dump(report, report_file, indent=2)
+            with open(self.profiler_config.summary_file_path, "w") as summary_file:
+                summary_file.write(self.summary_table() + "\n")
+            logger.info(f"Profile report written to {self.profiler_config.report_file_path}")
+            return self.profiler_config.report_file_path
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+def enable_profiling(profiler_config: ProfilerConfig) -> PipelineProfiler:
+    """
+    Starts the process-wide profiler; profile_section blocks are no-ops until this is called
+    """
+    global _active_profiler
+    _active_profiler = PipelineProfiler(profiler_config)
+    _active_profiler.start()
+    return _active_profiler
+
+
+def disable_profiling() -> Optional[PipelineProfiler]:
+    """
+    Stops the process-wide profiler and returns it so its report can be written
+    """
+    global _active_profiler
+    profiler, _active_profiler = _active_profiler, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+@contextmanager
+def profile_section(name: str, cprofile: bool = False):
+    """
+    Profiles the wrapped block when profiling is enabled, otherwise does nothing
+    """
+    if _active_profiler is None:
+        yield
+        return
+    with _active_profiler.section(name, cprofile=cprofile):
+        yield
@@ -0,0 +1,142 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src.entity.feature_engineering import current_year
+from src.exception import CustomException
+from src.logger.logger import setup_logger, log_file
+
+# File specific Logger;
+logger = setup_logger('synthetic_data', log_file)
+
+
+def build_synthetic_profile(reference_df: DataFrame, schema_file_data: dict, strata_columns: list,
+                            n_quantiles: int = 1001) -> dict:
+    """
+    Sampling profile of a reference dataset: stratum priors, and per stratum the
+    quantile function of every numerical column and the frequency table of every
+    categorical column. Stratifying on the target (and unit_of_wage) keeps the
+    class signal and the wage scale of each unit in the generated data.
+    reference_df: DataFrame real data, e.g. notebook/Visadataset.csv
+    schema_file_data: dict parsed config/schema.yaml
+    strata_columns: list categorical columns sampled jointly
+    n_quantiles: int quantile points kept per numerical column
+    return: dict profile
+    """
+    logger.info("Entered build_synthetic_profile method of synthetic_data")
+
+    try:
+        id_column = schema_file_data.get("id_column")
+        columns = [list(column.keys())[0] for column in schema_file_data["columns"]]
+        numerical_columns = [c for c in schema_file_data["numerical_columns"] if c in reference_df.columns]
+        categorical_columns = [c for c in schema_file_data["categorical_columns"]
+                               if c in reference_df.columns and c != id_column and c not in strata_columns]
+        probabilities = np.linspace(0, 1, n_quantiles)
+
+        strata = []
+        for stratum_key, stratum_df in reference_df.groupby(strata_columns, observed=True):
+            stratum_key = stratum_key if isinstance(stratum_key, tuple) else (stratum_key,)
+            numerical = {}
+            for col_name in numerical_columns:
+                values = stratum_df[col_name].dropna().to_numpy(dtype=np.float64)
+                numerical[col_name] = np.quantile(values, probabilities) if len(values) else np.zeros(n_quantiles)
+            categorical = {}
+            for col_name in categorical_columns:
+                frequencies = stratum_df[col_name].value_counts(normalize=True)
+                categorical[col_name] = (frequencies.index.astype(str).to_numpy(), frequencies.to_numpy())
+            strata.append({
+                "key": dict(zip(strata_columns, stratum_key)),
+                "weight": len(stratum_df) / len(reference_df),
+                "numerical": numerical,
+                "categorical": categorical,
+            })
+
+        integer_columns = [c for c in numerical_columns if pd.api.types.is_integer_dtype(reference_df[c])]
+        logger.info(f"Built synthetic profile with {len(strata)} strata over {strata_columns}")
+        return {
+            "columns": columns,
+            "id_column": id_column,
+            "probabilities": probabilities,
+            "strata": strata,
+            "integer_columns": integer_columns,
+            "column_rules": schema_file_data.get("column_rules") or {},
+        }
+    except Exception as e:
+        logger.info("Error in build_synthetic_profile method of synthetic_data")
+        raise CustomException(e, sys) from e
+
+
+def generate_synthetic_chunk(profile: dict, n_rows: int, rng: np.random.Generator, start_id: int = 0) -> DataFrame:
+    """
+    Samples n_rows rows from a synthetic profile, vectorized per stratum
+    profile: dict from build_synthetic_profile
+    n_rows: int rows in the chunk
+    rng: np.random.Generator seeded generator
+    start_id: int running row number used for unique ids
+    return: DataFrame chunk with the schema columns in schema order
+    """
+    try:
+        weights = np.array([stratum["weight"] for stratum in profile["strata"]])
+        stratum_index = rng.choice(len(weights), size=n_rows, p=weights / weights.sum())
+        data = {}
+        for index, stratum in enumerate(profile["strata"]):
+            rows = np.flatnonzero(stratum_index == index)
+            if not len(rows):
+                continue
+            for col_name, value in stratum["key"].items():
+                data.setdefault(col_name, np.empty(n_rows, dtype=object))[rows] = value
+            for col_name, quantiles in stratum["numerical"].items():
+                # Inverse-CDF sampling from the quantile function;
+                values = np.interp(rng.random(len(rows)), profile["probabilities"], quantiles)
+                data.setdefault(col_name, np.empty(n_rows, dtype=np.float64))[rows] = values
+            for col_name, (categories, probabilities) in stratum["categorical"].items():
+                values = categories[rng.choice(len(categories), size=len(rows), p=probabilities)]
+                data.setdefault(col_name, np.empty(n_rows, dtype=object))[rows] = values
+
+        chunk = pd.DataFrame(data)
+        for col_name, rule in profile["column_rules"].items():
+            if col_name in chunk.columns and ("min" in rule or "max" in rule):
+                upper = current_year() if rule.get("max") == "current_year" else rule.get("max")
+                chunk[col_name] = chunk[col_name].clip(lower=rule.get("min"), upper=upper)
+        for col_name in profile["integer_columns"]:
+            chunk[col_name] = chunk[col_name].round().astype(np.int64)
+        if profile["id_column"]:
+            chunk[profile["id_column"]] = [f"SYN{i:09d}" for i in range(start_id, start_id + n_rows)]
+        return chunk[[c for c in profile["columns"] if c in chunk.columns]]
+    except Exception as e:
+        logger.info("Error in generate_synthetic_chunk method of synthetic_data")
+        raise CustomException(e, sys) from e
+
+
+def iter_synthetic_chunks(profile: dict, n_rows: int, chunk_size: int, seed: int = 42):
+    """
+    Yields n_rows synthetic rows in chunks of at most chunk_size rows, so memory
+    stays bounded whatever the target scale
+    """
+    rng = np.random.default_rng(seed)
+    generated = 0
+    while generated < n_rows:
+        size = min(chunk_size, n_rows - generated)
+        yield generate_synthetic_chunk(profile, size, rng, start_id=generated)
+        generated += size
+
+
+def write_synthetic_data(profile: dict, n_rows: int, file_path: str, chunk_size: int, seed: int = 42) -> str:
+    """
+    Streams n_rows synthetic rows to a CSV file chunk by chunk
+    return: str file_path
+    """
+    logger.info(f"Writing {n_rows} synthetic rows to {file_path}")
+
+    try:
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        for index, chunk in enumerate(iter_synthetic_chunks(profile, n_rows, chunk_size, seed)):
+            chunk.to_csv(file_path, mode="w" if index == 0 else "a", header=index == 0, index=False)
+        logger.info(f"Wrote {n_rows} synthetic rows to {file_path}")
+        return file_path
+    except Exception as e:
+        logger.info("Error in write_synthetic_data method of synthetic_data")
+        raise CustomException(e, sys) from e
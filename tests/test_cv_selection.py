@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src.entity.cv_selection import CVResultStore, assign_folds, fold_partitions, row_hashes
+
+CV = 3
+KEY = CVResultStore.make_key("sklearn.neighbors", "KNeighborsClassifier", {"n_neighbors": 5}, "f1", CV, 0)
+ENTRY = {"score": 0.75, "seconds": 1.5, "model": "KNeighborsClassifier", "fold": 0}
+
+
+def make_rows(n_rows: int, seed: int) -> tuple:
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(n_rows, 4)), rng.integers(0, 2, size=n_rows).astype(np.float64)
+
+
+def first_fold_partition(x: np.ndarray, y: np.ndarray) -> dict:
+    hashes = row_hashes(x, y)
+    return fold_partitions(hashes, assign_folds(hashes, CV), CV)[0]
+
+
+@pytest.fixture
+def stored(tmp_path) -> tuple:
+    """
+    Rows with fold 0 of KEY scored and saved, and the path of the store file
+    """
+    x, y = make_rows(5000, seed=1)
+    file_path = str(tmp_path / "cv_results.yaml")
+    cv_result_store = CVResultStore(file_path, max_entries=10, max_changed_share=0.05)
+    cv_result_store.put(KEY, ENTRY, first_fold_partition(x, y))
+    cv_result_store.save()
+    return x, y, file_path
+
+
+def test_get_hits_on_the_same_rows_in_any_order(stored):
+    x, y, file_path = stored
+    order = np.random.default_rng(2).permutation(len(x))
+
+    entry, match = CVResultStore(file_path, max_entries=10).get(KEY, first_fold_partition(x[order], y[order]))
+
+    assert match == "hit"
+    assert entry["score"] == ENTRY["score"]
+
+
+@pytest.mark.parametrize("appended_rows", [50, 200])
+def test_get_hits_incrementally_on_a_few_appended_rows(stored, appended_rows):
+    x, y, file_path = stored
+    new_x, new_y = make_rows(appended_rows, seed=3)
+    partition = first_fold_partition(np.vstack([x, new_x]), np.concatenate([y, new_y]))
+
+    entry, match = CVResultStore(file_path, max_entries=10, max_changed_share=0.05).get(KEY, partition)
+
+    assert match == "incremental_hit"
+    assert entry["score"] == ENTRY["score"]
+    # Without incremental reuse the changed rows are a miss;
+    assert CVResultStore(file_path, max_entries=10).get(KEY, partition) == (None, None)
+
+
+def test_get_misses_on_many_changed_rows_or_another_candidate(stored):
+    x, y, file_path = stored
+    new_x, new_y = make_rows(600, seed=3)
+    cv_result_store = CVResultStore(file_path, max_entries=10, max_changed_share=0.05)
+
+    assert cv_result_store.get(KEY, first_fold_partition(np.vstack([x, new_x]), np.concatenate([y, new_y]))) == (None, None)
+    assert cv_result_store.get(KEY, first_fold_partition(x[:4000], y[:4000])) == (None, None)
+    other_key = CVResultStore.make_key("sklearn.neighbors", "KNeighborsClassifier", {"n_neighbors": 9}, "f1", CV, 0)
+    assert cv_result_store.get(other_key, first_fold_partition(x, y)) == (None, None)
+    assert CVResultStore(file_path, max_entries=10, enabled=False).get(KEY, first_fold_partition(x, y)) == (None, None)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.data_ingestion import DataIngestion
+from src.entity.config_entity import DataIngestionConfig
+
+
+@pytest.fixture(scope="module")
+def data_ingestion() -> DataIngestion:
+    return DataIngestion(DataIngestionConfig())
+
+
+@pytest.fixture(scope="module")
+def dataset() -> pd.DataFrame:
+    return pd.read_csv("notebook/Visadataset.csv")
+
+
+def test_test_mask_is_stable_across_chunkings(data_ingestion, dataset):
+    whole = data_ingestion.get_test_mask(dataset)
+
+    for chunk_size in (7, 997, 5000):
+        chunked = np.concatenate([data_ingestion.get_test_mask(dataset.iloc[start:start + chunk_size])
+                                  for start in range(0, len(dataset), chunk_size)])
+        np.testing.assert_array_equal(chunked, whole)
+
+    shuffled = dataset.sample(frac=1.0, random_state=3)
+    np.testing.assert_array_equal(data_ingestion.get_test_mask(shuffled), whole[shuffled.index.to_numpy()])
+
+
+def test_test_mask_is_stable_when_rows_are_appended(data_ingestion, dataset):
+    whole = data_ingestion.get_test_mask(dataset)
+    appended = dataset.sample(2000, random_state=5).assign(case_id=lambda df: "NEW" + df["case_id"])
+
+    grown = data_ingestion.get_test_mask(pd.concat([dataset, appended], ignore_index=True))
+
+    np.testing.assert_array_equal(grown[:len(dataset)], whole)
+    assert abs(grown.mean() - data_ingestion.data_ingestion_config.train_test_split_ratio) < 0.02
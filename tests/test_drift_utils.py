@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.drift_utils import build_reference_profile, compare_counts_to_profile, compare_to_profile
+
+NUMERICAL_COLUMNS = ["wage", "employees"]
+CATEGORICAL_COLUMNS = ["continent"]
+CONTINENTS = ["Asia", "Europe", "Africa"]
+
+
+def make_frame(n_rows: int, seed: int, wage_shift: float = 0.0, continent_weights: tuple = (0.6, 0.3, 0.1)) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "wage": rng.normal(70000 + wage_shift, 10000, size=n_rows),
+        "employees": rng.lognormal(7, 1, size=n_rows),
+        "continent": rng.choice(CONTINENTS, size=n_rows, p=continent_weights),
+    })
+
+
+def count_columns(reference_profile: dict, dataframe: pd.DataFrame) -> dict:
+    """
+    Counts of dataframe in the shape streaming callers aggregate: numerical columns over
+    the profile bins, categorical columns as frequency tables
+    """
+    column_counts = {}
+    for col_name in NUMERICAL_COLUMNS:
+        edges = np.concatenate([[-np.inf], reference_profile["columns"][col_name]["bin_edges"], [np.inf]])
+        values = np.sort(dataframe[col_name].to_numpy())
+        column_counts[col_name] = {"bin_counts": np.diff(np.searchsorted(values, edges, side="right")).tolist(),
+                                   "null_count": 0}
+    for col_name in CATEGORICAL_COLUMNS:
+        column_counts[col_name] = {"frequencies": dataframe[col_name].value_counts().to_dict(), "null_count": 0}
+    return column_counts
+
+
+@pytest.fixture(scope="module")
+def reference_profile() -> dict:
+    return build_reference_profile(make_frame(20000, seed=1), NUMERICAL_COLUMNS, CATEGORICAL_COLUMNS)
+
+
+def test_compare_to_profile_without_shift(reference_profile):
+    report = compare_to_profile(reference_profile, make_frame(5000, seed=2), p_value_threshold=0.001)
+
+    assert report["drifted_features"] == []
+    assert not report["dataset_drift"]
+    assert all(column["psi"] < 0.02 for column in report["columns"].values())
+
+
+def test_compare_to_profile_on_known_shifts(reference_profile):
+    current_df = make_frame(5000, seed=2, wage_shift=10000, continent_weights=(0.2, 0.3, 0.5))
+    current_df.loc[:9, "continent"] = "Antarctica"
+
+    report = compare_to_profile(reference_profile, current_df, p_value_threshold=0.001)
+
+    assert report["drifted_features"] == ["wage", "continent"]
+    assert report["columns"]["wage"]["psi"] > 0.2
+    assert report["columns"]["employees"]["psi"] < 0.02
+    assert report["columns"]["continent"]["unseen_categories"] == ["Antarctica"]
+    assert report["dataset_drift"]
+    assert report["current_rows"] == 5000
+
+
+def test_compare_counts_to_profile_on_known_shifts(reference_profile):
+    stable = make_frame(5000, seed=2)
+    shifted = make_frame(5000, seed=2, wage_shift=10000, continent_weights=(0.2, 0.3, 0.5))
+
+    stable_report = compare_counts_to_profile(reference_profile, count_columns(reference_profile, stable),
+                                              current_rows=len(stable), p_value_threshold=0.001)
+    shifted_report = compare_counts_to_profile(reference_profile, count_columns(reference_profile, shifted),
+                                               current_rows=len(shifted), p_value_threshold=0.001)
+
+    assert stable_report["drifted_features"] == []
+    assert shifted_report["drifted_features"] == ["wage", "continent"]
+    # Binned counts give the same PSI as the raw rows;
+    raw_report = compare_to_profile(reference_profile, shifted, p_value_threshold=0.001)
+    for col_name in NUMERICAL_COLUMNS + CATEGORICAL_COLUMNS:
+        assert shifted_report["columns"][col_name]["psi"] == pytest.approx(raw_report["columns"][col_name]["psi"])
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, PowerTransformer, StandardScaler
+
+from src.constants import SCHEMA_FILE_PATH, TARGET_COLUMN
+from src.entity.estimator import RequestEncoder
+from src.entity.feature_engineering import get_feature_engineering
+from src.utils.main_utils import read_yaml_file
+
+
+@pytest.fixture(scope="module")
+def raw_rows() -> pd.DataFrame:
+    return pd.read_csv("notebook/Visadataset.csv").sample(2000, random_state=7).reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def preprocessor(raw_rows) -> ColumnTransformer:
+    # Same layout as DataTransformation.get_data_transformer_object;
+    schema = read_yaml_file(SCHEMA_FILE_PATH)
+    column_transformer = ColumnTransformer([
+        ("OneHotEncoder", OneHotEncoder(), schema["oh_columns"]),
+        ("Ordinal_Encoder", OrdinalEncoder(), schema["or_columns"]),
+        ("Transformer", Pipeline(steps=[("transformer", PowerTransformer(method="yeo-johnson"))]),
+         schema["transform_columns"]),
+        ("StandardScaler", StandardScaler(), schema["num_features"]),
+    ])
+    return column_transformer.fit(get_feature_engineering().transform(raw_rows))
+
+
+def test_transform_matches_column_transformer(raw_rows, preprocessor):
+    request_encoder = RequestEncoder(preprocessor)
+    assert request_encoder.supported
+
+    feature_engineering = get_feature_engineering()
+    encoded_rows = []
+    for record in raw_rows.drop(columns=TARGET_COLUMN).to_dict(orient="records"):
+        encoded_row, errors = request_encoder.encode(feature_engineering.transform_record(record))
+        assert errors == []
+        encoded_rows.append(encoded_row)
+
+    expected = preprocessor.transform(feature_engineering.transform(raw_rows))
+    np.testing.assert_allclose(request_encoder.transform(encoded_rows), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_encode_rejects_unknown_categories(raw_rows, preprocessor):
+    request_encoder = RequestEncoder(preprocessor)
+    features = get_feature_engineering().transform_record(raw_rows.drop(columns=TARGET_COLUMN).iloc[0].to_dict())
+    features["continent"] = "Atlantis"
+    features.pop("prevailing_wage")
+
+    _, errors = request_encoder.encode(features)
+
+    assert len(errors) == 2
+    assert errors[0].startswith("continent: 'Atlantis'")
+    assert errors[1] == "prevailing_wage: value is required"
@@ -0,0 +1,78 @@
+import pytest
+
+from src.data_access.results_sink import ResultsSink
+from src.entity.config_entity import ResultsSinkConfig
+from src.exception import CustomException
+
+
+class FlakyCollection:
+    """
+    Collection whose bulk_write fails on the calls listed in fail_on (1-based), after
+    running while_failing, e.g. to add results while a write is in flight
+    """
+
+    def __init__(self, fail_on: set, while_failing=None):
+        self.fail_on = fail_on
+        self.while_failing = while_failing
+        self.calls = 0
+        self.documents = {}
+
+    def bulk_write(self, requests, ordered: bool):
+        self.calls += 1
+        if self.calls in self.fail_on:
+            if self.while_failing is not None:
+                self.while_failing()
+            raise ConnectionError("server unavailable")
+        for request in requests:
+            document = request._doc["$set"]
+            self.documents[document["case_id"]] = document
+
+        class Result:
+            upserted_count = len(requests)
+            modified_count = 0
+        return Result()
+
+
+class Client:
+    def __init__(self, collection):
+        self.database = {ResultsSinkConfig.collection_name: collection}
+
+
+def make_sink(collection, buffer_size: int = 100) -> ResultsSink:
+    config = ResultsSinkConfig(key_column="case_id", batch_size=2, buffer_size=buffer_size)
+    return ResultsSink(config, db_client=Client(collection))
+
+
+def test_flush_requeues_the_failed_batch_and_everything_after_it():
+    collection = FlakyCollection(fail_on={2})
+    results_sink = make_sink(collection)
+    for i in range(5):
+        results_sink.add(f"EZYV{i}", "Certified", 0.9, "v1")
+
+    with pytest.raises(CustomException):
+        results_sink.flush()
+
+    # The first batch was written; the failed one and the rest wait, in order;
+    assert sorted(collection.documents) == ["EZYV0", "EZYV1"]
+    assert [document["case_id"] for document in results_sink._buffer] == ["EZYV2", "EZYV3", "EZYV4"]
+    assert results_sink.dropped == 0
+
+    assert results_sink.flush() == 3
+    assert sorted(collection.documents) == [f"EZYV{i}" for i in range(5)]
+    assert results_sink.stats()["buffered"] == 0
+    assert results_sink.written == 5
+
+
+def test_requeue_into_a_full_buffer_drops_and_counts_the_newest_results():
+    collection = FlakyCollection(fail_on={1})
+    results_sink = make_sink(collection, buffer_size=4)
+    for i in range(4):
+        results_sink.add(f"EZYV{i}", "Denied", 0.6, "v1")
+    # Two results arrive while the first batch is being written, filling the buffer again;
+    collection.while_failing = lambda: [results_sink.add(f"NEW{i}", "Denied", 0.6, "v1") for i in range(2)]
+
+    with pytest.raises(CustomException):
+        results_sink.flush()
+
+    assert [document["case_id"] for document in results_sink._buffer] == ["EZYV0", "EZYV1", "EZYV2", "EZYV3"]
+    assert results_sink.dropped == 2